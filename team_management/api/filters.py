@@ -0,0 +1,37 @@
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from api.serializers import TaskFilterSerializer
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Фильтрует задачи по параметрам status, team, assignee, deadline_after и deadline_before.
+    Некорректные значения дают 400.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = TaskFilterSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        lookups = {
+            'status': 'status',
+            'team': 'team_id',
+            'assignee': 'assignee_id',
+            'deadline_after': 'deadline__gte',
+            'deadline_before': 'deadline__lt',
+        }
+        return queryset.filter(**{
+            lookups[name]: value for name, value in params.validated_data.items()
+        })
+
+
+class IndexedOrderingFilter(OrderingFilter):
+    """
+    Сортировка только по полям из ordering_fields вида с добавлением id в том же направлении,
+    чтобы порядок совпадал с составными индексами (поле, id) и был однозначным.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view) or ())
+        if ordering and ordering[-1].lstrip('-') != 'id':
+            ordering.append('-id' if ordering[0].startswith('-') else 'id')
+        return ordering
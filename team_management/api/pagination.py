@@ -0,0 +1,34 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class TaskCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация списка задач: страница читается по индексу без OFFSET и COUNT(*).
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-created_at', '-id')
+
+
+class TaskHistoryPagination(CursorPagination):
+    """
+    Курсорная пагинация журнала изменений задачи, от новых записей к старым.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-id',)
+
+    def get_ordering(self, request, queryset, view):
+        # Сортировка TaskViewSet (?ordering=) относится к задачам, а не к журналу.
+        return self.ordering
+
+
+class LeaderboardPagination(PageNumberPagination):
+    """
+    Постраничный рейтинг команды; COUNT идёт по счётчикам участников одной команды.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -1,6 +1,16 @@
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework import serializers
-from tasks.models import Task, User
 
+from meetings.models import Meeting
+from tasks.models import Task, TaskChange, User
+from tasks.services import find_non_members
+from teams.models import Team
+
+BULK_MAX_IDS = 1000
+ANALYTICS_MAX_DAYS = 366
+ANALYTICS_DEFAULT_WEEKS = 12
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -14,5 +24,139 @@ class TaskSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Task
-        fields = ['id', 'title', 'description', 'status', 'assignee', 'deadline', 'team']
-        read_only_fields = ['id', 'created_at', 'updated_at']
\ No newline at end of file
+        fields = ['id', 'title', 'description', 'status', 'assignee', 'deadline', 'team', 'version']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'version']
+
+    def update(self, instance, validated_data):
+        """
+        Записывает только изменившиеся поля через save_versioned(): при чужом изменении — TaskConflict.
+        """
+        changed = []
+        for name, value in validated_data.items():
+            field = Task._meta.get_field(name)
+            new = value.pk if field.is_relation and value is not None else value
+            if getattr(instance, field.attname) != new:
+                setattr(instance, name, value)
+                changed.append(name)
+        if changed:
+            instance.save_versioned([*changed, 'updated_at'])
+        return instance
+
+
+class LeaderboardEntrySerializer(serializers.Serializer):
+    user = UserSerializer()
+    average = serializers.FloatField()
+    count = serializers.IntegerField()
+
+
+class TaskChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TaskChange
+        fields = ['id', 'field', 'old_value', 'new_value', 'actor', 'changed_at']
+
+
+class TeamAnalyticsParamsSerializer(serializers.Serializer):
+    """
+    Диапазон дат аналитики команды; по умолчанию — последние 12 недель по сегодняшний день.
+    """
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        end = attrs.setdefault('end', timezone.localdate())
+        start = attrs.setdefault('start', end - timedelta(weeks=ANALYTICS_DEFAULT_WEEKS) + timedelta(days=1))
+        if start > end:
+            raise serializers.ValidationError({'start': ["Начало диапазона позже конца"]})
+        if (end - start).days >= ANALYTICS_MAX_DAYS:
+            raise serializers.ValidationError({'end': [f"Диапазон не длиннее {ANALYTICS_MAX_DAYS} дней"]})
+        return attrs
+
+
+class TaskFilterSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    team = serializers.IntegerField(min_value=1, required=False)
+    assignee = serializers.IntegerField(min_value=1, required=False)
+    deadline_after = serializers.DateTimeField(required=False)
+    deadline_before = serializers.DateTimeField(required=False)
+
+
+class TaskBulkUpdateSerializer(serializers.Serializer):
+    """
+    Массовое изменение задач: список ids и хотя бы одно из полей status, assignee, team.
+
+    Проверка выполняется за один проход: задачи загружаются одним запросом, правило
+    «исполнитель состоит в команде задачи» проверяется одним запросом для всех задач.
+    Должен вызываться внутри транзакции — строки задач блокируются до обновления.
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=BULK_MAX_IDS
+    )
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    assignee = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), allow_null=True, required=False)
+    team = serializers.PrimaryKeyRelatedField(queryset=Team.objects.all(), required=False)
+
+    def validate(self, attrs):
+        if not {'status', 'assignee', 'team'} & set(attrs):
+            raise serializers.ValidationError("Укажите status, assignee или team")
+
+        ids = set(attrs['ids'])
+        rows, statuses = {}, {}
+        for task_id, team_id, assignee_id, deadline, task_status in (
+            Task.objects.select_for_update()
+            .filter(id__in=ids)
+            .values_list('id', 'team_id', 'assignee_id', 'deadline', 'status')
+        ):
+            rows[task_id] = (team_id, assignee_id, deadline)
+            statuses[task_id] = task_status
+        missing = ids - set(rows)
+        if missing:
+            raise serializers.ValidationError({'ids': [f"Задачи не найдены: {sorted(missing)}"]})
+
+        new_team_id = attrs['team'].id if 'team' in attrs else None
+        task_pairs = {}
+        for task_id, (team_id, assignee_id, _) in rows.items():
+            if 'assignee' in attrs:
+                assignee_id = attrs['assignee'] and attrs['assignee'].id
+            task_pairs[task_id] = (assignee_id, new_team_id or team_id)
+        non_members = find_non_members(task_pairs.values())
+        if non_members:
+            task_ids = sorted(task_id for task_id, pair in task_pairs.items() if pair in non_members)
+            raise serializers.ValidationError(
+                {'assignee': [f"Исполнитель не состоит в команде задач: {task_ids}"]}
+            )
+        attrs['rows'] = rows
+        attrs['statuses'] = statuses
+        return attrs
+
+
+class BoardCardSerializer(serializers.ModelSerializer):
+    assignee = serializers.CharField(source='assignee.username', default=None, read_only=True)
+
+    class Meta:
+        model = Task
+        fields = ['id', 'title', 'deadline', 'assignee', 'version']
+
+
+class BoardColumnSerializer(serializers.Serializer):
+    status = serializers.CharField()
+    label = serializers.CharField()
+    count = serializers.IntegerField()
+    cards = BoardCardSerializer(many=True)
+    next_cursor = serializers.CharField(allow_null=True)
+
+
+class CalendarTaskSerializer(serializers.ModelSerializer):
+    assignee = serializers.CharField(source='assignee.username', default=None, read_only=True)
+
+    class Meta:
+        model = Task
+        fields = ['id', 'title', 'status', 'deadline', 'assignee', 'team']
+
+
+class CalendarMeetingSerializer(serializers.ModelSerializer):
+    created_by = serializers.CharField(source='created_by.username', read_only=True)
+    team = serializers.CharField(source='team.name', default=None, read_only=True)
+
+    class Meta:
+        model = Meeting
+        fields = ['id', 'title', 'date', 'time', 'duration', 'team', 'created_by']
@@ -1,12 +1,16 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from api.views import TaskViewSet, UserViewSet
+from api.views import CalendarView, TaskViewSet, TeamAnalyticsView, TeamBoardView, TeamLeaderboardView, UserViewSet
 
 router = DefaultRouter()
 router.register(r'tasks', TaskViewSet, basename='task')
 router.register(r'users', UserViewSet, basename='user')
 
 urlpatterns = [
+    path('calendar/', CalendarView.as_view(), name='api_calendar'),
+    path('teams/<int:team_id>/analytics/', TeamAnalyticsView.as_view(), name='team_analytics'),
+    path('teams/<int:team_id>/board/', TeamBoardView.as_view(), name='team_board'),
+    path('teams/<int:team_id>/leaderboard/', TeamLeaderboardView.as_view(), name='team_leaderboard'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,15 +1,309 @@
-from rest_framework import viewsets
+import hashlib
+import io
+
 from django.contrib.auth import get_user_model
-from tasks.models import Task
-from api.serializers import TaskSerializer, UserSerializer
-from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from django.shortcuts import get_object_or_404
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import generics, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.filters import IndexedOrderingFilter, TaskFilterBackend
+from api.pagination import LeaderboardPagination, TaskCursorPagination, TaskHistoryPagination
+from api.serializers import (
+    BoardCardSerializer,
+    BoardColumnSerializer,
+    CalendarMeetingSerializer,
+    CalendarTaskSerializer,
+    LeaderboardEntrySerializer,
+    TaskBulkUpdateSerializer,
+    TaskChangeSerializer,
+    TaskSerializer,
+    TeamAnalyticsParamsSerializer,
+    UserSerializer,
+)
+from dashboard.cache import get_cached_daily_items, get_month_data, get_month_stamp
+from dashboard.services import build_weeks, get_window_watermark, parse_selected_date
+from dashboard.signals import invalidate_task_rows
+from tasks.exporter import (
+    EXPORT_FORMATS,
+    EXPORT_INCLUDES,
+    export_columns,
+    iter_csv,
+    iter_export_records,
+    iter_ndjson,
+)
+from tasks.history import TaskHistory
+from tasks.importer import IMPORT_FORMATS, detect_format, import_tasks
+from tasks.models import Task, TaskChange, TaskConflict, UserRatingMonth, UserRatingStats
+from tasks.ratings import rating_month
+from tasks.search import search_tasks
+from team_management.cursors import InvalidCursor
+from teams.analytics import get_team_analytics
+from teams.board import get_board, get_column_page
+from teams.models import Team, TeamMember
+
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+
+class TaskPreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "Версия задачи не совпадает с If-Match"
+    default_code = 'precondition_failed'
+
+
+class TaskVersionConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Задачу изменили параллельно, загрузите её заново"
+    default_code = 'conflict'
+
+
+def task_etag(task_id, version):
+    return quote_etag(f'{task_id}.{version}')
 
 class TaskViewSet(viewsets.ModelViewSet):
+    """
+    Задачи с курсорной пагинацией, фильтрами status/team/assignee/deadline_after/deadline_before
+    и сортировкой (?ordering=) только по индексированным created_at и deadline.
+    Исполнитель загружается тем же запросом, что и страница.
+
+    Ответы с одной задачей несут ETag с её версией. Изменение и удаление с If-Match
+    выполняются только для той же версии (иначе 412); параллельное изменение без If-Match даёт 409.
+    """
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskCursorPagination
+    filter_backends = [TaskFilterBackend, IndexedOrderingFilter]
+    ordering_fields = ['created_at', 'deadline']
+    ordering = ['-created_at', '-id']
 
     def get_queryset(self):
-        return Task.objects.all()
+        return Task.objects.select_related('assignee')
+
+    def _check_if_match(self, task):
+        if_match = self.request.headers.get('If-Match')
+        if if_match:
+            etags = parse_etags(if_match)
+            if '*' not in etags and task_etag(task.id, task.version) not in etags:
+                raise TaskPreconditionFailed()
+
+    def _conflict_error(self):
+        return TaskPreconditionFailed() if self.request.headers.get('If-Match') else TaskVersionConflict()
+
+    def retrieve(self, request, *args, **kwargs):
+        task = self.get_object()
+        return Response(self.get_serializer(task).data, headers={'ETag': task_etag(task.id, task.version)})
+
+    def update(self, request, *args, **kwargs):
+        response = super().update(request, *args, **kwargs)
+        response['ETag'] = task_etag(response.data['id'], response.data['version'])
+        return response
+
+    def perform_update(self, serializer):
+        self._check_if_match(serializer.instance)
+        try:
+            with transaction.atomic(), TaskHistory(self.request.user) as history:
+                history.watch(serializer.instance)
+                serializer.save()
+        except TaskConflict:
+            raise self._conflict_error()
+
+    def perform_destroy(self, instance):
+        self._check_if_match(instance)
+        with transaction.atomic():
+            if not Task.objects.filter(id=instance.id, version=instance.version).select_for_update().exists():
+                raise self._conflict_error()
+            instance.delete()
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
+    def bulk(self, request):
+        """
+        Меняет статус, исполнителя или команду сразу у списка задач (до 1000 id).
+        Проверка и один UPDATE выполняются в одной транзакции; права — как у редактирования задачи.
+        """
+        serializer = TaskBulkUpdateSerializer(data=request.data)
+        with transaction.atomic(), TaskHistory(request.user) as history:
+            serializer.is_valid(raise_exception=True)
+            data = serializer.validated_data
+            changes = {field: data[field] for field in ('status', 'assignee', 'team') if field in data}
+            updated = Task.objects.filter(id__in=data['ids']).update(
+                **changes, updated_at=timezone.now(), version=F('version') + 1
+            )
+            after = {field: getattr(value, 'id', value) for field, value in changes.items()}
+            for task_id, (team_id, assignee_id, _) in data['rows'].items():
+                before = {'status': data['statuses'][task_id], 'assignee': assignee_id, 'team': team_id}
+                history.add(task_id, before, after)
+
+        invalidate_task_rows(
+            data['rows'].values(),
+            team_ids=[data['team'].id] if 'team' in data else (),
+            user_ids=[data['assignee'].id] if data.get('assignee') else (),
+        )
+        return Response({'updated': updated})
+
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        """
+        Журнал изменений статуса, исполнителя, срока и команды задачи, от новых записей к старым,
+        с курсорной пагинацией.
+        """
+        task = self.get_object()
+        paginator = TaskHistoryPagination()
+        page = paginator.paginate_queryset(TaskChange.objects.filter(task=task), request, view=self)
+        return paginator.get_paginated_response(TaskChangeSerializer(page, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Полнотекстовый поиск по задачам команд пользователя (параметры q и page),
+        результаты упорядочены по релевантности.
+        """
+        query = request.query_params.get('q', '').strip()
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+        except ValueError:
+            return Response({'page': ["Ожидается число"]}, status=status.HTTP_400_BAD_REQUEST)
+        tasks, has_next = search_tasks(request.user, query, page)
+        return Response({
+            'results': TaskSerializer(tasks, many=True).data,
+            'next_page': page + 1 if has_next else None,
+        })
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export(self, request):
+        """
+        Потоковая выгрузка задач в CSV или NDJSON (export_format) с теми же фильтрами, что и список.
+        include=comments,ratings добавляет комментарии и оценку; задачи идут по возрастанию id.
+        Выгрузка охватывает все команды, поэтому доступна только персоналу.
+        """
+        fmt = request.query_params.get('export_format', 'csv')
+        include = {value for value in request.query_params.get('include', '').split(',') if value}
+        if fmt not in EXPORT_FORMATS:
+            return Response({'export_format': ["Поддерживаются csv и ndjson"]}, status=status.HTTP_400_BAD_REQUEST)
+        if not include <= set(EXPORT_INCLUDES):
+            return Response({'include': ["Допустимы comments и ratings"]}, status=status.HTTP_400_BAD_REQUEST)
+
+        tasks = TaskFilterBackend().filter_queryset(request, Task.objects.all(), self)
+        records = iter_export_records(tasks, include)
+        if fmt == 'csv':
+            content, content_type = iter_csv(records, export_columns(include)), 'text/csv; charset=utf-8'
+        else:
+            content, content_type = iter_ndjson(records), 'application/x-ndjson; charset=utf-8'
+        response = StreamingHttpResponse(content, content_type=content_type)
+        filename = f'tasks-{timezone.localdate():%Y%m%d}.{fmt}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=False, methods=['post'], url_path='import', permission_classes=[IsAdminUser],
+            parser_classes=[MultiPartParser])
+    def import_file(self, request):
+        """
+        Импорт задач из загруженного CSV/NDJSON файла (поле file, формат — file_format или расширение).
+        Файл читается потоком, в ответе — число созданных задач и первые ошибки по строкам.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'file': ["Файл не передан"]}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.data.get('file_format') or detect_format(upload.name)
+        if fmt not in IMPORT_FORMATS:
+            return Response({'file_format': ["Поддерживаются csv и ndjson"]}, status=status.HTTP_400_BAD_REQUEST)
+
+        errors = []
+
+        def report(line_no, row_errors):
+            if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+                errors.append({'line': line_no, 'errors': row_errors})
+
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        try:
+            result = import_tasks(stream, fmt, on_error=report)
+        except UnicodeDecodeError:
+            return Response({'file': ["Файл должен быть в кодировке UTF-8"]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({**result, 'errors': errors})
+
+
+def get_member_team(request, team_id):
+    """
+    Команда, если текущий пользователь в ней состоит или является администратором; иначе 403.
+    """
+    team = get_object_or_404(Team, id=team_id)
+    if not (request.user.is_staff or TeamMember.objects.filter(team=team, user=request.user).exists()):
+        raise PermissionDenied("Данные доступны только участникам команды")
+    return team
+
+
+class TeamLeaderboardView(generics.ListAPIView):
+    """
+    Рейтинг участников команды по средней оценке задач: period=all (за всё время, по умолчанию)
+    или period=month (текущий месяц). Читаются только счётчики UserRatingStats/UserRatingMonth,
+    участники без оценок в рейтинг не попадают. Доступен участникам команды и администраторам.
+    """
+    serializer_class = LeaderboardEntrySerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = LeaderboardPagination
+
+    def get_queryset(self):
+        team = get_member_team(self.request, self.kwargs['team_id'])
+        period = self.request.query_params.get('period', 'all')
+        if period == 'all':
+            counters = UserRatingStats.objects.all()
+        elif period == 'month':
+            counters = UserRatingMonth.objects.filter(month=rating_month(timezone.now()))
+        else:
+            raise ValidationError({'period': ["Допустимы all и month"]})
+        return (
+            counters.filter(user__team_memberships__team=team, count__gt=0)
+            .select_related('user')
+            .annotate(rank_average=Cast('score_sum', FloatField()) / F('count'))
+            .order_by('-rank_average', '-count', 'user_id')
+        )
+
+
+class TeamAnalyticsView(APIView):
+    """
+    Аналитика команды за диапазон дат (start, end в формате YYYY-MM-DD): завершённые задачи
+    по неделям, процентили времени цикла в часах, распределение оценок и доля просроченных задач.
+    Результат кэшируется по (команда, диапазон). Доступна участникам команды и администраторам.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, team_id):
+        team = get_member_team(request, team_id)
+        params = TeamAnalyticsParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return Response(get_team_analytics(team, params.validated_data['start'], params.validated_data['end']))
+
+
+class TeamBoardView(APIView):
+    """
+    Доска задач команды: колонки по статусам с числом задач и первыми карточками.
+    С параметром status отдаёт следующие карточки одной колонки по курсору (cursor).
+    Статус карточки меняется через PATCH /api/tasks/<id>/ с If-Match.
+    Доступна участникам команды и администраторам.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, team_id):
+        team = get_member_team(request, team_id)
+        column_status = request.query_params.get('status')
+        if column_status is None:
+            return Response({'team': team.id, 'columns': BoardColumnSerializer(get_board(team), many=True).data})
+        if column_status not in dict(Task.STATUS_CHOICES):
+            raise ValidationError({'status': ["Некорректный статус"]})
+        try:
+            cards, next_cursor = get_column_page(team, column_status, request.query_params.get('cursor'))
+        except InvalidCursor:
+            raise ValidationError({'cursor': ["Некорректный курсор"]})
+        return Response({'cards': BoardCardSerializer(cards, many=True).data, 'next_cursor': next_cursor})
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -17,4 +311,63 @@ class UserViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return get_user_model().objects.all()
\ No newline at end of file
+        return get_user_model().objects.all()
+
+
+class CalendarView(APIView):
+    """
+    Сетка календаря на месяц в JSON: количество задач и встреч по дням
+    и списки задач и встреч на выбранный день (параметры year, month, day).
+
+    Отдаёт ETag, построенный по дешёвому валидатору окна сетки. Если клиент прислал
+    совпадающий If-None-Match, отвечает 304 без построения тела ответа.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        today = timezone.now().date()
+        selected_date = parse_selected_date(request.query_params, today)
+        year, month = selected_date.year, selected_date.month
+
+        etag = self._get_etag(request.user, selected_date)
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            if etag in etags or '*' in etags:
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        month_data = get_month_data(request.user, year, month)
+        weeks = build_weeks(
+            year, month, selected_date, today, month_data['tasks_count'], month_data['meetings_count']
+        )
+        daily_tasks, daily_meetings = get_cached_daily_items(request.user, selected_date)
+        return Response({
+            'year': year,
+            'month': month,
+            'selected_date': selected_date,
+            'weeks': [
+                [
+                    {
+                        'date': day['date'],
+                        'in_month': day['in_month'],
+                        'tasks_count': day['tasks_count'],
+                        'meetings_count': day['meetings_count'],
+                    }
+                    for day in week
+                ]
+                for week in weeks
+            ],
+            'tasks': CalendarTaskSerializer(daily_tasks, many=True).data,
+            'meetings': CalendarMeetingSerializer(daily_meetings, many=True).data,
+        }, headers={'ETag': etag})
+
+    @staticmethod
+    def _get_etag(user, selected_date):
+        year, month = selected_date.year, selected_date.month
+        parts = (
+            user.id,
+            selected_date,
+            get_month_stamp(user, year, month),
+            *get_window_watermark(user, year, month),
+        )
+        return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
@@ -1,8 +1,9 @@
-from datetime import timedelta, time
+from datetime import datetime, timedelta, time
 
 import factory
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.utils import timezone
 
 from tasks.models import Task, TaskRating
@@ -132,3 +133,19 @@ class TaskRatingFactory(factory.django.DjangoModelFactory):
     score = 5
 
 
+
+
+def aware(day, hour=0, minute=0):
+    """Время day hour:minute в текущем часовом поясе"""
+    return timezone.make_aware(datetime.combine(day, time(hour, minute)), timezone.get_current_timezone())
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Очищает кэш между тестами: идентификаторы объектов в SQLite переиспользуются
+    после отката транзакции, и закэшированные данные одного теста видны другому.
+    """
+    cache.clear()
+    yield
+    cache.clear()
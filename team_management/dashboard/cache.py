@@ -0,0 +1,146 @@
+import time
+from datetime import date
+
+from django.core.cache import cache
+
+from dashboard.services import get_daily_items, get_grid_bounds, get_month_counts
+from meetings.models import Meeting
+from tasks.models import Task
+
+CACHE_TIMEOUT = 60 * 60
+
+
+def _generation_key(user_id):
+    return f'dashboard:generation:{user_id}'
+
+
+def _month_key(user_id, generation, stamp, year, month):
+    return f'dashboard:month:{user_id}:{generation}:{stamp}:{year}-{month:02d}'
+
+
+def _day_key(user_id, generation, stamp, day):
+    return f'dashboard:day:{user_id}:{generation}:{stamp}:{day.isoformat()}'
+
+
+def _stamp_key(user_id, generation, year, month):
+    return f'dashboard:stamp:{user_id}:{generation}:{year}-{month:02d}'
+
+
+def _get_generations(user_ids):
+    """
+    Возвращает поколение кэша для каждого пользователя.
+    Поколение — метка времени, поэтому после вытеснения ключа новое значение
+    не совпадёт со старыми корзинами и устаревшие данные не всплывут.
+    """
+    keys = {_generation_key(user_id): user_id for user_id in user_ids}
+    generations = {keys[key]: value for key, value in cache.get_many(list(keys)).items()}
+    missing = {}
+    for key, user_id in keys.items():
+        if user_id not in generations:
+            generations[user_id] = missing[key] = time.time_ns()
+    if missing:
+        cache.set_many(missing, None)
+    return generations
+
+
+def _months_showing(day):
+    """
+    Месяцы, в сетке календаря которых виден указанный день:
+    сам месяц и соседние, если день попадает в их неполные недели.
+    """
+    year, month = day.year, day.month
+    candidates = [
+        (year - 1, 12) if month == 1 else (year, month - 1),
+        (year, month),
+        (year + 1, 1) if month == 12 else (year, month + 1),
+    ]
+    months = []
+    for candidate in candidates:
+        grid_start, grid_end = get_grid_bounds(*candidate)
+        if grid_start <= day <= grid_end:
+            months.append(candidate)
+    return months
+
+
+def _get_stamp(user_id, generation, year, month):
+    """
+    Метка версии корзины месяца; создаётся через cache.add, чтобы параллельные запросы
+    не перезаписали метку друг друга.
+    """
+    key = _stamp_key(user_id, generation, year, month)
+    stamp = cache.get(key)
+    if stamp is None:
+        candidate = time.time_ns()
+        stamp = candidate if cache.add(key, candidate, CACHE_TIMEOUT) else cache.get(key, candidate)
+    return stamp
+
+
+def get_month_data(user, year, month):
+    """
+    Возвращает закэшированную корзину месяца пользователя: количества задач/встреч по дням сетки.
+
+    Ключ корзины содержит метку версии месяца, которую инвалидация удаляет. Если корзину
+    сбросили, пока она считалась, запись уйдёт под старую метку и читаться больше не будет,
+    так что устаревшие данные не вернутся в кэш.
+    """
+    generation = _get_generations([user.id])[user.id]
+    stamp = _get_stamp(user.id, generation, year, month)
+    key = _month_key(user.id, generation, stamp, year, month)
+    data = cache.get(key)
+    if data is None:
+        tasks_count, meetings_count = get_month_counts(
+            year, month, Task.objects.visible_to(user), Meeting.objects.visible_to(user)
+        )
+        data = {'tasks_count': tasks_count, 'meetings_count': meetings_count}
+        cache.set(key, data, CACHE_TIMEOUT)
+    return data
+
+
+def get_cached_daily_items(user, day):
+    """
+    Возвращает задачи и встречи пользователя на день. Каждый день хранится под своим ключом
+    с меткой версии месяца этого дня: корзина месяца не перечитывается и не перезаписывается,
+    а запись, опоздавшая к инвалидации, остаётся под старой меткой.
+    """
+    generation = _get_generations([user.id])[user.id]
+    stamp = _get_stamp(user.id, generation, day.year, day.month)
+    key = _day_key(user.id, generation, stamp, day)
+    items = cache.get(key)
+    if items is None:
+        items = get_daily_items(user, day)
+        cache.set(key, items, CACHE_TIMEOUT)
+    return items
+
+
+def get_month_stamp(user, year, month):
+    """
+    Метка версии корзины месяца пользователя. Меняется при каждой инвалидации корзины,
+    поэтому подходит для ETag без обращения к БД.
+    """
+    generation = _get_generations([user.id])[user.id]
+    return _get_stamp(user.id, generation, year, month)
+
+
+def invalidate_days(user_ids, days):
+    """
+    Сбрасывает корзины месяцев, в сетке которых видны указанные дни, для указанных пользователей:
+    удаляются метки версий, данные под старыми метками больше не читаются и истекают по таймауту.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id}
+    months = {month for day in days if isinstance(day, date) for month in _months_showing(day)}
+    if not user_ids or not months:
+        return
+    generations = _get_generations(user_ids)
+    cache.delete_many([
+        _stamp_key(user_id, generation, year, month)
+        for user_id, generation in generations.items()
+        for year, month in months
+    ])
+
+
+def invalidate_user(user_id):
+    """
+    Сбрасывает весь кэш календаря пользователя, сменив его поколение.
+    Используется, когда меняется состав команд пользователя.
+    """
+    cache.set(_generation_key(user_id), time.time_ns(), None)
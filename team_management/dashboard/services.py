@@ -0,0 +1,274 @@
+from calendar import monthrange
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+
+from django.db.models import Count, Max, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from meetings.models import Meeting, expand_occurrences
+from tasks.models import Task
+from team_management.cursors import decode_cursor, encode_cursor
+
+
+def parse_selected_date(params, today):
+    """
+    Разбирает параметры year/month/day запроса в дату.
+    При отсутствующих или некорректных значениях возвращает today.
+    """
+    try:
+        year = int(params.get('year', today.year))
+        month = int(params.get('month', today.month))
+        day = int(params.get('day', today.day))
+        return datetime(year, month, day).date()
+    except (TypeError, ValueError, OverflowError):
+        return today
+
+
+def get_grid_bounds(year, month):
+    """
+    Возвращает первый и последний день сетки календаря (с понедельника по воскресенье),
+    полностью покрывающей указанный месяц.
+    """
+    first_day = datetime(year, month, 1).date()
+    last_day = datetime(year, month, monthrange(year, month)[1]).date()
+    grid_start = first_day - timedelta(days=first_day.weekday())
+    grid_end = last_day + timedelta(days=6 - last_day.weekday())
+    return grid_start, grid_end
+
+
+def _day_range_to_datetimes(start, end):
+    """
+    Переводит диапазон дат [start, end] в полуинтервал aware-datetime [начало start, начало end + 1),
+    чтобы фильтр по DateTimeField использовал индекс, а не функцию над столбцом.
+    """
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(start, time.min), tz),
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz),
+    )
+
+
+def get_window_watermark(user, year, month):
+    """
+    Дешёвый валидатор содержимого сетки месяца: число строк и максимальные id/created_at
+    задач и встреч пользователя в окне сетки. Два агрегирующих запроса без GROUP BY.
+    """
+    grid_start, grid_end = get_grid_bounds(year, month)
+    start_dt, end_dt = _day_range_to_datetimes(grid_start, grid_end)
+    tasks = (
+        Task.objects.visible_to(user)
+        .filter(deadline__gte=start_dt, deadline__lt=end_dt)
+        .aggregate(count=Count('id'), max_id=Max('id'), max_created=Max('created_at'))
+    )
+    meetings = (
+        Meeting.objects.visible_to(user)
+        .overlapping(start_dt, end_dt)
+        .aggregate(count=Count('id'), max_id=Max('id'))
+    )
+    return (
+        tasks['count'], tasks['max_id'], tasks['max_created'] and tasks['max_created'].isoformat(),
+        meetings['count'], meetings['max_id'],
+    )
+
+
+def count_tasks_by_day(tasks, start, end):
+    """
+    Считает задачи по дням дедлайна в диапазоне [start, end] одним GROUP BY запросом.
+    """
+    start_dt, end_dt = _day_range_to_datetimes(start, end)
+    rows = (
+        tasks.filter(deadline__gte=start_dt, deadline__lt=end_dt)
+        .annotate(day=TruncDate('deadline'))
+        .order_by()
+        .values('day')
+        .annotate(count=Count('id'))
+        .values_list('day', 'count')
+    )
+    return dict(rows)
+
+
+def count_meetings_by_day(meetings, start, end):
+    """
+    Считает встречи по дням в диапазоне [start, end].
+
+    Одиночные встречи считаются одним GROUP BY запросом, повторяющиеся серии,
+    пересекающие диапазон, загружаются вторым запросом и разворачиваются только в его пределах.
+    """
+    rows = (
+        meetings.filter(recurrence='', date__range=(start, end))
+        .order_by()
+        .values('date')
+        .annotate(count=Count('id'))
+        .values_list('date', 'count')
+    )
+    counts = dict(rows)
+    start_dt, end_dt = _day_range_to_datetimes(start, end)
+    series = meetings.exclude(recurrence='').overlapping(start_dt, end_dt)
+    for occurrence in expand_occurrences(series, start_dt, end_dt):
+        if start <= occurrence.date <= end:
+            counts[occurrence.date] = counts.get(occurrence.date, 0) + 1
+    return counts
+
+
+def get_month_counts(year, month, tasks=None, meetings=None):
+    """
+    Возвращает словари {дата: количество} задач и встреч для всех дней сетки месяца.
+
+    Выполняет по одному агрегирующему запросу на модель, ограниченному датами сетки,
+    и один запрос повторяющихся серий, пересекающих сетку,
+    поэтому стоимость зависит от числа отображаемых дней, а не от размера таблиц.
+    """
+    if tasks is None:
+        tasks = Task.objects.all()
+    if meetings is None:
+        meetings = Meeting.objects.all()
+
+    grid_start, grid_end = get_grid_bounds(year, month)
+    return (
+        count_tasks_by_day(tasks, grid_start, grid_end),
+        count_meetings_by_day(meetings, grid_start, grid_end),
+    )
+
+
+def build_weeks(year, month, selected_date, today, tasks_count, meetings_count):
+    """
+    Раскладывает посчитанные по дням количества в список недель по 7 дней.
+    """
+    grid_start, grid_end = get_grid_bounds(year, month)
+    weeks = []
+    current_date = grid_start
+    while current_date <= grid_end:
+        week = []
+        for _ in range(7):
+            week.append({
+                'date': current_date,
+                'in_month': current_date.month == month,
+                'tasks_count': tasks_count.get(current_date, 0),
+                'meetings_count': meetings_count.get(current_date, 0),
+                'is_today': current_date == today,
+                'is_selected': current_date == selected_date,
+            })
+            current_date += timedelta(days=1)
+        weeks.append(week)
+    return weeks
+
+
+def build_month_grid(year, month, selected_date, today, tasks=None, meetings=None):
+    """
+    Строит сетку календаря на месяц: список недель, каждая из 7 дней
+    с количеством задач и встреч.
+    """
+    tasks_count, meetings_count = get_month_counts(year, month, tasks, meetings)
+    return build_weeks(year, month, selected_date, today, tasks_count, meetings_count)
+
+
+def get_daily_items(user, day):
+    """
+    Возвращает списки задач (по дедлайну) и встреч пользователя на указанный день.
+    """
+    start_dt, end_dt = _day_range_to_datetimes(day, day)
+    daily_tasks = list(
+        Task.objects.visible_to(user)
+        .filter(deadline__gte=start_dt, deadline__lt=end_dt)
+        .select_related('assignee')
+        .order_by('deadline', 'id')
+    )
+    series_ids = Meeting.objects.exclude(recurrence='').overlapping(start_dt, end_dt).values('id')
+    meetings = (
+        Meeting.objects.visible_to(user)
+        .filter(Q(recurrence='', date=day) | Q(id__in=series_ids))
+        .select_related('team', 'created_by')
+    )
+    daily_meetings = [
+        occurrence for occurrence in expand_occurrences(meetings, start_dt, end_dt)
+        if occurrence.date == day
+    ]
+    return daily_tasks, daily_meetings
+
+
+FEED_PAGE_SIZE = 20
+# Насколько вперёд разворачиваются серии в ленте ближайших встреч.
+FEED_SERIES_HORIZON = timedelta(days=366 * 2)
+
+
+def _take_page(queryset, page_size, make_cursor):
+    """
+    Забирает page_size + 1 строк, чтобы узнать о наличии следующей страницы без COUNT.
+    """
+    items = list(queryset[:page_size + 1])
+    has_more = len(items) > page_size
+    items = items[:page_size]
+    next_cursor = make_cursor(items[-1]) if has_more else None
+    return items, next_cursor
+
+
+def get_tasks_page(user, cursor=None, page_size=FEED_PAGE_SIZE):
+    """
+    Страница ленты задач пользователя, от новых к старым по (created_at, id).
+    Возвращает кортеж (задачи, курсор следующей страницы или None).
+    """
+    tasks = (
+        Task.objects.visible_to(user)
+        .select_related('assignee', 'team')
+        .order_by('-created_at', '-id')
+    )
+    if cursor:
+        created_at, task_id = decode_cursor(cursor, datetime.fromisoformat, int)
+        tasks = tasks.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=task_id))
+    return _take_page(tasks, page_size, lambda task: encode_cursor(task.created_at, task.id))
+
+
+def _meeting_key(meeting):
+    return meeting.date, meeting.time, meeting.id
+
+
+def _series_occurrences(series, after, start_date, limit):
+    """
+    Ближайшие limit повторений серии с датой не раньше start_date и ключом (date, time, id) больше after.
+    Серия разворачивается лениво с дня начала окна, просмотр ограничен FEED_SERIES_HORIZON.
+    """
+    window_start = timezone.make_aware(datetime.combine(start_date, time.min), timezone.get_current_timezone())
+    occurrences = (
+        occurrence for occurrence in series.iter_occurrences(window_start, window_start + FEED_SERIES_HORIZON)
+        if occurrence.date >= start_date and (after is None or _meeting_key(occurrence) > after)
+    )
+    return list(islice(occurrences, limit))
+
+
+def get_meetings_page(user, cursor=None, page_size=FEED_PAGE_SIZE, start_date=None):
+    """
+    Страница ленты ближайших встреч пользователя по (date, time, id), начиная с start_date.
+    Повторяющиеся серии попадают в ленту ближайшими повторениями, даже если начались раньше.
+    Возвращает кортеж (встречи и повторения, курсор следующей страницы или None).
+
+    Одиночные встречи читаются по индексу (date, time, id) с LIMIT; активные серии —
+    одним запросом, каждая разворачивается не дальше page_size + 1 повторений после курсора.
+    Затем списки сливаются по ключу.
+    """
+    if start_date is None:
+        start_date = timezone.now().date()
+    after = None
+    if cursor:
+        after = tuple(decode_cursor(cursor, date.fromisoformat, time.fromisoformat, int))
+        start_date = after[0]
+    window_start = timezone.make_aware(datetime.combine(start_date, time.min), timezone.get_current_timezone())
+    visible = Meeting.objects.visible_to(user).select_related('created_by', 'team')
+
+    single = visible.filter(recurrence='', date__gte=start_date).order_by('date', 'time', 'id')
+    if after:
+        meeting_date, meeting_time, meeting_id = after
+        single = single.filter(
+            Q(date__gt=meeting_date)
+            | Q(date=meeting_date, time__gt=meeting_time)
+            | Q(date=meeting_date, time=meeting_time, id__gt=meeting_id)
+        )
+    meetings = list(single[:page_size + 1])
+
+    series = visible.exclude(recurrence='').filter(
+        Q(series_ends_at__isnull=True) | Q(series_ends_at__gt=window_start)
+    )
+    for meeting in series:
+        meetings.extend(_series_occurrences(meeting, after, start_date, page_size + 1))
+    meetings.sort(key=_meeting_key)
+    return _take_page(meetings, page_size, lambda meeting: encode_cursor(*_meeting_key(meeting)))
@@ -0,0 +1,192 @@
+from datetime import date, datetime
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from dashboard.cache import invalidate_days, invalidate_user
+from meetings.models import Meeting
+from meetings.signals import participants_changed
+from tasks.models import Task
+from teams.models import TeamMember
+
+
+def _as_date(value):
+    """
+    Приводит дату/дедлайн к date. Представления иногда присваивают полям строки из POST.
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        return value.date() if timezone.is_naive(value) else timezone.localdate(value)
+    if isinstance(value, date):
+        return value
+    return None
+
+
+def _team_user_ids(team_id):
+    if not team_id:
+        return set()
+    return set(TeamMember.objects.filter(team_id=team_id).values_list('user_id', flat=True))
+
+
+def invalidate_task_rows(rows, team_ids=(), user_ids=()):
+    """
+    Сбрасывает кэш после массового изменения задач через queryset.update(), который не шлёт post_save.
+    rows — тройки (team_id, assignee_id, deadline) задач до изменения,
+    team_ids и user_ids — новые команды и исполнители, если они менялись.
+    """
+    rows = list(rows)
+    teams = {team_id for team_id, _, _ in rows} | set(team_ids)
+    users = set(
+        TeamMember.objects.filter(team_id__in=teams).values_list('user_id', flat=True)
+    ) if teams else set()
+    users |= {assignee_id for _, assignee_id, _ in rows} | set(user_ids)
+    invalidate_days(users, {_as_date(deadline) for _, _, deadline in rows})
+
+
+def _task_footprint(task):
+    """
+    Пользователи, в календаре которых видна задача, и день её дедлайна.
+    """
+    return _team_user_ids(task.team_id) | {task.assignee_id}, {_as_date(task.deadline)}
+
+
+def _meeting_days(meeting):
+    """
+    День встречи или None для повторяющейся серии — она может задевать любой месяц.
+    """
+    return None if meeting.recurrence else {_as_date(meeting.date)}
+
+
+def _meeting_footprint(meeting):
+    """
+    Пользователи, в календаре которых видна встреча, и день её проведения.
+    """
+    user_ids = _team_user_ids(meeting.team_id) | {meeting.created_by_id}
+    if meeting.pk:
+        user_ids |= set(meeting.participants.values_list('id', flat=True))
+    return user_ids, _meeting_days(meeting)
+
+
+def _invalidate_footprint(user_ids, days):
+    """
+    Сбрасывает кэш дней; days=None означает все месяцы пользователей.
+    """
+    if days is None:
+        for user_id in user_ids:
+            invalidate_user(user_id)
+    else:
+        invalidate_days(user_ids, days)
+
+
+def _merge_days(old_days, new_days):
+    if old_days is None or new_days is None:
+        return None
+    return old_days | new_days
+
+
+def _remember_old_footprint(model, instance, footprint):
+    if not instance.pk:
+        instance._dashboard_old_footprint = (set(), set())
+        return
+    old = model.objects.filter(pk=instance.pk).first()
+    instance._dashboard_old_footprint = footprint(old) if old else (set(), set())
+
+
+def _invalidate(instance, footprint):
+    old_users, old_days = getattr(instance, '_dashboard_old_footprint', (set(), set()))
+    new_users, new_days = footprint(instance)
+    _invalidate_footprint(old_users | new_users, _merge_days(old_days, new_days))
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_state(sender, instance, **kwargs):
+    _remember_old_footprint(Task, instance, _task_footprint)
+
+
+@receiver(post_save, sender=Task)
+def invalidate_task_months(sender, instance, **kwargs):
+    _invalidate(instance, _task_footprint)
+
+
+@receiver(pre_save, sender=Meeting)
+def remember_meeting_state(sender, instance, **kwargs):
+    _remember_old_footprint(Meeting, instance, _meeting_footprint)
+
+
+@receiver(post_save, sender=Meeting)
+def invalidate_meeting_months(sender, instance, **kwargs):
+    _invalidate(instance, _meeting_footprint)
+
+
+@receiver(pre_delete, sender=Task)
+@receiver(pre_delete, sender=Meeting)
+def remember_deleted_state(sender, instance, **kwargs):
+    footprint = _task_footprint if sender is Task else _meeting_footprint
+    instance._dashboard_old_footprint = footprint(instance)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Meeting)
+def invalidate_deleted_months(sender, instance, **kwargs):
+    users, days = getattr(instance, '_dashboard_old_footprint', (set(), set()))
+    _invalidate_footprint(users, days)
+
+
+def _meetings_days(meetings):
+    """
+    Дни набора встреч или None, если среди них есть повторяющаяся серия.
+    """
+    days = set()
+    for day, recurrence in meetings.values_list('date', 'recurrence'):
+        if recurrence:
+            return None
+        days.add(_as_date(day))
+    return days
+
+
+@receiver(m2m_changed, sender=Meeting.participants.through)
+def invalidate_participant_months(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Добавление или удаление участников меняет набор календарей, где видна встреча.
+    """
+    if action == 'pre_clear':
+        if reverse:
+            instance._dashboard_cleared_days = _meetings_days(instance.meeting_set.all())
+        else:
+            instance._dashboard_cleared_users = set(instance.participants.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if reverse:
+        if action == 'post_clear':
+            days = getattr(instance, '_dashboard_cleared_days', set())
+        else:
+            days = _meetings_days(Meeting.objects.filter(pk__in=pk_set))
+        _invalidate_footprint({instance.pk}, days)
+    else:
+        if action == 'post_clear':
+            user_ids = getattr(instance, '_dashboard_cleared_users', set())
+        else:
+            user_ids = pk_set or set()
+        _invalidate_footprint(user_ids, _meeting_days(instance))
+
+
+@receiver(participants_changed, sender=Meeting)
+def invalidate_changed_participants(sender, meeting, added, removed, **kwargs):
+    """
+    Правка состава участников встречи в обход m2m_changed: сбрасываются календари
+    добавленных и удалённых пользователей.
+    """
+    _invalidate_footprint(added | removed, _meeting_days(meeting))
+
+
+@receiver(post_save, sender=TeamMember)
+@receiver(post_delete, sender=TeamMember)
+def invalidate_member_calendar(sender, instance, **kwargs):
+    invalidate_user(instance.user_id)
@@ -1,12 +1,19 @@
-from calendar import monthrange
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 from django.contrib.auth.decorators import login_required
+from django.http import HttpResponseBadRequest
 from django.shortcuts import render
+from django.urls import reverse
 from django.utils import timezone
 
-from meetings.models import Meeting
-from tasks.models import Task
+from dashboard.cache import get_cached_daily_items, get_month_data
+from dashboard.services import (
+    build_weeks,
+    get_meetings_page,
+    get_tasks_page,
+    parse_selected_date,
+)
+from team_management.cursors import InvalidCursor
 
 
 @login_required
@@ -18,62 +25,32 @@ def dashboard_view(request):
        в которых есть задачи или встречи. Позволяет перемещаться между днями, месяцами.
        Возвращает:
            HttpResponse: HTML-страница 'dashboard.html' с контекстом:
-               - tasks: все задачи
-               - upcoming_meetings: все встречи
+               - tasks: первая страница задач команд пользователя
+               - tasks_next_cursor: курсор следующей страницы задач
+               - upcoming_meetings: первая страница ближайших встреч пользователя
+               - meetings_next_cursor: курсор следующей страницы встреч
                - daily_tasks: задачи на выбранную дату
                - daily_meetings: встречи на выбранную дату
                - calendar: данные для отрисовки календаря, включая недели, количество задач/встреч по дням
        """
-    tasks = Task.objects.all()
-
     today = timezone.now().date()
-    meetings = Meeting.objects.all()
-    try:
-        year = int(request.GET.get('year', today.year))
-        month = int(request.GET.get('month', today.month))
-        day = int(request.GET.get('day', today.day))
-        selected_date = datetime(year, month, day).date()
-    except:
-        selected_date = today
-    daily_tasks = tasks.filter(deadline__date=selected_date)
-    daily_meetings = meetings.filter(date=selected_date)
-    first_day = datetime(year, month, 1).date()
-    last_day = datetime(year, month, monthrange(year, month)[1]).date()
-
-    tasks_count = {}
-    meetings_count = {}
-
-    for task in tasks:
-        day = task.deadline.date()
-        tasks_count[day] = tasks_count.get(day, 0) + 1
-
-    for meeting in meetings:
-        day = meeting.date
-        meetings_count[day] = meetings_count.get(day, 0) + 1
+    selected_date = parse_selected_date(request.GET, today)
+    year, month, day = selected_date.year, selected_date.month, selected_date.day
+    daily_tasks, daily_meetings = get_cached_daily_items(request.user, selected_date)
+    month_data = get_month_data(request.user, year, month)
+    weeks = build_weeks(
+        year, month, selected_date, today, month_data['tasks_count'], month_data['meetings_count']
+    )
 
-    weeks = []
-    current_date = first_day - timedelta(days=first_day.weekday())
-
-    for _ in range(6):
-        week = []
-        for _ in range(7):
-            week_day = {
-                'date': current_date,
-                'in_month': current_date.month == month,
-                'tasks_count': tasks_count.get(current_date, 0),
-                'meetings_count': meetings_count.get(current_date, 0),
-                'is_today': current_date == today,
-                'is_selected': current_date == selected_date,
-            }
-            week.append(week_day)
-            current_date += timedelta(days=1)
-        weeks.append(week)
-        if current_date > last_day:
-            break
+    task_page, tasks_next_cursor = get_tasks_page(request.user)
+    meeting_page, meetings_next_cursor = get_meetings_page(request.user, start_date=today)
 
     context = {
-        'tasks': tasks.order_by('-created_at'),
-        'upcoming_meetings': meetings,
+        'tasks': task_page,
+        'tasks_next_cursor': tasks_next_cursor,
+        'upcoming_meetings': meeting_page,
+        'meetings_next_cursor': meetings_next_cursor,
+        'back_url': request.get_full_path(),
         'daily_tasks': daily_tasks,
         'daily_meetings': daily_meetings,
         'calendar': {
@@ -91,3 +68,37 @@ def dashboard_view(request):
         }
     }
     return render(request, 'dashboard.html', context)
+
+
+@login_required
+def dashboard_tasks_feed(request):
+    """
+    Фрагмент HTML со следующей страницей карточек задач для кнопки «Показать ещё».
+    Принимает параметр cursor из предыдущей страницы.
+    """
+    try:
+        tasks, next_cursor = get_tasks_page(request.user, request.GET.get('cursor'))
+    except InvalidCursor:
+        return HttpResponseBadRequest("Некорректный курсор")
+    return render(request, 'dashboard/task_cards.html', {
+        'tasks': tasks,
+        'next_cursor': next_cursor,
+        'back_url': reverse('dashboard'),
+    })
+
+
+@login_required
+def dashboard_meetings_feed(request):
+    """
+    Фрагмент HTML со следующей страницей карточек ближайших встреч для кнопки «Показать ещё».
+    Принимает параметр cursor из предыдущей страницы.
+    """
+    try:
+        meetings, next_cursor = get_meetings_page(request.user, request.GET.get('cursor'))
+    except InvalidCursor:
+        return HttpResponseBadRequest("Некорректный курсор")
+    return render(request, 'dashboard/meeting_cards.html', {
+        'upcoming_meetings': meetings,
+        'next_cursor': next_cursor,
+        'back_url': reverse('dashboard'),
+    })
@@ -2,6 +2,7 @@ from django import forms
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+from users.models import User
 from .models import Meeting
 
 
@@ -13,6 +14,7 @@ class MeetingForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         self.user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
+        self.fields['recurrence_interval'].required = False
 
     def save(self, commit=True):
         meeting = super().save(commit=False)
@@ -24,19 +26,28 @@ class MeetingForm(forms.ModelForm):
 
     class Meta:
         model = Meeting
-        fields = ['title', 'description', 'date', 'time', 'duration', 'participants']
+        fields = [
+            'title', 'description', 'date', 'time', 'duration', 'participants',
+            'recurrence', 'recurrence_interval', 'recurrence_until', 'recurrence_count',
+        ]
         widgets = {
             'date': forms.DateInput(attrs={'type': 'date'}),
+            'recurrence_until': forms.DateInput(attrs={'type': 'date'}),
             'time': forms.TimeInput(attrs={'type': 'time'}),
             'duration': forms.TimeInput(attrs={'type': 'time'}),
         }
 
     def clean(self):
-        from .views import _check_time_conflict
+        from .views import _find_conflicting_user_ids
         cleaned_data = super().clean()
         date = cleaned_data.get('date')
         time = cleaned_data.get('time')
         duration = cleaned_data.get('duration')
+        if not cleaned_data.get('recurrence_interval'):
+            cleaned_data['recurrence_interval'] = 1
+        recurrence_until = cleaned_data.get('recurrence_until')
+        if date and recurrence_until and recurrence_until < date:
+            raise ValidationError("Дата окончания повторений раньше даты встречи")
 
         if date and time and duration:
             if date < timezone.now().date():
@@ -45,16 +56,71 @@ class MeetingForm(forms.ModelForm):
             if (date == timezone.now().date() and
                     time < timezone.now().time()):
                 raise ValidationError("Нельзя создать встречу в прошедшем времени")
-            for participant in cleaned_data.get('participants', []):
-                if _check_time_conflict(
-                        participant,
-                        date,
-                        time,
-                        duration,
-                        self.instance.id if self.instance else None
-                ):
-                    raise ValidationError(
-                        f"У участника {participant.username} уже есть встреча в это время"
-                    )
+            participants = list(cleaned_data.get('participants', []))
+            schedule = Meeting(
+                recurrence=cleaned_data.get('recurrence') or '',
+                recurrence_interval=cleaned_data['recurrence_interval'],
+                recurrence_until=recurrence_until,
+                recurrence_count=cleaned_data.get('recurrence_count'),
+            )
+            conflicting_ids = _find_conflicting_user_ids(
+                [participant.id for participant in participants],
+                date,
+                time,
+                duration,
+                self.instance.id if self.instance else None,
+                schedule,
+            )
+            if conflicting_ids:
+                raise ValidationError([
+                    f"У участника {participant.username} уже есть встреча в это время"
+                    for participant in participants
+                    if participant.id in conflicting_ids
+                ])
 
         return cleaned_data
+
+
+class FreeSlotsForm(forms.Form):
+    """
+    Параметры поиска общих свободных слотов: участники, диапазон дат,
+    длительность встречи в минутах и количество слотов.
+    """
+    MAX_RANGE_DAYS = 31
+
+    users = forms.ModelMultipleChoiceField(queryset=User.objects.all())
+    start = forms.DateField()
+    end = forms.DateField()
+    duration = forms.IntegerField(min_value=5, max_value=24 * 60)
+    limit = forms.IntegerField(min_value=1, max_value=50, required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start = cleaned_data.get('start')
+        end = cleaned_data.get('end')
+        if start and end:
+            if end < start:
+                raise ValidationError("Дата окончания раньше даты начала")
+            if (end - start).days > self.MAX_RANGE_DAYS:
+                raise ValidationError(f"Диапазон поиска не может превышать {self.MAX_RANGE_DAYS} дней")
+        return cleaned_data
+
+
+class ParticipantSearchForm(forms.Form):
+    """
+    Параметры поиска участников встречи: строка поиска, область (команды организатора
+    или все пользователи), номер страницы и предлагаемый слот (date, time, duration)
+    для отметки занятых. meeting — редактируемая встреча, её собственный слот не считается занятостью.
+    """
+    SCOPE_CHOICES = (
+        ('teams', 'Мои команды'),
+        ('all', 'Все пользователи'),
+    )
+
+    q = forms.CharField(required=False)
+    scope = forms.ChoiceField(choices=SCOPE_CHOICES, required=False)
+    page = forms.IntegerField(min_value=1, max_value=100, required=False)
+    date = forms.DateField(required=False)
+    time = forms.TimeField(required=False)
+    duration = forms.DurationField(required=False)
+    meeting = forms.IntegerField(min_value=1, required=False)
@@ -0,0 +1,193 @@
+import hashlib
+from datetime import datetime, timezone as dt_timezone
+
+from django.db.models import Count, Max, Prefetch, Q
+from django.utils import timezone
+
+from tasks.models import Task
+from users.models import User
+from .models import Meeting
+
+ICS_CHUNK_SIZE = 500
+ICS_LINE_LIMIT = 75
+PRODID = '-//Team Management//Calendar//RU'
+ATTENDEE_FIELDS = ('username', 'first_name', 'last_name', 'email')
+RRULE_FREQ = {'daily': 'DAILY', 'weekly': 'WEEKLY', 'monthly': 'MONTHLY'}
+
+
+def feed_meetings(user):
+    """
+    Встречи, попадающие в календарь пользователя: он участник или организатор.
+    """
+    participant_meetings = Meeting.participants.through.objects.filter(user=user).values('meeting_id')
+    return Meeting.objects.filter(Q(id__in=participant_meetings) | Q(created_by=user))
+
+
+def feed_tasks(user):
+    """
+    Задачи, дедлайны которых попадают в календарь пользователя: назначенные ему.
+    """
+    return Task.objects.filter(assignee=user)
+
+
+def get_feed_etag(user):
+    """
+    Возвращает ETag календаря пользователя.
+
+    Три агрегирующих запроса без выборки строк: число и последнее изменение встреч и задач
+    и состав участников встреч. Удаление меняет число строк, правка — updated_at.
+    Last-Modified не отдаётся: max(updated_at) не растёт при удалении встречи или участника,
+    и клиент, присылающий только If-Modified-Since, получал бы ложный 304.
+    """
+    meetings = feed_meetings(user)
+    meeting_stats = meetings.aggregate(count=Count('id'), updated=Max('updated_at'))
+    participant_stats = Meeting.participants.through.objects.filter(
+        meeting_id__in=meetings.values('id')
+    ).aggregate(count=Count('id'), max_id=Max('id'))
+    task_stats = feed_tasks(user).aggregate(count=Count('id'), updated=Max('updated_at'))
+
+    fingerprint = repr((
+        meeting_stats['count'], meeting_stats['updated'] and meeting_stats['updated'].isoformat(),
+        participant_stats['count'], participant_stats['max_id'],
+        task_stats['count'], task_stats['updated'] and task_stats['updated'].isoformat(),
+    ))
+    return '"%s"' % hashlib.md5(fingerprint.encode()).hexdigest()
+
+
+def _escape(text):
+    return (
+        str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """
+    Переносит строку длиннее 75 октетов по RFC 5545, не разрывая UTF-8 символы.
+    """
+    parts = []
+    current, size, limit = [], 0, ICS_LINE_LIMIT
+    for char in line:
+        char_size = len(char.encode('utf-8'))
+        if size + char_size > limit:
+            parts.append(''.join(current))
+            current, size, limit = [], 0, ICS_LINE_LIMIT - 1
+        current.append(char)
+        size += char_size
+    parts.append(''.join(current))
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _format_utc(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _format_local(name, day, time):
+    """
+    Свойство с локальным временем встречи. Повторения считаются по настенным часам,
+    поэтому вне UTC время привязывается к TZID, чтобы серия не съезжала при переходе на летнее время.
+    """
+    zone = timezone.get_current_timezone_name()
+    value = datetime.combine(day, time).strftime('%Y%m%dT%H%M%S')
+    if zone == 'UTC':
+        return f'{name}:{value}Z'
+    return f'{name};TZID={zone}:{value}'
+
+
+def _format_duration(value):
+    seconds = int(value.total_seconds())
+    if seconds <= 0:
+        return 'PT0S'
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    result = f'P{days}D' if days else 'P'
+    time_part = ''.join(
+        f'{amount}{unit}' for amount, unit in ((hours, 'H'), (minutes, 'M'), (seconds, 'S')) if amount
+    )
+    return result + (f'T{time_part}' if time_part else '')
+
+
+def _address(user):
+    return f'CN={_escape(user.get_full_name() or user.username)}:mailto:{user.email}'
+
+
+def _rrule(meeting):
+    parts = [f'FREQ={RRULE_FREQ[meeting.recurrence]}', f'INTERVAL={meeting.recurrence_interval}']
+    if meeting.recurrence_count:
+        parts.append(f'COUNT={meeting.recurrence_count}')
+    if meeting.recurrence_until:
+        until, _ = Meeting.get_interval(meeting.recurrence_until, meeting.time, meeting.duration)
+        parts.append(f'UNTIL={_format_utc(until)}')
+    return 'RRULE:' + ';'.join(parts)
+
+
+def _meeting_lines(meeting):
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:meeting-{meeting.id}@team-management',
+        f'DTSTAMP:{_format_utc(meeting.updated_at)}',
+        f'LAST-MODIFIED:{_format_utc(meeting.updated_at)}',
+        _format_local('DTSTART', meeting.date, meeting.time),
+        f'DURATION:{_format_duration(meeting.duration)}',
+        f'SUMMARY:{_escape(meeting.title)}',
+    ]
+    if meeting.description:
+        lines.append(f'DESCRIPTION:{_escape(meeting.description)}')
+    if meeting.is_recurring:
+        lines.append(_rrule(meeting))
+        for exception in meeting.recurrence_exceptions:
+            lines.append(_format_local('EXDATE', datetime.fromisoformat(exception).date(), meeting.time))
+    if meeting.created_by.email:
+        lines.append(f'ORGANIZER;{_address(meeting.created_by)}')
+    for participant in meeting.participants.all():
+        if participant.email:
+            lines.append(f'ATTENDEE;{_address(participant)}')
+    lines.append('END:VEVENT')
+    return lines
+
+
+def _task_lines(task):
+    return [
+        'BEGIN:VEVENT',
+        f'UID:task-{task.id}@team-management',
+        f'DTSTAMP:{_format_utc(task.updated_at)}',
+        f'LAST-MODIFIED:{_format_utc(task.updated_at)}',
+        f'DTSTART:{_format_utc(task.deadline)}',
+        f'SUMMARY:{_escape("Дедлайн: " + task.title)}',
+        'TRANSP:TRANSPARENT',
+        'END:VEVENT',
+    ]
+
+
+def _render(lines):
+    return ''.join(_fold(line) for line in lines)
+
+
+def iter_calendar(user, chunk_size=ICS_CHUNK_SIZE):
+    """
+    Лениво порождает текст календаря пользователя по одному событию.
+
+    Встречи и задачи читаются через iterator(chunk_size), участники подгружаются
+    одним запросом на пачку, поэтому память не растёт с историей пользователя.
+    Повторяющиеся встречи отдаются одним событием с RRULE, без разворачивания.
+    """
+    yield _render([
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:{_escape(user.username)}',
+    ])
+    meetings = (
+        feed_meetings(user)
+        .select_related('created_by')
+        .prefetch_related(Prefetch('participants', queryset=User.objects.only(*ATTENDEE_FIELDS)))
+        .order_by('id')
+    )
+    for meeting in meetings.iterator(chunk_size=chunk_size):
+        yield _render(_meeting_lines(meeting))
+    tasks = feed_tasks(user).only('id', 'title', 'deadline', 'updated_at').order_by('id')
+    for task in tasks.iterator(chunk_size=chunk_size):
+        yield _render(_task_lines(task))
+    yield _render(['END:VCALENDAR'])
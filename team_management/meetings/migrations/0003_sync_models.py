@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-18 06:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meetings', '0002_initial'),
+        ('teams', '0003_sync_models'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='meeting',
+            name='team',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='teams.team'),
+        ),
+    ]
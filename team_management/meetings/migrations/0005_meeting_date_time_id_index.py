@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 06:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meetings', '0004_meeting_date_index'),
+        ('teams', '0003_sync_models'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='meeting',
+            name='date',
+            field=models.DateField(),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['date', 'time', 'id'], name='meeting_date_time_id_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+def backfill_intervals(apps, schema_editor):
+    """
+    Заполняет starts_at/ends_at для существующих встреч пачками по BATCH_SIZE.
+    """
+    Meeting = apps.get_model('meetings', 'Meeting')
+    tz = timezone.get_current_timezone()
+    batch = []
+    for meeting in Meeting.objects.only('id', 'date', 'time', 'duration').iterator(chunk_size=BATCH_SIZE):
+        meeting.starts_at = timezone.make_aware(datetime.combine(meeting.date, meeting.time), tz)
+        meeting.ends_at = meeting.starts_at + meeting.duration
+        batch.append(meeting)
+        if len(batch) >= BATCH_SIZE:
+            Meeting.objects.bulk_update(batch, ['starts_at', 'ends_at'])
+            batch = []
+    if batch:
+        Meeting.objects.bulk_update(batch, ['starts_at', 'ends_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meetings', '0005_meeting_date_time_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meeting',
+            name='starts_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='meeting',
+            name='ends_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_intervals, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='meeting',
+            name='starts_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AlterField(
+            model_name='meeting',
+            name='ends_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['starts_at', 'ends_at'], name='meeting_interval_idx'),
+        ),
+    ]
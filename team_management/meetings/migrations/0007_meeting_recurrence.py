@@ -0,0 +1,54 @@
+from django.db import migrations, models
+
+
+def fill_series_end(apps, schema_editor):
+    """
+    Все существующие встречи одиночные: граница серии совпадает с концом встречи.
+    """
+    Meeting = apps.get_model('meetings', 'Meeting')
+    Meeting.objects.update(series_ends_at=models.F('ends_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meetings', '0006_meeting_interval'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meeting',
+            name='recurrence',
+            field=models.CharField(blank=True, choices=[('', 'Не повторяется'), ('daily', 'Ежедневно'), ('weekly', 'Еженедельно'), ('monthly', 'Ежемесячно')], default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='meeting',
+            name='recurrence_interval',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='meeting',
+            name='recurrence_until',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='meeting',
+            name='recurrence_count',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='meeting',
+            name='recurrence_exceptions',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='meeting',
+            name='series_ends_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_series_end, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['recurrence', 'starts_at'], name='meeting_series_idx'),
+        ),
+    ]
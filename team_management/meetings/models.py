@@ -1,10 +1,62 @@
+import copy
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+
 from django.db import models
+from django.utils import timezone
 
-from teams.models import Team
+from teams.models import Team, TeamMember
 from users.models import User
 
 
+def _add_months(day, months):
+    """
+    Сдвигает дату на указанное число месяцев.
+    Возвращает None, если в целевом месяце нет такого числа (например, 31-го).
+    """
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    if day.day > monthrange(year, month)[1]:
+        return None
+    return day.replace(year=year, month=month)
+
+
+class MeetingQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """
+        Встречи команд пользователя, а также встречи, где он участник или организатор.
+        """
+        team_ids = TeamMember.objects.filter(user=user).values('team_id')
+        meeting_ids = Meeting.participants.through.objects.filter(user=user).values('meeting_id')
+        return self.filter(
+            models.Q(team_id__in=team_ids) | models.Q(id__in=meeting_ids) | models.Q(created_by=user)
+        )
+
+    def overlapping(self, start, end):
+        """
+        Встречи и серии, у которых хотя бы одно повторение может пересекаться с [start, end).
+        Для одиночных встреч условие точное, серии дальше разворачиваются через iter_occurrences().
+        """
+        return self.filter(starts_at__lt=end).filter(
+            models.Q(recurrence='', ends_at__gt=start)
+            | (~models.Q(recurrence='')
+               & (models.Q(series_ends_at__isnull=True) | models.Q(series_ends_at__gt=start)))
+        )
+
+
 class Meeting(models.Model):
+    RECURRENCE_CHOICES = (
+        ('', 'Не повторяется'),
+        ('daily', 'Ежедневно'),
+        ('weekly', 'Еженедельно'),
+        ('monthly', 'Ежемесячно'),
+    )
+
+    SCHEDULE_FIELDS = {
+        'date', 'time', 'duration',
+        'recurrence', 'recurrence_interval', 'recurrence_until', 'recurrence_count',
+    }
+
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     date = models.DateField()
@@ -13,6 +65,155 @@ class Meeting(models.Model):
     team = models.ForeignKey(Team, on_delete=models.CASCADE, null=True, blank=True)
     participants = models.ManyToManyField(User)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='created_meetings')
+    starts_at = models.DateTimeField(editable=False)
+    ends_at = models.DateTimeField(editable=False)
+    recurrence = models.CharField(max_length=10, choices=RECURRENCE_CHOICES, default='', blank=True)
+    recurrence_interval = models.PositiveSmallIntegerField(default=1)
+    recurrence_until = models.DateField(null=True, blank=True)
+    recurrence_count = models.PositiveIntegerField(null=True, blank=True)
+    recurrence_exceptions = models.JSONField(default=list, blank=True)
+    series_ends_at = models.DateTimeField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = MeetingQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date', 'time', 'id'], name='meeting_date_time_id_idx'),
+            models.Index(fields=['starts_at', 'ends_at'], name='meeting_interval_idx'),
+            models.Index(fields=['recurrence', 'starts_at'], name='meeting_series_idx'),
+        ]
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+    @staticmethod
+    def get_interval(date, time, duration):
+        """
+        Возвращает начало и конец встречи как aware-datetime в текущем часовом поясе.
+        Конец может приходиться на следующий день.
+        """
+        starts_at = timezone.make_aware(datetime.combine(date, time), timezone.get_current_timezone())
+        return starts_at, starts_at + duration
+
+    @property
+    def is_recurring(self):
+        return bool(self.recurrence)
+
+    def _occurrence_date(self, index):
+        """
+        Дата повторения с номером index (0 — первая встреча) без учёта исключений и границ серии.
+        Для ежемесячных серий возвращает None, если в месяце нет нужного числа.
+        """
+        if self.recurrence == 'daily':
+            return self.date + timedelta(days=index * self.recurrence_interval)
+        if self.recurrence == 'weekly':
+            return self.date + timedelta(weeks=index * self.recurrence_interval)
+        if self.recurrence == 'monthly':
+            return _add_months(self.date, index * self.recurrence_interval)
+        return self.date if index == 0 else None
+
+    def _index_before(self, day):
+        """
+        Номер повторения, не превышающий номер первого повторения в дату day или позже.
+        """
+        if day <= self.date:
+            return 0
+        if self.recurrence == 'monthly':
+            months = (day.year - self.date.year) * 12 + day.month - self.date.month
+            return max(0, months // self.recurrence_interval - 1)
+        step = 7 if self.recurrence == 'weekly' else 1
+        return (day - self.date).days // (step * self.recurrence_interval)
+
+    def _last_index(self):
+        """
+        Номер последнего повторения серии или None для бесконечной серии.
+        """
+        if not self.is_recurring:
+            return 0
+        candidates = []
+        if self.recurrence_count:
+            candidates.append(self.recurrence_count - 1)
+        if self.recurrence_until:
+            index = self._index_before(self.recurrence_until) + 1
+            while index > 0:
+                occurrence_date = self._occurrence_date(index)
+                if occurrence_date is not None and occurrence_date <= self.recurrence_until:
+                    break
+                index -= 1
+            candidates.append(index)
+        return min(candidates) if candidates else None
+
+    def iter_occurrences(self, start, end):
+        """
+        Лениво порождает повторения встречи, пересекающиеся с [start, end).
+
+        Каждое повторение — неприкреплённая копия встречи с подставленными date,
+        starts_at и ends_at, поэтому шаблоны и проверки работают с ним как с обычной встречей.
+        Перебор начинается сразу с нужного номера, так что стоимость зависит от размера окна,
+        а не от числа прошедших повторений.
+        """
+        if not self.is_recurring:
+            if self.starts_at < end and self.ends_at > start:
+                yield self
+            return
+
+        exceptions = set(self.recurrence_exceptions or [])
+        last_index = self._last_index()
+        first_day = timezone.localtime(start - self.duration).date()
+        index = self._index_before(first_day)
+        while last_index is None or index <= last_index:
+            occurrence_date = self._occurrence_date(index)
+            index += 1
+            if occurrence_date is None:
+                continue
+            starts_at, ends_at = self.get_interval(occurrence_date, self.time, self.duration)
+            if starts_at >= end:
+                break
+            if ends_at <= start or occurrence_date.isoformat() in exceptions:
+                continue
+            occurrence = copy.copy(self)
+            occurrence.date, occurrence.starts_at, occurrence.ends_at = occurrence_date, starts_at, ends_at
+            yield occurrence
+
+    def _compute_series_end(self):
+        last_index = self._last_index()
+        if last_index is None:
+            return None
+        while last_index > 0 and self._occurrence_date(last_index) is None:
+            last_index -= 1
+        return self.get_interval(self._occurrence_date(last_index), self.time, self.duration)[1]
+
+    def save(self, *args, **kwargs):
+        """
+        Приводит date/time/duration к Python-типам (представления присваивают строки из POST)
+        и пересчитывает денормализованные starts_at/ends_at и границу серии series_ends_at.
+        Не вызывается для queryset.update() и bulk_create — там интервал нужно считать вручную.
+        """
+        for name in ('date', 'time', 'duration', 'recurrence_until'):
+            setattr(self, name, self._meta.get_field(name).to_python(getattr(self, name)))
+        self.recurrence_exceptions = sorted({
+            value.isoformat() if isinstance(value, date) else str(value)
+            for value in self.recurrence_exceptions or []
+        })
+        self.starts_at, self.ends_at = self.get_interval(self.date, self.time, self.duration)
+        self.series_ends_at = self._compute_series_end()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.SCHEDULE_FIELDS & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'starts_at', 'ends_at', 'series_ends_at'}
+        if update_fields is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'updated_at'}
+        super().save(*args, **kwargs)
+
+
+def expand_occurrences(meetings, start, end):
+    """
+    Разворачивает встречи и серии в отсортированный по началу список повторений в окне [start, end).
+    """
+    occurrences = [
+        occurrence
+        for meeting in meetings
+        for occurrence in meeting.iter_occurrences(start, end)
+    ]
+    occurrences.sort(key=lambda occurrence: (occurrence.starts_at, occurrence.id))
+    return occurrences
@@ -0,0 +1,110 @@
+from datetime import datetime, time, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Meeting, expand_occurrences
+
+WORK_DAY_START = time(9, 0)
+WORK_DAY_END = time(18, 0)
+SLOT_ALIGNMENT = timedelta(minutes=15)
+
+
+def get_busy_intervals(user_ids, start, end):
+    """
+    Возвращает отсортированный по началу список интервалов (starts_at, ends_at) встреч,
+    в которых участвует или которые организует кто-либо из user_ids,
+    пересекающихся с [start, end). Один запрос на весь набор пользователей;
+    повторяющиеся серии разворачиваются только в пределах окна.
+    """
+    participant_meetings = Meeting.participants.through.objects.filter(
+        user_id__in=user_ids
+    ).values('meeting_id')
+    meetings = Meeting.objects.overlapping(start, end).filter(
+        Q(id__in=participant_meetings) | Q(created_by_id__in=user_ids),
+    )
+    return [
+        (occurrence.starts_at, occurrence.ends_at)
+        for occurrence in expand_occurrences(meetings, start, end)
+    ]
+
+
+def merge_intervals(intervals):
+    """
+    Сливает отсортированные по началу интервалы в непересекающиеся (проход заметающей прямой).
+    """
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _align_up(value, step=SLOT_ALIGNMENT):
+    """
+    Округляет момент времени вверх до сетки step от начала суток.
+    """
+    midnight = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    remainder = (value - midnight) % step
+    return value if not remainder else value + (step - remainder)
+
+
+def _working_windows(start_date, end_date, work_start, work_end):
+    """
+    Рабочие окна [начало, конец) каждого дня диапазона в текущем часовом поясе.
+    """
+    tz = timezone.get_current_timezone()
+    day = start_date
+    while day <= end_date:
+        yield (
+            timezone.make_aware(datetime.combine(day, work_start), tz),
+            timezone.make_aware(datetime.combine(day, work_end), tz),
+        )
+        day += timedelta(days=1)
+
+
+def find_free_slots(user_ids, start_date, end_date, duration, limit=5,
+                    work_start=WORK_DAY_START, work_end=WORK_DAY_END, now=None):
+    """
+    Находит до limit ближайших общих свободных слотов длительностью duration
+    для всех пользователей в рабочие часы дней [start_date, end_date].
+
+    Занятость всех участников загружается одним запросом, сливается в непересекающиеся
+    интервалы и обходится вместе с рабочими окнами двумя указателями.
+    Возвращает список пар (начало, конец) aware-datetime.
+    """
+    if now is None:
+        now = timezone.now()
+    windows = list(_working_windows(start_date, end_date, work_start, work_end))
+    if not windows or duration <= timedelta(0):
+        return []
+
+    busy = merge_intervals(get_busy_intervals(user_ids, windows[0][0], windows[-1][1]))
+    slots = []
+    busy_index = 0
+    for window_start, window_end in windows:
+        cursor = _align_up(max(window_start, now))
+        while busy_index < len(busy) and busy[busy_index][1] <= cursor:
+            busy_index += 1
+
+        gaps = []
+        index = busy_index
+        while index < len(busy) and busy[index][0] < window_end:
+            busy_start, busy_end = busy[index]
+            if busy_start > cursor:
+                gaps.append((cursor, busy_start))
+            cursor = _align_up(max(cursor, busy_end))
+            index += 1
+        gaps.append((cursor, window_end))
+
+        for gap_start, gap_end in gaps:
+            slot_start = gap_start
+            while slot_start + duration <= gap_end:
+                slots.append((slot_start, slot_start + duration))
+                if len(slots) >= limit:
+                    return slots
+                slot_start += duration
+    return slots
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Состав участников встречи изменён в обход m2m_changed: отправляется один раз за правку
+# после коммита с аргументами meeting, added и removed (множества id пользователей).
+participants_changed = Signal()
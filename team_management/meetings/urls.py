@@ -6,4 +6,7 @@ urlpatterns = [
     path('create/', views.create_meeting, name='create_meeting'),
     path('<int:meeting_id>/', views.meeting_detail, name='meeting_detail'),
     path('my-meetings/', my_meetings_view, name='my_meetings'),
+    path('participants/', views.participant_search_view, name='meeting_participants'),
+    path('free-slots/', views.free_slots_view, name='free_slots'),
+    path('feed/<str:token>.ics', views.ics_feed, name='meetings_ics_feed'),
 ]
\ No newline at end of file
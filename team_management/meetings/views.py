@@ -1,24 +1,61 @@
-from datetime import datetime
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.db.models import Q
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_safe
 
+from teams.models import TeamMember
 from users.models import User
-from .forms import MeetingForm
-from .models import Meeting
+from users.search import search_users
+from .forms import FreeSlotsForm, MeetingForm, ParticipantSearchForm
+from .ics import get_feed_etag, iter_calendar
+from .models import Meeting, expand_occurrences
+from .services import find_free_slots
+from .signals import participants_changed
+
+
+MY_MEETINGS_WINDOW_DAYS = 30
+PARTICIPANT_PAGE_SIZE = 20
+# Насколько вперёд проверяются на конфликты повторения новой серии.
+CONFLICT_HORIZON = timedelta(days=366)
 
 
 @login_required
 def my_meetings_view(request):
     """
     Представление для отображения встреч, в которых пользователь является участником или создателем.
+    Показывает повторения встреч в окне дат (по умолчанию 30 дней с сегодняшнего),
+    окно задаётся параметром start (YYYY-MM-DD). Серии разворачиваются только в пределах окна.
     """
-    my_meetings = Meeting.objects.filter(participants=request.user).prefetch_related('participants', 'team')
+    window_start_date = timezone.localdate()
+    if request.GET.get('start'):
+        try:
+            window_start_date = date.fromisoformat(request.GET['start'])
+        except ValueError:
+            pass
+    window_end_date = window_start_date + timedelta(days=MY_MEETINGS_WINDOW_DAYS)
+    tz = timezone.get_current_timezone()
+    window_start = timezone.make_aware(datetime.combine(window_start_date, time.min), tz)
+    window_end = timezone.make_aware(datetime.combine(window_end_date, time.min), tz)
+
+    participant_meetings = Meeting.participants.through.objects.filter(user=request.user).values('meeting_id')
+    meetings = Meeting.objects.filter(
+        Q(id__in=participant_meetings) | Q(created_by=request.user)
+    ).overlapping(window_start, window_end).select_related('team', 'created_by')
 
     context = {
-        'my_meetings': my_meetings,
+        'my_meetings': expand_occurrences(meetings, window_start, window_end),
+        'window_start': window_start_date,
+        'window_end': window_end_date - timedelta(days=1),
+        'prev_start': window_start_date - timedelta(days=MY_MEETINGS_WINDOW_DAYS),
+        'next_start': window_end_date,
     }
     return render(request, 'meetings/my_meetings.html', context)
 
@@ -30,7 +67,7 @@ def create_meeting(request):
     Если метод POST и форма валидна — создаёт встречу, добавляет участников.
     Перенаправляет на dashboard с сообщением об успехе.
     """
-    all_users = User.objects.exclude(id=request.user.id)
+    selected_participants = User.objects.none()
     if request.method == 'POST':
         form = MeetingForm(request.POST, user=request.user)
         if form.is_valid():
@@ -40,24 +77,63 @@ def create_meeting(request):
             form.save_m2m()  # Сохраняем участников
             messages.success(request, "Встреча успешно создана")
             return redirect('dashboard')
+        selected_participants = _selected_participants(request.POST.getlist('participants'))
     else:
         form = MeetingForm(user=request.user)
 
     return render(request, 'meetings/create_meeting.html', {
         'form': form,
-        'all_users': all_users
+        'selected_participants': selected_participants,
     })
 
 
+def _selected_participants(raw_ids):
+    """
+    Пользователи, уже выбранные в форме: только они выводятся как варианты списка участников,
+    остальные подгружаются поиском.
+    """
+    return User.objects.filter(id__in=[user_id for user_id in raw_ids if user_id.isdigit()])
+
+
+def _update_participants(meeting, raw_ids):
+    """
+    Приводит состав участников встречи к переданному списку id.
+
+    Все id проверяются одним запросом (неизвестный id — 404), затем удаляются
+    только выбывшие строки связи и добавляются только новые — напрямую через таблицу связи,
+    без m2m_changed. Вместо него после коммита один раз отправляется participants_changed
+    с разностью состава. Вызывать внутри транзакции.
+    """
+    try:
+        requested = {int(user_id) for user_id in raw_ids}
+    except ValueError:
+        raise Http404("Пользователь не найден")
+    if requested:
+        found = set(User.objects.filter(id__in=requested).values_list('id', flat=True))
+        if found != requested:
+            raise Http404("Пользователь не найден")
+
+    current = set(meeting.participants.values_list('id', flat=True))
+    removed, added = current - requested, requested - current
+    through = Meeting.participants.through
+    if removed:
+        through.objects.filter(meeting=meeting, user_id__in=removed).delete()
+    if added:
+        through.objects.bulk_create([through(meeting=meeting, user_id=user_id) for user_id in added])
+    if added or removed:
+        transaction.on_commit(lambda: participants_changed.send(
+            sender=Meeting, meeting=meeting, added=added, removed=removed,
+        ))
+
+
 @login_required
 def meeting_detail(request, meeting_id):
     """
     Представление для отображения деталей встречи и управления ею.
     Только участники и создатель могут просматривать и управлять встречей.
-    Поддерживает удаление встречи, выход из неё и редактирование.
+    Поддерживает удаление встречи, выход из неё, отмену одного повторения серии и редактирование.
     """
     meeting = get_object_or_404(Meeting, id=meeting_id)
-    all_users = User.objects.exclude(id=request.user.id)
     if not (request.user in meeting.participants.all() or request.user == meeting.created_by):
         messages.error(request, "У вас нет доступа к этой встрече")
         return redirect('dashboard')
@@ -74,6 +150,20 @@ def meeting_detail(request, meeting_id):
             meeting.participants.remove(request.user)
             messages.success(request, "Вы отменили участие во встрече")
             return redirect('dashboard')
+        elif 'skip_occurrence' in request.POST:
+            try:
+                occurrence_date = date.fromisoformat(request.POST.get('occurrence_date', ''))
+            except ValueError:
+                occurrence_date = None
+            if request.user != meeting.created_by or not meeting.is_recurring:
+                messages.error(request, "Только организатор может отменить повторение")
+            elif occurrence_date is None:
+                messages.error(request, "Некорректная дата повторения")
+            else:
+                meeting.recurrence_exceptions.append(occurrence_date.isoformat())
+                meeting.save(update_fields=['recurrence_exceptions'])
+                messages.success(request, "Повторение встречи отменено")
+            return redirect('meeting_detail', meeting_id=meeting.id)
         else:
             if request.user == meeting.created_by:
                 meeting.title = request.POST.get('title')
@@ -81,40 +171,187 @@ def meeting_detail(request, meeting_id):
                 meeting.date = request.POST.get('date')
                 meeting.time = request.POST.get('time')
                 meeting.duration = request.POST.get('duration')
-                participants_ids = request.POST.getlist('participants')
-                meeting.participants.clear()
-                for user_id in participants_ids:
-                    user = get_object_or_404(User, id=user_id)
-                    meeting.participants.add(user)
-
-                meeting.save()
+                with transaction.atomic():
+                    meeting.save()
+                    _update_participants(meeting, request.POST.getlist('participants'))
                 messages.success(request, "Встреча успешно обновлена")
                 return redirect('meeting_detail', meeting_id=meeting.id)
 
     return render(request, 'meetings/meeting_detail.html', {
         'meeting': meeting,
         'is_creator': request.user == meeting.created_by,
-        'all_users': all_users
     })
 
 
-def _check_time_conflict(user, date, time, duration, meeting_id=None):
+@login_required
+def participant_search_view(request):
     """
-    Проверяет, есть ли у пользователя конфликты по времени с другими встречами.
-    Используется для предотвращения создания встреч в одно и то же время.
+    Поиск участников встречи для Select2: {"results": [{"id", "text", "busy"}], "pagination": {"more"}}.
+    По умолчанию ищет среди участников команд организатора (пустой q — все они по логину),
+    scope=all — среди всех пользователей, только по непустому q.
+    Если переданы date, time и duration, каждый кандидат страницы помечается busy —
+    занят ли он в этом слоте; занятость считается одним запросом на всю страницу.
+    """
+    form = ParticipantSearchForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    params = form.cleaned_data
+    offset = ((params['page'] or 1) - 1) * PARTICIPANT_PAGE_SIZE
+
+    candidates = User.objects.exclude(id=request.user.id)
+    if params['scope'] != 'all':
+        my_teams = TeamMember.objects.filter(user=request.user).values('team_id')
+        candidates = candidates.filter(
+            id__in=TeamMember.objects.filter(team_id__in=my_teams).values('user_id')
+        )
+    if params['q'].strip() or params['scope'] == 'all':
+        users = search_users(params['q'], candidates, limit=PARTICIPANT_PAGE_SIZE + 1, offset=offset)
+    else:
+        users = list(candidates.order_by('username', 'id')[offset:offset + PARTICIPANT_PAGE_SIZE + 1])
+    more = len(users) > PARTICIPANT_PAGE_SIZE
+    users = users[:PARTICIPANT_PAGE_SIZE]
+
+    busy_ids = set()
+    if users and params['date'] and params['time'] and params['duration']:
+        busy_ids = _find_conflicting_user_ids(
+            [user.id for user in users], params['date'], params['time'], params['duration'], params['meeting'],
+        )
+    return JsonResponse({
+        'results': [
+            {'id': user.id, 'text': user.username, 'busy': user.id in busy_ids}
+            for user in users
+        ],
+        'pagination': {'more': more},
+    })
+
+
+@login_required
+def free_slots_view(request):
     """
-    end_time = (datetime.combine(date, time) + duration).time()
-
-    conflicts = Meeting.objects.filter(
-        Q(participants=user) | Q(created_by=user),
-        date=date
-    ).exclude(
-        id=meeting_id
-    ).filter(
-        Q(time__lt=end_time,
-          time__gte=time) |
-        Q(time__lt=time,
-          time__gte=(datetime.combine(date, time) - duration).time())
+    Возвращает в JSON ближайшие общие свободные слоты для набора пользователей.
+    Параметры GET: users (несколько), start, end (YYYY-MM-DD), duration (минуты), limit.
+    Текущий пользователь всегда учитывается как организатор.
+    """
+    form = FreeSlotsForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+
+    user_ids = {user.id for user in form.cleaned_data['users']} | {request.user.id}
+    slots = find_free_slots(
+        user_ids,
+        form.cleaned_data['start'],
+        form.cleaned_data['end'],
+        timedelta(minutes=form.cleaned_data['duration']),
+        limit=form.cleaned_data['limit'] or 5,
     )
+    return JsonResponse({
+        'slots': [{'start': start.isoformat(), 'end': end.isoformat()} for start, end in slots],
+    })
 
-    return conflicts.exists()
+
+@require_safe
+def ics_feed(request, token):
+    """
+    Календарь встреч и дедлайнов пользователя в формате iCalendar по секретной ссылке.
+    Тело отдаётся потоком; при совпадении If-None-Match — 304 без выборки событий.
+    """
+    user = get_object_or_404(User, calendar_token=token)
+    etag = get_feed_etag(user)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = StreamingHttpResponse(iter_calendar(user), content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = 'inline; filename="calendar.ics"'
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _new_intervals(date, time, duration, schedule=None):
+    """
+    Интервалы новой встречи: один для одиночной, для серии — все повторения
+    в пределах CONFLICT_HORIZON от первого (бесконечная серия дальше не проверяется).
+    schedule — несохранённая Meeting с полями повторения.
+    """
+    start, end = Meeting.get_interval(date, time, duration)
+    if schedule is None or not schedule.is_recurring:
+        return [(start, end)]
+    schedule.date, schedule.time, schedule.duration = date, time, duration
+    schedule.recurrence_interval = schedule.recurrence_interval or 1
+    intervals = []
+    for occurrence in schedule.iter_occurrences(start, start + CONFLICT_HORIZON):
+        # Повторения длиннее шага серии сливаются, чтобы интервалы не пересекались.
+        if intervals and occurrence.starts_at < intervals[-1][1]:
+            intervals[-1] = (intervals[-1][0], max(intervals[-1][1], occurrence.ends_at))
+        else:
+            intervals.append((occurrence.starts_at, occurrence.ends_at))
+    return intervals
+
+
+def _overlaps_any(intervals, starts, start, end):
+    """
+    Пересекается ли [start, end) хотя бы с одним из отсортированных непересекающихся интервалов;
+    starts — их начала для двоичного поиска.
+    """
+    index = bisect_left(starts, end)
+    return index > 0 and intervals[index - 1][1] > start
+
+
+def _find_conflicting_user_ids(user_ids, date, time, duration, meeting_id=None, schedule=None):
+    """
+    Возвращает множество id пользователей из user_ids, у которых есть встреча,
+    пересекающаяся с новой встречей (как участник или как организатор).
+    Для повторяющейся новой встречи (schedule) проверяется каждое её повторение
+    в пределах CONFLICT_HORIZON.
+
+    Первый запрос (UNION по участникам и организаторам) находит кандидатов на весь набор
+    пользователей среди встреч, пересекающих охват новых повторений; одиночные встречи
+    сверяются с повторениями двоичным поиском. Повторяющиеся серии, если они попались,
+    загружаются вторым запросом и разворачиваются только в пределах охвата.
+    """
+    user_ids = list(user_ids)
+    intervals = _new_intervals(date, time, duration, schedule)
+    if not user_ids or not intervals:
+        return set()
+    starts = [start for start, _ in intervals]
+    span_start, span_end = intervals[0][0], intervals[-1][1]
+    candidates = Meeting.objects.overlapping(span_start, span_end).exclude(id=meeting_id)
+
+    as_participant = Meeting.participants.through.objects.filter(
+        user_id__in=user_ids,
+        meeting__in=candidates,
+    ).values_list('user_id', 'meeting_id', 'meeting__recurrence', 'meeting__starts_at', 'meeting__ends_at')
+    as_organizer = candidates.filter(
+        created_by_id__in=user_ids,
+    ).values_list('created_by_id', 'id', 'recurrence', 'starts_at', 'ends_at')
+
+    conflicting_ids = set()
+    series_users = {}
+    for user_id, candidate_id, recurrence, starts_at, ends_at in as_participant.union(as_organizer):
+        if recurrence:
+            series_users.setdefault(candidate_id, set()).add(user_id)
+        elif _overlaps_any(intervals, starts, starts_at, ends_at):
+            conflicting_ids.add(user_id)
+
+    pending = {
+        series_id: users for series_id, users in series_users.items()
+        if not users <= conflicting_ids
+    }
+    for series in Meeting.objects.filter(id__in=pending) if pending else []:
+        if any(
+            _overlaps_any(intervals, starts, occurrence.starts_at, occurrence.ends_at)
+            for occurrence in series.iter_occurrences(span_start, span_end)
+        ):
+            conflicting_ids |= pending[series.id]
+    return conflicting_ids
+
+
+def _check_time_conflict(user, date, time, duration, meeting_id=None, schedule=None):
+    """
+    Проверяет, есть ли у пользователя конфликты по времени с другими встречами.
+    Используется для предотвращения создания встреч в одно и то же время.
+
+    Интервалы сравниваются по денормализованным starts_at/ends_at,
+    поэтому встречи, переходящие через полночь, учитываются корректно.
+    Для повторяющейся новой встречи (schedule) проверяются все её повторения в пределах CONFLICT_HORIZON.
+    """
+    return user.id in _find_conflicting_user_ids([user.id], date, time, duration, meeting_id, schedule)
@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from .models import Task
+from .models import Task, TaskReminder
 
-admin.site.register(Task)
\ No newline at end of file
+admin.site.register(Task)
+admin.site.register(TaskReminder)
\ No newline at end of file
@@ -0,0 +1,105 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comment
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ('csv', 'ndjson')
+EXPORT_INCLUDES = ('comments', 'ratings')
+
+TASK_COLUMNS = (
+    ('id', 'id'),
+    ('title', 'title'),
+    ('description', 'description'),
+    ('status', 'status'),
+    ('deadline', 'deadline'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+    ('team_id', 'team_id'),
+    ('team', 'team__name'),
+    ('assignee', 'assignee__username'),
+)
+RATING_COLUMNS = (
+    ('rating_score', 'rating__score'),
+    ('rating_comment', 'rating__comment'),
+    ('rating_by', 'rating__rated_by__username'),
+    ('rating_at', 'rating__rated_at'),
+)
+COMMENT_FIELDS = ('task_id', 'author__username', 'text', 'created_at')
+
+
+def export_columns(include):
+    columns = [name for name, _ in TASK_COLUMNS]
+    if 'ratings' in include:
+        columns += [name for name, _ in RATING_COLUMNS]
+    if 'comments' in include:
+        columns.append('comments')
+    return columns
+
+
+def _iter_comments(tasks, chunk_size):
+    """
+    Комментарии отфильтрованных задач, упорядоченные по задаче, — для слияния с потоком задач.
+    """
+    rows = (
+        Comment.objects.filter(task_id__in=tasks.values('id'))
+        .order_by('task_id', 'created_at', 'id')
+        .values_list(*COMMENT_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+    for task_id, author, text, created_at in rows:
+        yield task_id, {'author': author, 'text': text, 'created_at': created_at}
+
+
+def iter_export_records(tasks, include=(), chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Порождает словари по задачам queryset'а tasks без создания экземпляров моделей.
+
+    Задачи и оценки читаются одним потоком values_list(...).iterator(), комментарии —
+    вторым потоком, упорядоченным по id задачи, и сливаются с первым. В памяти в каждый
+    момент только текущая пачка строк и комментарии одной задачи.
+    """
+    columns = TASK_COLUMNS + (RATING_COLUMNS if 'ratings' in include else ())
+    names = [name for name, _ in columns]
+    rows = tasks.order_by('id').values_list(*[lookup for _, lookup in columns]).iterator(chunk_size=chunk_size)
+
+    comments = _iter_comments(tasks, chunk_size) if 'comments' in include else None
+    pending = next(comments, None) if comments else None
+    for row in rows:
+        record = dict(zip(names, row))
+        if comments is not None:
+            record['comments'] = []
+            while pending is not None and pending[0] <= record['id']:
+                if pending[0] == record['id']:
+                    record['comments'].append(pending[1])
+                pending = next(comments, None)
+        yield record
+
+
+class _Echo:
+    """Псевдобуфер для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def iter_csv(records, columns):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for record in records:
+        yield writer.writerow([_csv_value(record[column]) for column in columns])
+
+
+def iter_ndjson(records):
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
@@ -0,0 +1,89 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import TaskChange
+
+# Поле журнала -> атрибут модели Task.
+TRACKED_FIELDS = {
+    'status': 'status',
+    'assignee': 'assignee_id',
+    'deadline': 'deadline',
+    'team': 'team_id',
+}
+
+
+def _format_value(value):
+    """
+    Строковое значение для журнала; даты приводятся к UTC, чтобы наивная и aware
+    запись одного момента не считались изменением.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value.astimezone(dt_timezone.utc).isoformat()
+    return str(value)
+
+
+def snapshot(task):
+    """
+    Значения отслеживаемых полей задачи.
+    """
+    return {field: getattr(task, attname) for field, attname in TRACKED_FIELDS.items()}
+
+
+class TaskHistory:
+    """
+    Собирает изменения задач за время запроса и записывает их одним bulk_create
+    после коммита транзакции (transaction.on_commit). При исключении внутри блока
+    или откате внешней транзакции ничего не пишется.
+
+        with transaction.atomic(), TaskHistory(request.user) as history:
+            history.watch(task)
+            task.status = 'done'
+            task.save()
+
+    Изменения вычисляются при выходе из блока сравнением с запомненными значениями;
+    для queryset.update() без экземпляров служит add().
+    """
+
+    def __init__(self, actor):
+        self.actor = actor
+        self.changed_at = timezone.now()
+        self._watched = {}
+        self._changes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            return
+        for task, before in self._watched.values():
+            self.add(task.id, before, snapshot(task))
+        if self._changes:
+            changes = self._changes
+            transaction.on_commit(lambda: TaskChange.objects.bulk_create(changes))
+
+    def watch(self, task):
+        """
+        Запоминает текущие значения полей задачи, изменения будут вычислены при выходе.
+        """
+        self._watched.setdefault(task.id, (task, snapshot(task)))
+
+    def add(self, task_id, before, after):
+        """
+        Добавляет в буфер различия между двумя наборами значений полей одной задачи.
+        after может содержать только часть полей.
+        """
+        for field, value in after.items():
+            old = _format_value(before[field])
+            new = _format_value(value)
+            if old != new:
+                self._changes.append(TaskChange(
+                    task_id=task_id, actor=self.actor, field=field,
+                    old_value=old, new_value=new, changed_at=self.changed_at,
+                ))
@@ -0,0 +1,157 @@
+import csv
+import json
+import os
+from itertools import islice
+
+from dashboard.signals import invalidate_task_rows
+from teams.models import Team, TeamMember
+from users.models import User
+from .forms import TaskForm
+from .models import Task
+from .search import index_tasks
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+
+class TaskImportForm(TaskForm):
+    """
+    Правила TaskForm для строки импорта. Команда и исполнитель разрешаются по словарям
+    в памяти, а не через ModelChoiceField, чтобы не делать запрос на каждую строку.
+    """
+
+    class Meta(TaskForm.Meta):
+        fields = ['title', 'description', 'deadline', 'status']
+
+
+class ImportLookups:
+    """
+    Словари id команд, пользователей и членств, загружаемые один раз на импорт.
+    Размер зависит от числа команд и пользователей, а не от числа строк файла.
+    """
+
+    def __init__(self):
+        self.team_by_id, self.team_by_name, self.ambiguous_teams = {}, {}, set()
+        for team_id, name in Team.objects.values_list('id', 'name').iterator():
+            self.team_by_id[str(team_id)] = team_id
+            if name in self.team_by_name:
+                self.ambiguous_teams.add(name)
+            self.team_by_name.setdefault(name, team_id)
+        self.user_ids = dict(User.objects.values_list('username', 'id').iterator())
+        self.memberships = set(TeamMember.objects.values_list('user_id', 'team_id').iterator())
+
+    def resolve(self, row):
+        """
+        Возвращает (team_id, assignee_id, errors) для строки.
+        Команда задаётся id или уникальным названием, исполнитель — username.
+        """
+        errors = {}
+        team = str(row.get('team') or '').strip()
+        team_id = self.team_by_id.get(team)
+        if not team:
+            errors['team'] = ["Обязательное поле."]
+        elif team_id is None and team in self.ambiguous_teams:
+            errors['team'] = [f"Несколько команд с названием «{team}», укажите id"]
+        elif team_id is None:
+            team_id = self.team_by_name.get(team)
+            if team_id is None:
+                errors['team'] = [f"Команда «{team}» не найдена"]
+
+        username = str(row.get('assignee') or '').strip()
+        assignee_id = None
+        if username:
+            assignee_id = self.user_ids.get(username)
+            if assignee_id is None:
+                errors['assignee'] = [f"Пользователь «{username}» не найден"]
+            elif team_id is not None and (assignee_id, team_id) not in self.memberships:
+                errors['assignee'] = ["Этот пользователь не в команде задачи"]
+        return team_id, assignee_id, errors
+
+
+def detect_format(filename):
+    """
+    Определяет формат импорта по расширению файла; None, если формат не поддерживается.
+    """
+    extension = os.path.splitext(filename)[1].lstrip('.').lower()
+    extension = 'ndjson' if extension == 'jsonl' else extension
+    return extension if extension in IMPORT_FORMATS else None
+
+
+def iter_csv_rows(stream):
+    """
+    Построчно читает CSV с заголовком. Порождает пары (номер строки, словарь значений).
+    """
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def iter_ndjson_rows(stream):
+    """
+    Построчно читает NDJSON. Строка с некорректным JSON порождает (номер, None).
+    """
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_no, None
+            continue
+        yield line_no, row if isinstance(row, dict) else None
+
+
+def _build_task(row, lookups):
+    data = {field: row.get(field) for field in TaskImportForm.Meta.fields}
+    data['status'] = data['status'] or 'open'
+    form = TaskImportForm(data)
+    team_id, assignee_id, errors = lookups.resolve(row)
+    if not form.is_valid():
+        errors = {**{field: list(messages) for field, messages in form.errors.items()}, **errors}
+    if errors:
+        return None, errors
+    task = form.save(commit=False)
+    task.team_id, task.assignee_id = team_id, assignee_id
+    return task, None
+
+
+def import_tasks(stream, fmt, batch_size=IMPORT_BATCH_SIZE, on_error=None):
+    """
+    Импортирует задачи из текстового потока CSV или NDJSON.
+
+    Строки читаются потоком и обрабатываются пачками по batch_size: каждая пачка
+    проверяется по правилам TaskForm и записывается одним bulk_create (он атомарен).
+    Ошибочные строки пропускаются и передаются в on_error(номер строки, ошибки),
+    импорт при этом продолжается. Память ограничена размером пачки и словарями ImportLookups.
+    bulk_create не шлёт сигналы, поэтому кэш календаря и поисковый индекс обновляются по пачкам.
+
+    Возвращает словарь {'created': ..., 'failed': ...}.
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Неизвестный формат импорта: {fmt}")
+    rows = iter_csv_rows(stream) if fmt == 'csv' else iter_ndjson_rows(stream)
+    lookups = ImportLookups()
+    created = failed = 0
+
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+        tasks = []
+        for line_no, row in chunk:
+            if row is None:
+                task, errors = None, {'__all__': ["Некорректная строка JSON"]}
+            else:
+                task, errors = _build_task(row, lookups)
+            if errors:
+                failed += 1
+                if on_error:
+                    on_error(line_no, errors)
+            else:
+                tasks.append(task)
+        if tasks:
+            Task.objects.bulk_create(tasks, batch_size=batch_size)
+            index_tasks(task.id for task in tasks)
+            invalidate_task_rows((task.team_id, task.assignee_id, task.deadline) for task in tasks)
+            created += len(tasks)
+    return {'created': created, 'failed': failed}
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.importer import IMPORT_BATCH_SIZE, IMPORT_FORMATS, detect_format, import_tasks
+
+
+class Command(BaseCommand):
+    help = "Импортирует задачи из CSV или NDJSON файла потоком, пачками через bulk_create"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Путь к файлу импорта")
+        parser.add_argument(
+            '--format', choices=IMPORT_FORMATS,
+            help="Формат файла; по умолчанию определяется по расширению",
+        )
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help="Размер пачки")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        if fmt is None:
+            raise CommandError("Не удалось определить формат файла, укажите --format")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size должен быть положительным")
+
+        def report(line_no, errors):
+            for field, messages in errors.items():
+                self.stderr.write(f"Строка {line_no}: {field}: {'; '.join(messages)}")
+
+        try:
+            with open(path, newline='', encoding='utf-8-sig') as stream:
+                result = import_tasks(stream, fmt, batch_size=options['batch_size'], on_error=report)
+        except OSError as error:
+            raise CommandError(f"Не удалось прочитать файл: {error}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Создано задач: {result['created']}, строк с ошибками: {result['failed']}"
+        ))
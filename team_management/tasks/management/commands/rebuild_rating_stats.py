@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from tasks.ratings import rebuild_rating_stats
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает счётчики оценок исполнителей (всего и по месяцам) по таблице оценок"
+
+    def handle(self, *args, **options):
+        processed = rebuild_rating_stats()
+        self.stdout.write(self.style.SUCCESS(f"Счётчики пересчитаны, оценок: {processed}"))
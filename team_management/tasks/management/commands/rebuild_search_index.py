@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.search import SEARCH_REBUILD_BATCH_SIZE, rebuild_index, search_supported
+
+
+class Command(BaseCommand):
+    help = "Пересобирает полнотекстовый индекс задач и комментариев пачками"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=SEARCH_REBUILD_BATCH_SIZE, help="Число задач или комментариев в пачке"
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size должен быть положительным")
+        if not search_supported():
+            raise CommandError("Полнотекстовый индекс доступен только для SQLite")
+        indexed = rebuild_index(
+            options['batch_size'],
+            progress=lambda count: self.stdout.write(f"Проиндексировано задач: {count}"),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Индекс пересобран, задач: {indexed}"))
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.reminders import REMINDER_BATCH_SIZE, REMINDER_LEAD_TIME, scan_deadlines
+
+
+class Command(BaseCommand):
+    help = (
+        "Записывает напоминания о приближающихся и просроченных дедлайнах. "
+        "Рассчитан на периодический запуск (cron): каждый проход смотрит только изменения с прошлого"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lead-hours', type=int, default=int(REMINDER_LEAD_TIME.total_seconds() // 3600),
+            help="За сколько часов до дедлайна напоминать",
+        )
+        parser.add_argument('--batch-size', type=int, default=REMINDER_BATCH_SIZE, help="Число задач в пачке")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size должен быть положительным")
+        if options['lead_hours'] < 0:
+            raise CommandError("--lead-hours не может быть отрицательным")
+        result = scan_deadlines(
+            lead_time=timedelta(hours=options['lead_hours']),
+            batch_size=options['batch_size'],
+            progress=lambda count: self.stdout.write(f"Обработано задач: {count}"),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Проверено задач: {result['scanned']}, новых напоминаний: {result['created']}"
+        ))
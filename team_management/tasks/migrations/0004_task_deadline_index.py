@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 06:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_sync_models'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='deadline',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+def create_search_table(apps, schema_editor):
+    """
+    Полнотекстовый индекс FTS5 по задачам: rowid совпадает с id задачи.
+    Только для SQLite; на других СУБД поиск работает без индекса.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_search USING fts5("
+        "title, description, comments, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        "INSERT INTO tasks_search (rowid, title, description, comments) "
+        "SELECT t.id, t.title, t.description, COALESCE("
+        "(SELECT group_concat(c.text, char(10)) FROM tasks_comment c WHERE c.task_id = t.id), '') "
+        "FROM tasks_task t"
+    )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS tasks_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_deadline_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
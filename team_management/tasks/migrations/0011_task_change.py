@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:45
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_task_reminders'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(choices=[('status', 'Статус'), ('assignee', 'Исполнитель'), ('deadline', 'Срок'), ('team', 'Команда')], max_length=20)),
+                ('old_value', models.CharField(max_length=64, null=True)),
+                ('new_value', models.CharField(max_length=64, null=True)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='changes', to='tasks.task')),
+            ],
+            options={
+                'verbose_name': 'Изменение задачи',
+                'verbose_name_plural': 'Изменения задач',
+            },
+        ),
+    ]
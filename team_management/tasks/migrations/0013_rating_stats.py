@@ -0,0 +1,88 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+
+def fill_rating_stats(apps, schema_editor):
+    """
+    Засчитывает существующие оценки текущему исполнителю задачи и строит счётчики.
+    """
+    Task = apps.get_model('tasks', 'Task')
+    TaskRating = apps.get_model('tasks', 'TaskRating')
+    UserRatingStats = apps.get_model('tasks', 'UserRatingStats')
+    UserRatingMonth = apps.get_model('tasks', 'UserRatingMonth')
+
+    TaskRating.objects.update(
+        assignee_id=Subquery(Task.objects.filter(id=OuterRef('task_id')).values('assignee_id')[:1])
+    )
+    totals, months = {}, {}
+    ratings = TaskRating.objects.filter(assignee__isnull=False).values_list('assignee_id', 'rated_at', 'score')
+    for user_id, rated_at, score in ratings.iterator():
+        month = timezone.localdate(rated_at).replace(day=1)
+        for bucket, key in ((totals, user_id), (months, (user_id, month))):
+            score_sum, count = bucket.get(key, (0, 0))
+            bucket[key] = (score_sum + score, count + 1)
+    UserRatingStats.objects.bulk_create(
+        UserRatingStats(user_id=user_id, score_sum=score_sum, count=count)
+        for user_id, (score_sum, count) in totals.items()
+    )
+    UserRatingMonth.objects.bulk_create(
+        UserRatingMonth(user_id=user_id, month=month, score_sum=score_sum, count=count)
+        for (user_id, month), (score_sum, count) in months.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0012_task_version'),
+        ('users', '0002_user_calendar_token'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserRatingMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('score_sum', models.PositiveIntegerField(default=0)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='UserRatingStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('score_sum', models.PositiveIntegerField(default=0)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='taskrating',
+            name='assignee',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='received_ratings', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='taskrating',
+            index=models.Index(fields=['assignee', '-rated_at'], name='rating_assignee_rated_idx'),
+        ),
+        migrations.AddField(
+            model_name='userratingmonth',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_months', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='userratingmonth',
+            index=models.Index(fields=['month', 'user'], name='rating_month_user_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='userratingmonth',
+            constraint=models.UniqueConstraint(fields=('user', 'month'), name='user_rating_month_unique'),
+        ),
+        migrations.RunPython(fill_rating_stats, migrations.RunPython.noop),
+    ]
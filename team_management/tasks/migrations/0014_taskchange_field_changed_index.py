@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-18 08:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0013_rating_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='taskchange',
+            index=models.Index(fields=['field', 'changed_at'], name='taskchange_field_changed_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-18 08:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0014_taskchange_field_changed_index'),
+        ('teams', '0003_sync_models'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['team', 'status', 'deadline', 'id'], name='task_board_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+from django.db import migrations
+
+
+def split_comment_rows(apps, schema_editor):
+    """
+    Комментарии получают собственные строки индекса: rowid = -id комментария, task_id — id задачи.
+    Строки задач сохраняют rowid = id задачи и тоже помечаются task_id.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS tasks_search")
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE tasks_search USING fts5("
+        "title, description, comments, task_id UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        "INSERT INTO tasks_search (rowid, title, description, comments, task_id) "
+        "SELECT id, title, description, '', id FROM tasks_task"
+    )
+    schema_editor.execute(
+        "INSERT INTO tasks_search (rowid, title, description, comments, task_id) "
+        "SELECT -id, '', '', text, task_id FROM tasks_comment"
+    )
+
+
+def merge_comment_rows(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS tasks_search")
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE tasks_search USING fts5("
+        "title, description, comments, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        "INSERT INTO tasks_search (rowid, title, description, comments) "
+        "SELECT t.id, t.title, t.description, COALESCE("
+        "(SELECT group_concat(c.text, char(10)) FROM tasks_comment c WHERE c.task_id = t.id), '') "
+        "FROM tasks_task t"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0015_task_board_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(split_comment_rows, merge_comment_rows),
+    ]
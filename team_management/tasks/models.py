@@ -1,9 +1,22 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
 from users.models import User
 
-from teams.models import Team
+from teams.models import Team, TeamMember
+
+
+class TaskQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """
+        Задачи команд, в которых состоит пользователь, а также назначенные ему.
+        """
+        team_ids = TeamMember.objects.filter(user=user).values('team_id')
+        return self.filter(models.Q(team_id__in=team_ids) | models.Q(assignee=user))
+
+
+class TaskConflict(Exception):
+    """Задача изменена параллельно: версия строки в базе не совпала с версией экземпляра."""
 
 
 class Task(models.Model):
@@ -19,10 +32,56 @@ class Task(models.Model):
     assignee = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='assigned_tasks')
     team = models.ForeignKey(Team, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='task_created_id_idx'),
+            models.Index(fields=['deadline', 'id'], name='task_deadline_id_idx'),
+            models.Index(fields=['status', 'deadline'], name='task_status_deadline_idx'),
+            models.Index(fields=['updated_at'], name='task_updated_at_idx'),
+            models.Index(fields=['team', 'status', 'deadline', 'id'], name='task_board_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """
+        Любое сохранение существующей задачи увеличивает версию, чтобы ETag и формы,
+        открытые раньше, заметили изменение. Версия увеличивается в самой строке
+        (SET version = version + 1) и перечитывается, поэтому устаревший экземпляр
+        не откатит её назад. Проверку версии выполняет save_versioned().
+        """
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        self.version = models.F('version') + 1
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'version'}
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=['version'])
+
+    def save_versioned(self, update_fields, expected_version=None):
+        """
+        Оптимистическая блокировка для форм и API: сохраняет update_fields, только если версия
+        строки в базе равна expected_version (по умолчанию — self.version, загруженной или
+        присланной клиентом). Строка захватывается условным
+        UPDATE ... SET version = version WHERE id = ? AND version = ?, который держит её
+        до конца транзакции; затем обычный save() пишет поля, увеличивает версию и шлёт сигналы.
+        Если версия уже другая или задачу удалили, бросает TaskConflict.
+        """
+        expected = self.version if expected_version is None else expected_version
+        with transaction.atomic():
+            claimed = Task.objects.filter(pk=self.pk, version=expected).update(version=models.F('version'))
+            if not claimed:
+                raise TaskConflict(f"Задача {self.pk} изменена параллельно")
+            self.save(update_fields=update_fields)
+
 
 class Comment(models.Model):
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='comments')
@@ -33,6 +92,9 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['task', 'created_at', 'id'], name='comment_task_created_id_idx'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author.username} on {self.task.title}"
@@ -43,7 +105,125 @@ class TaskRating(models.Model):
     rated_by = models.ForeignKey(User, on_delete=models.CASCADE)
     rated_at = models.DateTimeField(auto_now_add=True)
     comment = models.TextField(blank=True, null=True)
+    # Исполнитель задачи на момент оценки: ему засчитывается оценка в UserRatingStats.
+    assignee = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, editable=False, related_name='received_ratings'
+    )
 
     class Meta:
         verbose_name = 'Оценка задачи'
-        verbose_name_plural = 'Оценки задач'
\ No newline at end of file
+        verbose_name_plural = 'Оценки задач'
+        indexes = [
+            models.Index(fields=['assignee', '-rated_at'], name='rating_assignee_rated_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.assignee_id is None:
+            self.assignee_id = self.task.assignee_id
+        # Счётчики обновляются сигналами (tasks/ratings.py) в той же транзакции, что и оценка.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class UserRatingStats(models.Model):
+    """
+    Сумма и число оценок задач исполнителя за всё время.
+    Поддерживаются сигналами TaskRating (tasks/ratings.py); оценка засчитывается
+    исполнителю задачи на момент её выставления.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='rating_stats')
+    score_sum = models.PositiveIntegerField(default=0)
+    count = models.PositiveIntegerField(default=0)
+
+    @property
+    def average(self):
+        return round(self.score_sum / self.count, 2) if self.count else 0
+
+
+class UserRatingMonth(models.Model):
+    """
+    Сумма и число оценок исполнителя за календарный месяц (month — первый день месяца).
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='rating_months')
+    month = models.DateField()
+    score_sum = models.PositiveIntegerField(default=0)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'month'], name='user_rating_month_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['month', 'user'], name='rating_month_user_idx'),
+        ]
+
+    @property
+    def average(self):
+        return round(self.score_sum / self.count, 2) if self.count else 0
+
+
+class TaskChange(models.Model):
+    """
+    Запись журнала изменений задачи: одно поле, старое и новое значение в виде строки.
+    Журнал только дополняется; значения внешних ключей хранятся как id, дедлайн — в ISO 8601.
+    """
+    FIELD_CHOICES = (
+        ('status', 'Статус'),
+        ('assignee', 'Исполнитель'),
+        ('deadline', 'Срок'),
+        ('team', 'Команда'),
+    )
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='changes')
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='+')
+    field = models.CharField(max_length=20, choices=FIELD_CHOICES)
+    old_value = models.CharField(max_length=64, null=True)
+    new_value = models.CharField(max_length=64, null=True)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = 'Изменение задачи'
+        verbose_name_plural = 'Изменения задач'
+        indexes = [
+            models.Index(fields=['field', 'changed_at'], name='taskchange_field_changed_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id}.{self.field}: {self.old_value} → {self.new_value}"
+
+
+class TaskReminder(models.Model):
+    """
+    Напоминание исполнителю о приближающемся или пропущенном дедлайне.
+    Одно напоминание каждого вида на задачу, исполнителя и значение дедлайна:
+    повторный проход сканера не создаёт дублей, а перенос дедлайна даёт новое напоминание.
+    """
+    KIND_CHOICES = (
+        ('upcoming', 'Скоро дедлайн'),
+        ('overdue', 'Просрочено'),
+    )
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='reminders')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='task_reminders')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    deadline = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Напоминание о дедлайне'
+        verbose_name_plural = 'Напоминания о дедлайнах'
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'user', 'kind', 'deadline'], name='task_reminder_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.task_id} для {self.user_id}"
+
+
+class ReminderScanState(models.Model):
+    """
+    Отметка последнего прохода сканера дедлайнов (high-water mark).
+    """
+    name = models.CharField(max_length=50, unique=True)
+    scanned_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name}: {self.scanned_at}"
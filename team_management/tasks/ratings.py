@@ -0,0 +1,57 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import TaskRating, UserRatingMonth, UserRatingStats
+
+
+def rating_month(moment):
+    """
+    Ключ месячной корзины: первый день месяца в текущем часовом поясе.
+    """
+    return timezone.localdate(moment).replace(day=1)
+
+
+def _add(model, lookup, score, count):
+    """
+    Прибавляет дельту к счётчикам строки одним UPDATE; строка создаётся только при добавлении оценки.
+    """
+    updated = model.objects.filter(**lookup).update(score_sum=F('score_sum') + score, count=F('count') + count)
+    if not updated and count > 0:
+        model.objects.create(**lookup, score_sum=score, count=count)
+
+
+def apply_rating(user_id, rated_at, score, sign):
+    """
+    Добавляет (sign=1) или вычитает (sign=-1) оценку из счётчиков исполнителя за всё время и за месяц.
+    """
+    if user_id is None:
+        return
+    _add(UserRatingStats, {'user_id': user_id}, sign * score, sign)
+    _add(UserRatingMonth, {'user_id': user_id, 'month': rating_month(rated_at)}, sign * score, sign)
+
+
+@transaction.atomic
+def rebuild_rating_stats():
+    """
+    Пересчитывает все счётчики по таблице оценок. Возвращает число учтённых оценок.
+    """
+    UserRatingStats.objects.all().delete()
+    UserRatingMonth.objects.all().delete()
+    totals, months = {}, {}
+    ratings = TaskRating.objects.filter(assignee__isnull=False).values_list('assignee_id', 'rated_at', 'score')
+    processed = 0
+    for user_id, rated_at, score in ratings.iterator():
+        for bucket, key in ((totals, user_id), (months, (user_id, rating_month(rated_at)))):
+            score_sum, count = bucket.get(key, (0, 0))
+            bucket[key] = (score_sum + score, count + 1)
+        processed += 1
+    UserRatingStats.objects.bulk_create(
+        UserRatingStats(user_id=user_id, score_sum=score_sum, count=count)
+        for user_id, (score_sum, count) in totals.items()
+    )
+    UserRatingMonth.objects.bulk_create(
+        UserRatingMonth(user_id=user_id, month=month, score_sum=score_sum, count=count)
+        for (user_id, month), (score_sum, count) in months.items()
+    )
+    return processed
@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import ReminderScanState, Task, TaskReminder
+
+REMINDER_SCAN_NAME = 'deadlines'
+REMINDER_LEAD_TIME = timedelta(hours=24)
+REMINDER_BATCH_SIZE = 500
+OPEN_STATUSES = [value for value, _ in Task.STATUS_CHOICES if value != 'done']
+
+
+def find_candidate_ids(since, horizon):
+    """
+    Id незавершённых задач с исполнителем и дедлайном до horizon, которые могли получить
+    новое напоминание после отметки since: дедлайн позже since (задача пересекла порог
+    «скоро» или «просрочено» с прошлого прохода) или задача менялась после since.
+    Без отметки (первый проход) — все такие задачи.
+
+    Два запроса вместо одного с OR, чтобы каждый шёл по своему индексу: диапазон
+    (status, deadline) и updated_at. Сортировка по id выполняется в памяти, иначе план
+    сводится к обходу всей таблицы по первичному ключу.
+    """
+    tasks = Task.objects.filter(
+        status__in=OPEN_STATUSES, deadline__lte=horizon, assignee__isnull=False
+    ).order_by()
+    if since is None:
+        return sorted(tasks.values_list('id', flat=True).iterator())
+    crossed = tasks.filter(deadline__gt=since).values_list('id', flat=True)
+    changed = tasks.filter(updated_at__gt=since).values_list('id', flat=True)
+    return sorted(set(crossed.iterator()) | set(changed.iterator()))
+
+
+def _create_reminders(task_ids, now):
+    """
+    Создаёт недостающие напоминания для пачки задач: чтение задач, чтение уже
+    существующих напоминаний и один bulk_create. Возвращает число новых напоминаний.
+    """
+    rows = Task.objects.filter(id__in=task_ids).values_list('id', 'assignee_id', 'deadline')
+    existing = set(
+        TaskReminder.objects.filter(task_id__in=task_ids).values_list('task_id', 'user_id', 'kind', 'deadline')
+    )
+    reminders = []
+    for task_id, user_id, deadline in rows:
+        key = (task_id, user_id, 'overdue' if deadline <= now else 'upcoming', deadline)
+        if key not in existing:
+            reminders.append(TaskReminder(task_id=task_id, user_id=user_id, kind=key[2], deadline=deadline))
+    # ignore_conflicts страхует от параллельного запуска сканера.
+    TaskReminder.objects.bulk_create(reminders, ignore_conflicts=True)
+    return len(reminders)
+
+
+def scan_deadlines(now=None, lead_time=REMINDER_LEAD_TIME, batch_size=REMINDER_BATCH_SIZE, progress=None):
+    """
+    Находит незавершённые задачи с дедлайном в ближайшие lead_time или уже прошедшим
+    и записывает исполнителям напоминания видов upcoming и overdue.
+
+    Просматриваются только задачи, изменившиеся или пересёкшие порог с прошлого прохода
+    (отметка ReminderScanState). Кандидаты обрабатываются пачками по batch_size в порядке id,
+    каждая пачка пишется отдельным коротким bulk_create, так что SQLite не блокируется
+    на весь проход. Отметка сдвигается на время начала прохода только после его завершения:
+    прерванный проход безопасно повторяется, дубли отсекает уникальное ограничение.
+
+    Возвращает словарь {'scanned': ..., 'created': ...}.
+    """
+    now = now or timezone.now()
+    state = ReminderScanState.objects.filter(name=REMINDER_SCAN_NAME).first()
+    task_ids = find_candidate_ids(state and state.scanned_at, now + lead_time)
+
+    created = 0
+    for start in range(0, len(task_ids), batch_size):
+        batch = task_ids[start:start + batch_size]
+        created += _create_reminders(batch, now)
+        if progress:
+            progress(start + len(batch))
+
+    if state is None:
+        ReminderScanState.objects.create(name=REMINDER_SCAN_NAME, scanned_at=now)
+    else:
+        state.scanned_at = now
+        state.save(update_fields=['scanned_at'])
+    return {'scanned': len(task_ids), 'created': created}
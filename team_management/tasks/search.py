@@ -0,0 +1,197 @@
+import re
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Comment, Task
+
+SEARCH_TABLE = 'tasks_search'
+SEARCH_PAGE_SIZE = 20
+SEARCH_REBUILD_BATCH_SIZE = 1000
+# Веса bm25 для столбцов title, description, comments.
+SEARCH_WEIGHTS = (10.0, 3.0, 1.0)
+_MAX_ROWID = 2 ** 63 - 1
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_supported():
+    """
+    Индекс FTS5 есть только в SQLite; на других СУБД поиск идёт через icontains без ранжирования.
+    """
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(query):
+    """
+    Превращает пользовательский ввод в безопасный запрос FTS5: каждое слово — префиксный
+    токен в кавычках, слова объединяются через AND. Возвращает None, если слов нет.
+    """
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return None
+    return ' '.join('"%s"*' % token.replace('"', '""') for token in tokens)
+
+
+def _task_rows(task_ids):
+    return [
+        (task_id, title, description, '', task_id)
+        for task_id, title, description in Task.objects.filter(id__in=task_ids).values_list(
+            'id', 'title', 'description'
+        )
+    ]
+
+
+def _comment_rows(comment_ids):
+    return [
+        (-comment_id, '', '', text, task_id)
+        for comment_id, task_id, text in Comment.objects.filter(id__in=comment_ids).values_list(
+            'id', 'task_id', 'text'
+        )
+    ]
+
+
+def _insert_rows(cursor, rows):
+    if rows:
+        cursor.executemany(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, title, description, comments, task_id) '
+            f'VALUES (%s, %s, %s, %s, %s)',
+            rows,
+        )
+
+
+def _delete_rows(cursor, rowids):
+    placeholders = ', '.join(['%s'] * len(rowids))
+    cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})', rowids)
+
+
+def index_tasks(task_ids):
+    """
+    Пересобирает строки задач в индексе: заголовок и описание, rowid совпадает с id задачи.
+    Один запрос на пачку задач; удалённые задачи из индекса убираются.
+    """
+    task_ids = list(task_ids)
+    if not task_ids or not search_supported():
+        return
+    rows = _task_rows(task_ids)
+    with connection.cursor() as cursor:
+        _delete_rows(cursor, task_ids)
+        _insert_rows(cursor, rows)
+
+
+def index_comments(comment_ids):
+    """
+    Пересобирает строки комментариев: у каждого своя строка с rowid = -id комментария
+    и id задачи в task_id, так что запись комментария не трогает строку задачи и другие комментарии.
+    """
+    comment_ids = list(comment_ids)
+    if not comment_ids or not search_supported():
+        return
+    rows = _comment_rows(comment_ids)
+    with connection.cursor() as cursor:
+        _delete_rows(cursor, [-comment_id for comment_id in comment_ids])
+        _insert_rows(cursor, rows)
+
+
+def remove_tasks(task_ids):
+    """
+    Убирает строки задач из индекса. Строки их комментариев убирает сигнал удаления комментариев,
+    который Django отправляет при каскадном удалении.
+    """
+    task_ids = list(task_ids)
+    if task_ids and search_supported():
+        with connection.cursor() as cursor:
+            _delete_rows(cursor, task_ids)
+
+
+def remove_comments(comment_ids):
+    """
+    Убирает строки комментариев из индекса.
+    """
+    comment_ids = list(comment_ids)
+    if comment_ids and search_supported():
+        with connection.cursor() as cursor:
+            _delete_rows(cursor, [-comment_id for comment_id in comment_ids])
+
+
+def _rebuild_rows(model, make_rows, sign, batch_size, progress=None):
+    """
+    Заменяет строки индекса записей model пачками по batch_size в порядке id. Каждая пачка —
+    отдельная транзакция: удаляется диапазон rowid пачки (вместе с осиротевшими строками)
+    и вставляются актуальные строки; последняя транзакция убирает строки за последним id.
+    sign — знак rowid этого вида строк. Возвращает число обработанных записей.
+    """
+    done, last_id = 0, 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            batch = list(
+                model.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            upper = batch[-1] if batch else _MAX_ROWID
+            low, high = sorted((sign * (last_id + 1), sign * upper))
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid BETWEEN %s AND %s', [low, high])
+            _insert_rows(cursor, make_rows(batch))
+        if not batch:
+            return done
+        done += len(batch)
+        last_id = upper
+        if progress:
+            progress(done)
+
+
+def rebuild_index(batch_size=SEARCH_REBUILD_BATCH_SIZE, progress=None):
+    """
+    Заменяет строки индекса пачками по batch_size: сначала задачи, затем комментарии.
+    Индекс не очищается целиком, поэтому поиск во время пересборки находит всё, что находил до неё.
+    progress вызывается с числом обработанных задач. Возвращает число проиндексированных задач.
+    """
+    if not search_supported():
+        return 0
+    indexed = _rebuild_rows(Task, _task_rows, 1, batch_size, progress)
+    _rebuild_rows(Comment, _comment_rows, -1, batch_size)
+    return indexed
+
+
+def search_tasks(user, query, page=1, page_size=SEARCH_PAGE_SIZE):
+    """
+    Ищет задачи, видимые пользователю, по заголовку, описанию и комментариям.
+
+    Возвращает (задачи, есть_следующая_страница). В SQLite совпавшие строки задач и комментариев
+    группируются по task_id, задачи упорядочены по лучшему bm25 среди своих строк;
+    ограничение по командам пользователя применяется в том же запросе до LIMIT.
+    Задачи загружаются вторым запросом вместе с командой и исполнителем.
+    """
+    match = build_match_query(query)
+    if match is None:
+        return [], False
+    offset = (page - 1) * page_size
+    visible = Task.objects.visible_to(user)
+
+    if search_supported():
+        visible_sql, visible_params = visible.values('id').query.sql_with_params()
+        weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS)
+        with connection.cursor() as cursor:
+            # MATERIALIZED не даёт SQLite встроить подзапрос: bm25 нельзя вызывать внутри агрегата.
+            cursor.execute(
+                f'WITH hits AS MATERIALIZED ('
+                f'SELECT task_id, bm25({SEARCH_TABLE}, {weights}) AS score FROM {SEARCH_TABLE} '
+                f'WHERE {SEARCH_TABLE} MATCH %s AND task_id IN ({visible_sql})) '
+                f'SELECT task_id FROM hits GROUP BY task_id ORDER BY MIN(score), task_id LIMIT %s OFFSET %s',
+                [match, *visible_params, page_size + 1, offset],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+    else:
+        condition = Q()
+        for token in _TOKEN_RE.findall(query):
+            condition &= (
+                Q(title__icontains=token) | Q(description__icontains=token) | Q(comments__text__icontains=token)
+            )
+        ids = list(
+            visible.filter(condition).order_by('-created_at', '-id').values_list('id', flat=True).distinct()
+            [offset:offset + page_size + 1]
+        )
+
+    has_next = len(ids) > page_size
+    ids = ids[:page_size]
+    tasks = Task.objects.select_related('team', 'assignee').in_bulk(ids)
+    return [tasks[task_id] for task_id in ids if task_id in tasks], has_next
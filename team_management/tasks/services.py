@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from django.db.models import Q
+
+from team_management.cursors import decode_cursor, encode_cursor
+from teams.models import TeamMember
+from .models import Comment
+
+COMMENTS_PAGE_SIZE = 20
+
+
+def find_non_members(pairs):
+    """
+    Правило назначения исполнителя: он должен состоять в команде задачи.
+    Возвращает пары (user_id, team_id) из pairs, для которых нет TeamMember.
+    Все пары проверяются одним запросом; пары без пользователя пропускаются.
+    """
+    pairs = {(user_id, team_id) for user_id, team_id in pairs if user_id is not None}
+    if not pairs:
+        return set()
+    existing = set(
+        TeamMember.objects.filter(
+            user_id__in={user_id for user_id, _ in pairs},
+            team_id__in={team_id for _, team_id in pairs},
+        ).values_list('user_id', 'team_id')
+    )
+    return pairs - existing
+
+
+def get_comments_page(task, cursor=None, page_size=COMMENTS_PAGE_SIZE):
+    """
+    Страница комментариев задачи от новых к старым по ключу (created_at, id).
+    Читается по индексу comment_task_created_id_idx без OFFSET, авторы — тем же запросом.
+    Возвращает кортеж (комментарии в хронологическом порядке, курсор более ранней страницы или None).
+    Бросает InvalidCursor, если курсор повреждён.
+    """
+    comments = (
+        Comment.objects.filter(task=task)
+        .select_related('author')
+        .order_by('-created_at', '-id')
+    )
+    if cursor:
+        created_at, comment_id = decode_cursor(cursor, datetime.fromisoformat, int)
+        comments = comments.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=comment_id))
+    items = list(comments[:page_size + 1])
+    has_more = len(items) > page_size
+    items = items[:page_size]
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if has_more else None
+    return items[::-1], next_cursor
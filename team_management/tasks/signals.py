@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from tasks.models import Comment, Task, TaskRating
+from tasks.ratings import apply_rating
+from tasks.search import index_comments, index_tasks, remove_comments, remove_tasks
+
+SEARCH_FIELDS = {'title', 'description'}
+
+
+@receiver(post_save, sender=Task)
+def index_saved_task(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Обновляет строку поискового индекса, если менялись индексируемые поля.
+    """
+    if created or update_fields is None or SEARCH_FIELDS & set(update_fields):
+        index_tasks([instance.id])
+
+
+@receiver(post_delete, sender=Task)
+def unindex_deleted_task(sender, instance, **kwargs):
+    remove_tasks([instance.id])
+
+
+@receiver(post_save, sender=Comment)
+def index_saved_comment(sender, instance, **kwargs):
+    """
+    У комментария своя строка индекса, строка задачи не пересобирается.
+    """
+    index_comments([instance.id])
+
+
+@receiver(post_delete, sender=Comment)
+def unindex_deleted_comment(sender, instance, **kwargs):
+    remove_comments([instance.id])
+
+
+@receiver(pre_save, sender=TaskRating)
+def remember_rating(sender, instance, **kwargs):
+    instance._counted_rating = None
+    if instance.pk:
+        instance._counted_rating = (
+            TaskRating.objects.filter(pk=instance.pk).values_list('assignee_id', 'rated_at', 'score').first()
+        )
+
+
+@receiver(post_save, sender=TaskRating)
+def count_saved_rating(sender, instance, **kwargs):
+    """
+    Переносит оценку в счётчиках: старое значение вычитается, новое добавляется.
+    """
+    old = getattr(instance, '_counted_rating', None)
+    if old is not None:
+        apply_rating(*old, sign=-1)
+    apply_rating(instance.assignee_id, instance.rated_at, instance.score, sign=1)
+
+
+@receiver(post_delete, sender=TaskRating)
+def uncount_deleted_rating(sender, instance, **kwargs):
+    apply_rating(instance.assignee_id, instance.rated_at, instance.score, sign=-1)
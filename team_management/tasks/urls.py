@@ -1,10 +1,23 @@
 from django.urls import path
 
-from tasks.views import my_tasks_view, task_detail_view, create_task_view, rate_task
+from tasks.views import (
+    my_tasks_view,
+    task_detail_view,
+    create_task_view,
+    rate_task,
+    task_search_view,
+    task_comments_view,
+    task_comment_view,
+    task_status_view,
+)
 
 urlpatterns = [
     path('my-tasks/', my_tasks_view, name='my_tasks'),
     path('task/<int:task_id>/', task_detail_view, name='task_detail'),
     path('tasks/create/', create_task_view, name='create_task'),
     path('task/<int:task_id>/rate/', rate_task, name='rate_task'),
+    path('task/<int:task_id>/comments/', task_comments_view, name='task_comments'),
+    path('task/<int:task_id>/comments/<int:comment_id>/', task_comment_view, name='task_comment'),
+    path('task/<int:task_id>/status/', task_status_view, name='task_status'),
+    path('search/', task_search_view, name='task_search'),
 ]
\ No newline at end of file
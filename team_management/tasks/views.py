@@ -3,12 +3,49 @@ from datetime import datetime
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.db.models import Count
+from django.http import JsonResponse
 from django.shortcuts import render, get_object_or_404, redirect
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods
 
-from teams.models import TeamMember
+from team_management.cursors import InvalidCursor
 from users.models import User
 from .forms import TaskForm, TaskRatingForm
-from .models import Task, Comment
+from .history import TaskHistory, snapshot
+from .models import Task, TaskConflict, Comment, TaskRating
+from .search import search_tasks
+from .services import find_non_members, get_comments_page
+
+# Поля, которые меняет форма редактирования задачи.
+EDITABLE_FIELDS = ('title', 'description', 'deadline', 'assignee')
+CONFLICT_MESSAGE = "Задачу уже изменил другой пользователь. Обновите страницу и повторите изменение"
+
+
+def _parse_page(value):
+    try:
+        return max(int(value), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+@login_required
+def task_search_view(request):
+    """
+    Поиск по задачам команд пользователя: заголовок, описание и комментарии.
+    Результаты ранжированы по релевантности и разбиты на страницы (параметры q и page).
+    """
+    query = request.GET.get('q', '').strip()
+    page = _parse_page(request.GET.get('page'))
+    results, has_next = search_tasks(request.user, query, page) if query else ([], False)
+    return render(request, 'tasks/search.html', {
+        'query': query,
+        'page': page,
+        'results': results,
+        'has_next': has_next,
+    })
 
 
 @login_required
@@ -29,7 +66,7 @@ def task_detail_view(request, task_id):
     """
     Представление для отображения деталей задачи и управления ею.
     """
-    task = get_object_or_404(Task, id=task_id)
+    task = _get_task_with_details(task_id)
     _check_task_access(request, task)
 
     if request.method == 'POST':
@@ -52,12 +89,26 @@ def task_detail_view(request, task_id):
     return render(request, 'tasks/task_detail.html', context)
 
 
+def _apply_form_version(request, task):
+    """
+    Подставляет версию задачи, с которой пользователь открыл форму (скрытое поле version).
+    Без неё проверяется версия, загруженная в этом запросе.
+    """
+    version = request.POST.get('version', '')
+    if version.isdigit():
+        task.version = int(version)
+
+
+def _can_view_task(user, task):
+    return user.is_staff or user.id == task.assignee_id
+
+
 def _check_task_access(request, task):
     """
     Проверяет, имеет ли пользователь доступ к задаче.
     Если нет — вызывает PermissionDenied и выводит сообщение об ошибке.
     """
-    if not (request.user.is_staff or request.user == task.assignee):
+    if not _can_view_task(request.user, task):
         messages.error(request, "У вас нет доступа к этой задаче")
         raise PermissionDenied
 
@@ -79,29 +130,33 @@ def _handle_task_edit(request, task):
     """
     Обработчик редактирования задачи.
     Право редактирования есть только у администратора.
+    Сохраняются только изменившиеся поля и только если задачу не изменили после открытия формы.
     """
     if not request.user.is_staff:
         messages.error(request, "Вы не можете редактировать эту задачу")
         return redirect('task_detail', task_id=task.id)
+    before = snapshot(task)
+    original = {field: getattr(task, field) for field in EDITABLE_FIELDS}
     task.title = request.POST.get('title', task.title)
     task.description = request.POST.get('description', task.description)
     deadline_str = request.POST.get('deadline')
     if deadline_str:
         try:
-            task.deadline = datetime.strptime(deadline_str, '%Y-%m-%dT%H:%M')
+            task.deadline = timezone.make_aware(datetime.strptime(deadline_str, '%Y-%m-%dT%H:%M'))
         except ValueError:
             messages.error(request, "Неверный формат даты")
             return redirect('task_detail', task_id=task.id)
     assignee_id = request.POST.get('assignee')
+    success = None
     if assignee_id == '':
         task.assignee = None
-        messages.success(request, "Исполнитель удалён")
+        success = "Исполнитель удалён"
     elif assignee_id:
         try:
             assignee = User.objects.get(id=assignee_id)
-            if TeamMember.objects.filter(user=assignee, team=task.team).exists():
+            if not find_non_members({(assignee.id, task.team_id)}):
                 task.assignee = assignee
-                messages.success(request, f"Исполнитель {assignee.username} назначен")
+                success = f"Исполнитель {assignee.username} назначен"
             else:
                 messages.error(request, "Этот пользователь не в вашей команде")
                 return redirect('task_detail', task_id=task.id)
@@ -109,7 +164,18 @@ def _handle_task_edit(request, task):
             messages.error(request, "Пользователь не найден")
             return redirect('task_detail', task_id=task.id)
 
-    task.save()
+    changed = [field for field in EDITABLE_FIELDS if getattr(task, field) != original[field]]
+    if changed:
+        try:
+            with transaction.atomic(), TaskHistory(request.user) as history:
+                _apply_form_version(request, task)
+                task.save_versioned([*changed, 'updated_at'])
+                history.add(task.id, before, snapshot(task))
+        except TaskConflict:
+            messages.error(request, CONFLICT_MESSAGE)
+            return redirect('task_detail', task_id=task.id)
+    if success:
+        messages.success(request, success)
     return redirect('task_detail', task_id=task.id)
 
 
@@ -238,8 +304,15 @@ def _handle_status_update(request, task):
         return redirect('task_detail', task_id=task.id)
 
     new_status = request.POST['status']
-    task.status = new_status
-    task.save()
+    try:
+        with transaction.atomic(), TaskHistory(request.user) as history:
+            history.watch(task)
+            _apply_form_version(request, task)
+            task.status = new_status
+            task.save_versioned(['status', 'updated_at'])
+    except TaskConflict:
+        messages.error(request, CONFLICT_MESSAGE)
+        return redirect('task_detail', task_id=task.id)
     messages.success(request, "Статус задачи обновлен")
     return redirect('task_detail', task_id=task.id)
 
@@ -258,7 +331,7 @@ def _handle_task_rating(request, task):
         messages.error(request, "Можно оценивать только завершенные задачи")
         return redirect('task_detail', task_id=task.id)
 
-    form = TaskRatingForm(request.POST)
+    form = TaskRatingForm(request.POST, instance=_get_rating(task))
     if form.is_valid():
         rating = form.save(commit=False)
         rating.task = task
@@ -271,12 +344,38 @@ def _handle_task_rating(request, task):
     return redirect('task_detail', task_id=task.id)
 
 
+def _get_task_with_details(task_id):
+    """
+    Загружает задачу для страницы просмотра одним запросом:
+    команда, исполнитель и оценка — через JOIN, число комментариев — в comments_count.
+    """
+    queryset = Task.objects.select_related('team', 'assignee', 'rating', 'rating__rated_by').annotate(
+        comments_count=Count('comments')
+    )
+    return get_object_or_404(queryset, id=task_id)
+
+
+def _get_rating(task):
+    """
+    Оценка задачи или None. Обратная связь один-к-одному уже загружена через select_related.
+    """
+    try:
+        return task.rating
+    except TaskRating.DoesNotExist:
+        return None
+
+
 def _prepare_task_context(request, task):
     """
     Подготавливает контекст для отображения страницы задачи.
+    Ожидает задачу из _get_task_with_details(): добавляет запрос последней страницы комментариев
+    и запрос списка участников команды. Более ранние комментарии подгружаются через task_comments_view.
     """
-    team_members = User.objects.filter(team_memberships__team=task.team) if task.team else User.objects.none()
-    existing_rating = task.ratings.filter(rated_by=request.user).first() if hasattr(task, 'ratings') else None
+    comments, comments_next_cursor = get_comments_page(task)
+    team_members = list(
+        User.objects.filter(team_memberships__team_id=task.team_id).order_by('username')
+    ) if task.team_id else []
+    existing_rating = _get_rating(task)
 
     return {
         'task': task,
@@ -288,5 +387,105 @@ def _prepare_task_context(request, task):
         'can_rate': request.user.is_staff and task.status == 'done',
         'existing_rating': existing_rating,
         'rating_form': TaskRatingForm(instance=existing_rating),
-        'comments': task.comments.all().select_related('author'),
+        'comments': comments,
+        'next_cursor': comments_next_cursor,
     }
+
+
+def _render_comment(request, task, comment):
+    return render_to_string('tasks/comment.html', {'task': task, 'comment': comment}, request=request)
+
+
+def _comment_error(message, status=400):
+    return JsonResponse({'errors': {'comment_text': [message]}}, status=status)
+
+
+@login_required
+@require_http_methods(['GET', 'POST'])
+def task_comments_view(request, task_id):
+    """
+    Комментарии задачи для страницы задачи, ответы в JSON.
+    GET — страница более ранних комментариев по курсору (параметр cursor): HTML-фрагмент и курсор следующей.
+    POST — добавление комментария (comment_text): HTML-фрагмент нового комментария и число комментариев.
+    """
+    task = get_object_or_404(Task, id=task_id)
+    if not _can_view_task(request.user, task):
+        raise PermissionDenied
+
+    if request.method == 'GET':
+        try:
+            comments, next_cursor = get_comments_page(task, request.GET.get('cursor'))
+        except InvalidCursor:
+            return JsonResponse({'errors': {'cursor': ["Некорректный курсор"]}}, status=400)
+        html = render_to_string('tasks/comment_page.html', {
+            'task': task,
+            'comments': comments,
+            'next_cursor': next_cursor,
+        }, request=request)
+        return JsonResponse({'html': html, 'next_cursor': next_cursor})
+
+    text = request.POST.get('comment_text', '').strip()
+    if not text:
+        return _comment_error("Комментарий не может быть пустым")
+    comment = Comment.objects.create(task=task, author=request.user, text=text)
+    return JsonResponse({
+        'id': comment.id,
+        'html': _render_comment(request, task, comment),
+        'count': task.comments.count(),
+    }, status=201)
+
+
+@login_required
+@require_http_methods(['POST', 'DELETE'])
+def task_comment_view(request, task_id, comment_id):
+    """
+    Изменение (POST с comment_text) и удаление (DELETE) комментария, ответы в JSON.
+    Изменять и удалять может автор комментария или администратор.
+    """
+    comment = get_object_or_404(
+        Comment.objects.select_related('task', 'author'), id=comment_id, task_id=task_id
+    )
+    task = comment.task
+    if not _can_view_task(request.user, task):
+        raise PermissionDenied
+    if not (comment.author_id == request.user.id or request.user.is_staff):
+        return _comment_error("Вы не можете изменять этот комментарий", status=403)
+
+    if request.method == 'DELETE':
+        comment.delete()
+        return JsonResponse({'id': comment_id, 'count': task.comments.count()})
+
+    text = request.POST.get('comment_text', '').strip()
+    if not text:
+        return _comment_error("Комментарий не может быть пустым")
+    comment.text = text
+    comment.save()
+    return JsonResponse({'id': comment.id, 'html': _render_comment(request, task, comment)})
+
+
+@login_required
+@require_http_methods(['POST'])
+def task_status_view(request, task_id):
+    """
+    Изменение статуса задачи без перезагрузки страницы (перетаскивание карточки на доске), ответ в JSON.
+    Принимает status и version — версию задачи, с которой работал клиент; при расхождении отвечает 409.
+    Право изменять статус есть у администратора или исполнителя.
+    """
+    task = get_object_or_404(Task, id=task_id)
+    if not (request.user.is_staff or request.user.id == task.assignee_id):
+        return JsonResponse({'errors': {'status': ["Вы не можете изменять статус этой задачи"]}}, status=403)
+
+    new_status = request.POST.get('status', '')
+    if new_status not in dict(Task.STATUS_CHOICES):
+        return JsonResponse({'errors': {'status': ["Некорректный статус"]}}, status=400)
+
+    if new_status != task.status:
+        try:
+            with transaction.atomic(), TaskHistory(request.user) as history:
+                history.watch(task)
+                _apply_form_version(request, task)
+                task.status = new_status
+                task.save_versioned(['status', 'updated_at'])
+        except TaskConflict:
+            return JsonResponse({'errors': {'version': [CONFLICT_MESSAGE]}}, status=409)
+    return JsonResponse({'id': task.id, 'status': task.status, 'version': task.version})
@@ -0,0 +1,33 @@
+"""
+Курсоры keyset-пагинации, общие для приложений: ключ последней строки страницы
+упаковывается в непрозрачную строку для URL.
+"""
+import base64
+import json
+
+
+class InvalidCursor(ValueError):
+    """Курсор пагинации не удалось разобрать."""
+
+
+def encode_cursor(*values):
+    """
+    Упаковывает значения ключа последней строки страницы в непрозрачную строку для URL.
+    """
+    payload = json.dumps([value.isoformat() if hasattr(value, 'isoformat') else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, *parsers):
+    """
+    Распаковывает курсор, применяя к каждому значению соответствующий парсер.
+    Бросает InvalidCursor, если курсор повреждён.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if len(values) != len(parsers):
+            raise ValueError
+        return [parser(value) for parser, value in zip(parsers, values)]
+    except (TypeError, ValueError):
+        raise InvalidCursor(cursor)
@@ -6,7 +6,7 @@ from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 
-from dashboard.views import dashboard_view
+from dashboard.views import dashboard_view, dashboard_tasks_feed, dashboard_meetings_feed
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -24,6 +24,8 @@ schema_view = get_schema_view(
 urlpatterns = [
     path('', RedirectView.as_view(url='users/login/')),
     path('dashboard/', dashboard_view, name='dashboard'),
+    path('dashboard/tasks/', dashboard_tasks_feed, name='dashboard_tasks_feed'),
+    path('dashboard/meetings/', dashboard_meetings_feed, name='dashboard_meetings_feed'),
     path('admin/', admin.site.urls),
     path('users/', include('users.urls')),
     path('tasks/', include('tasks.urls')),
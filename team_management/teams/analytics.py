@@ -0,0 +1,147 @@
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from tasks.models import Task, TaskChange, TaskRating
+
+ANALYTICS_CACHE_TIMEOUT = 15 * 60
+CYCLE_TIME_PERCENTILES = (50, 75, 90, 95)
+RATING_SCORES = range(1, 6)
+
+
+def _cache_key(team_id, start, end):
+    return f'team-analytics:{team_id}:{start.isoformat()}:{end.isoformat()}'
+
+
+def _bounds(start, end):
+    """
+    Диапазон дат [start, end] как полуинтервал aware-datetime, чтобы фильтры шли по индексам.
+    """
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(start, time.min), tz),
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz),
+    )
+
+
+def percentiles(values, points=CYCLE_TIME_PERCENTILES):
+    """
+    Процентили с линейной интерполяцией между соседними значениями (как numpy.percentile
+    по умолчанию). Одна сортировка, затем обращение по индексу для каждого процентиля.
+    Для пустого набора значения — None.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return {point: None for point in points}
+    last = len(ordered) - 1
+    result = {}
+    for point in points:
+        position = last * point / 100
+        lower = int(position)
+        upper = min(lower + 1, last)
+        result[point] = ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+    return result
+
+
+def _week_start(day):
+    return day - timedelta(days=day.weekday())
+
+
+def completion_metrics(team, start, end):
+    """
+    Пропускная способность по неделям и время цикла (от создания до перевода в done, в часах).
+    Завершения берутся из журнала TaskChange одним запросом; для задачи, закрытой
+    несколько раз, учитывается последнее закрытие в диапазоне.
+    """
+    start_dt, end_dt = _bounds(start, end)
+    rows = TaskChange.objects.filter(
+        field='status', new_value='done', changed_at__gte=start_dt, changed_at__lt=end_dt, task__team=team,
+    ).values_list('task_id', 'task__created_at', 'changed_at')
+    completed = {}
+    for task_id, created_at, done_at in rows.iterator():
+        if task_id not in completed or completed[task_id][1] < done_at:
+            completed[task_id] = (created_at, done_at)
+
+    per_week = Counter(_week_start(timezone.localdate(done_at)) for _, done_at in completed.values())
+    weeks = []
+    week = _week_start(start)
+    while week <= end:
+        weeks.append({'week_start': week, 'completed': per_week[week]})
+        week += timedelta(days=7)
+
+    cycle_hours = [(done_at - created_at).total_seconds() / 3600 for created_at, done_at in completed.values()]
+    return {
+        'throughput': weeks,
+        'cycle_time_hours': {
+            'count': len(cycle_hours),
+            **{
+                f'p{point}': None if value is None else round(value, 2)
+                for point, value in percentiles(cycle_hours).items()
+            },
+        },
+    }
+
+
+def rating_metrics(team, start, end):
+    """
+    Распределение оценок задач команды, выставленных в диапазоне, одним запросом.
+    """
+    start_dt, end_dt = _bounds(start, end)
+    scores = Counter(
+        TaskRating.objects.filter(task__team=team, rated_at__gte=start_dt, rated_at__lt=end_dt)
+        .values_list('score', flat=True)
+        .iterator()
+    )
+    total = sum(scores.values())
+    return {
+        'ratings': {
+            'distribution': {score: scores[score] for score in RATING_SCORES},
+            'count': total,
+            'average': round(sum(score * count for score, count in scores.items()) / total, 2) if total else None,
+        },
+    }
+
+
+def overdue_metrics(team, start, end, now=None):
+    """
+    Доля просроченных среди задач с дедлайном в диапазоне, уже наступившим к now:
+    задача просрочена, если не завершена или завершена позже дедлайна (по журналу TaskChange).
+    """
+    now = now or timezone.now()
+    start_dt, end_dt = _bounds(start, end)
+    rows = (
+        Task.objects.filter(team=team, deadline__gte=start_dt, deadline__lt=min(end_dt, now))
+        .annotate(done_at=Max('changes__changed_at', filter=Q(changes__field='status', changes__new_value='done')))
+        .values_list('status', 'deadline', 'done_at')
+    )
+    due = overdue = 0
+    for status, deadline, done_at in rows.iterator():
+        due += 1
+        if status != 'done' or (done_at is not None and done_at > deadline):
+            overdue += 1
+    return {'overdue': {'due': due, 'overdue': overdue, 'ratio': round(overdue / due, 4) if due else None}}
+
+
+def get_team_analytics(team, start, end):
+    """
+    Сводка по команде за диапазон дат [start, end]: пропускная способность по неделям,
+    процентили времени цикла, распределение оценок и доля просроченных задач.
+    По одному запросу на группу метрик; результат кэшируется на ANALYTICS_CACHE_TIMEOUT
+    по ключу (команда, диапазон).
+    """
+    key = _cache_key(team.id, start, end)
+    data = cache.get(key)
+    if data is None:
+        data = {
+            'team': team.id,
+            'start': start,
+            'end': end,
+            **completion_metrics(team, start, end),
+            **rating_metrics(team, start, end),
+            **overdue_metrics(team, start, end),
+        }
+        cache.set(key, data, ANALYTICS_CACHE_TIMEOUT)
+    return data
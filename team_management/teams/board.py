@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from django.db.models import Count, Q
+
+from tasks.models import Task
+from team_management.cursors import decode_cursor, encode_cursor
+
+BOARD_COLUMN_SIZE = 20
+
+
+def get_column_page(team, status, cursor=None, limit=BOARD_COLUMN_SIZE):
+    """
+    Карточки одной колонки по (deadline, id): срочные сверху. Читается диапазон индекса
+    task_board_idx (team, status, deadline, id) длиной limit + 1 строк, без сортировки всей колонки.
+    Возвращает (задачи, курсор следующей страницы или None); бросает InvalidCursor.
+    """
+    tasks = (
+        Task.objects.filter(team=team, status=status)
+        .select_related('assignee')
+        .order_by('deadline', 'id')
+    )
+    if cursor:
+        deadline, task_id = decode_cursor(cursor, datetime.fromisoformat, int)
+        tasks = tasks.filter(Q(deadline__gt=deadline) | Q(deadline=deadline, id__gt=task_id))
+    cards = list(tasks[:limit + 1])
+    next_cursor = None
+    if len(cards) > limit:
+        cards = cards[:limit]
+        next_cursor = encode_cursor(cards[-1].deadline, cards[-1].id)
+    return cards, next_cursor
+
+
+def get_board(team, limit=BOARD_COLUMN_SIZE):
+    """
+    Доска задач команды: колонка на каждый статус из Task.STATUS_CHOICES с числом задач
+    и первыми limit карточками. Один сгруппированный COUNT и по одному запросу на колонку;
+    все запросы идут по индексу (team, status, deadline, id), поэтому время не зависит
+    от числа задач в команде, кроме самого подсчёта по индексу.
+    """
+    counts = dict(
+        Task.objects.filter(team=team).order_by().values_list('status').annotate(count=Count('id'))
+    )
+    columns = []
+    for status, label in Task.STATUS_CHOICES:
+        cards, next_cursor = get_column_page(team, status, limit=limit)
+        columns.append({
+            'status': status,
+            'label': label,
+            'count': counts.get(status, 0),
+            'cards': cards,
+            'next_cursor': next_cursor,
+        })
+    return columns
@@ -1,4 +1,5 @@
 from django import forms
+from django.urls import reverse
 
 from .models import Team, TeamMember, User
 
@@ -21,6 +22,10 @@ class TeamMemberForm(forms.ModelForm):
     """
     Форма для добавления участника в команду (TeamMember).
     При инициализации принимает параметр `team`, чтобы исключить уже добавленных пользователей.
+
+    Список пользователей не выводится целиком: варианты подгружает виджет Select2
+    из teams:member_search, а в форме остаётся только присланный пользователь,
+    так что проверка при POST читает одну строку.
     """
 
     class Meta:
@@ -30,6 +35,12 @@ class TeamMemberForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         team = kwargs.pop('team', None)
         super().__init__(*args, **kwargs)
+        users = User.objects.all()
         if team:
             existing_members = team.members.values_list('user_id', flat=True)
-            self.fields['user'].queryset = User.objects.exclude(id__in=existing_members)
+            users = users.exclude(id__in=existing_members)
+            self.fields['user'].widget.attrs['data-autocomplete-url'] = reverse(
+                'teams:member_search', args=[team.id]
+            )
+        submitted = self.data.get(self.add_prefix('user'), '') if self.is_bound else ''
+        self.fields['user'].queryset = users.filter(id=submitted) if submitted.isdigit() else users.none()
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.1 on 2026-10-18 06:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='team',
+            options={'verbose_name': 'Команда', 'verbose_name_plural': 'Команды'},
+        ),
+        migrations.AlterModelOptions(
+            name='teammember',
+            options={'verbose_name': 'Участник команды', 'verbose_name_plural': 'Участники команд'},
+        ),
+        migrations.RemoveField(
+            model_name='team',
+            name='code',
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='created_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='created_teams', to=settings.AUTH_USER_MODEL, verbose_name='Создатель'),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='description',
+            field=models.TextField(blank=True, verbose_name='Описание'),
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='joined_at',
+            field=models.DateTimeField(auto_now_add=True, null=True, verbose_name='Дата вступления'),
+        ),
+        migrations.AlterField(
+            model_name='team',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Дата создания'),
+        ),
+        migrations.AlterField(
+            model_name='team',
+            name='name',
+            field=models.CharField(max_length=100, verbose_name='Название команды'),
+        ),
+        migrations.AlterField(
+            model_name='teammember',
+            name='role',
+            field=models.CharField(choices=[('member', 'Сотрудник'), ('manager', 'Менеджер'), ('admin', 'Администратор')], default='member', max_length=10, verbose_name='Роль'),
+        ),
+        migrations.AlterField(
+            model_name='teammember',
+            name='team',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='members', to='teams.team', verbose_name='Команда'),
+        ),
+        migrations.AlterField(
+            model_name='teammember',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_memberships', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+        ),
+        migrations.AddConstraint(
+            model_name='teammember',
+            constraint=models.UniqueConstraint(fields=('team', 'user'), name='unique_team_member'),
+        ),
+    ]
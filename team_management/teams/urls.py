@@ -6,9 +6,12 @@ app_name = 'teams'
 urlpatterns = [
     path('create/', views.team_create, name='team_create'),
     path('<int:team_id>/', views.team_detail, name='team_detail'),
+    path('<int:team_id>/board/', views.team_board, name='team_board'),
+    path('<int:team_id>/board/<str:status>/', views.team_board_column, name='team_board_column'),
     path('<int:pk>/edit/', views.TeamUpdateView.as_view(), name='team_edit'),
     path('<int:pk>/delete/', views.TeamDeleteView.as_view(), name='team_delete'),
     path('my-teams/', views.my_teams, name='my_teams'),
+    path('<int:team_id>/member-search/', views.member_search, name='member_search'),
     path('<int:team_id>/remove-member/<int:user_id>/', views.remove_member, name='remove_member'),
     path('<int:team_id>/update-role/<int:user_id>/', views.update_member_role, name='update_member_role'),
 
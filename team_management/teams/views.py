@@ -1,10 +1,18 @@
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy
+from django.views.decorators.http import require_GET
 from django.views.generic import UpdateView, DeleteView
 
-from .models import Team, TeamMember
+from tasks.models import Task
+from team_management.cursors import InvalidCursor
+from users.search import search_users
+from .board import get_board, get_column_page
+from .models import Team, TeamMember, User
 from .forms import TeamCreateForm, TeamMemberForm
 
 
@@ -79,6 +87,30 @@ def team_detail(request, team_id):
     }
     return render(request, 'teams/team_detail.html', context)
 
+@login_required
+@require_GET
+def member_search(request, team_id):
+    """
+    Поиск пользователей для добавления в команду по началу логина, имени или фамилии (параметр q).
+    Ответ в формате Select2: {"results": [{"id": ..., "text": ...}]}; участники команды исключены.
+    Доступен только администраторам команды.
+    """
+    team = get_object_or_404(Team, id=team_id)
+    if not team.members.filter(user=request.user, role='admin').exists():
+        raise PermissionDenied
+    candidates = User.objects.exclude(id__in=team.members.values('user_id'))
+    results = [
+        {'id': user.id, 'text': _user_label(user)}
+        for user in search_users(request.GET.get('q', ''), candidates)
+    ]
+    return JsonResponse({'results': results})
+
+
+def _user_label(user):
+    full_name = user.get_full_name()
+    return f'{user.username} ({full_name})' if full_name else user.username
+
+
 @login_required
 def remove_member(request, team_id, user_id):
     """
@@ -117,6 +149,46 @@ def update_member_role(request, team_id, user_id):
     return redirect('teams:team_detail', team_id=team.id)
 
 
+def _get_board_team(request, team_id):
+    """
+    Команда для доски задач: доступна её участникам и администраторам, остальным — 403.
+    """
+    team = get_object_or_404(Team, id=team_id)
+    if not (request.user.is_staff or team.members.filter(user=request.user).exists()):
+        raise PermissionDenied
+    return team
+
+
+@login_required
+def team_board(request, team_id):
+    """
+    Доска задач команды: колонки по статусам с числом задач и первыми карточками.
+    Карточки перетаскиваются между колонками, статус меняется JSON-запросом к task_status.
+    """
+    team = _get_board_team(request, team_id)
+    return render(request, 'teams/team_board.html', {
+        'team': team,
+        'columns': get_board(team),
+    })
+
+
+@login_required
+@require_GET
+def team_board_column(request, team_id, status):
+    """
+    Следующие карточки колонки доски по курсору (параметр cursor): HTML-фрагмент и курсор следующей страницы.
+    """
+    team = _get_board_team(request, team_id)
+    if status not in dict(Task.STATUS_CHOICES):
+        return JsonResponse({'errors': {'status': ["Некорректный статус"]}}, status=400)
+    try:
+        cards, next_cursor = get_column_page(team, status, request.GET.get('cursor'))
+    except InvalidCursor:
+        return JsonResponse({'errors': {'cursor': ["Некорректный курсор"]}}, status=400)
+    html = render_to_string('teams/board_cards.html', {'cards': cards, 'user': request.user}, request=request)
+    return JsonResponse({'html': html, 'next_cursor': next_cursor})
+
+
 class TeamUpdateView(UpdateView):
     """
     Класс-представление для редактирования информации о команде.
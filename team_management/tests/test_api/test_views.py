@@ -0,0 +1,363 @@
+import csv
+import json
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from conftest import TeamFactory
+from dashboard.cache import get_month_data
+from meetings.models import Meeting
+from tasks.models import Comment, Task, TaskRating
+from teams.board import get_column_page
+
+
+@pytest.fixture
+def calendar_task(user, team_member):
+    """Задача пользователя с дедлайном 10 июня 2025 года"""
+    return Task.objects.create(
+        title='Calendar task',
+        description='',
+        deadline=timezone.make_aware(datetime(2025, 6, 10, 12), timezone.get_current_timezone()),
+        assignee=user,
+        team=team_member.team,
+    )
+
+
+def test_calendar_requires_authentication(client):
+    """Неавторизованный пользователь не получает календарь"""
+    response = client.get(reverse('api_calendar'))
+    assert response.status_code in (401, 403)
+
+
+def test_calendar_returns_month_grid(authenticated_client, user, calendar_task):
+    """Календарь отдаёт количества по дням и задачи выбранного дня"""
+    Meeting.objects.create(
+        title='Planning', date=date(2025, 6, 10), time=time(9, 0),
+        duration=timedelta(hours=1), created_by=user,
+    )
+    response = authenticated_client.get(reverse('api_calendar'), {'year': 2025, 'month': 6, 'day': 10})
+    assert response.status_code == 200
+    assert response['ETag']
+
+    data = response.json()
+    days = {day['date']: day for week in data['weeks'] for day in week}
+    assert days['2025-06-10']['tasks_count'] == 1
+    assert days['2025-06-10']['meetings_count'] == 1
+    assert [task['title'] for task in data['tasks']] == ['Calendar task']
+    assert data['tasks'][0]['assignee'] == 'testuser'
+    assert [meeting['title'] for meeting in data['meetings']] == ['Planning']
+
+
+def test_calendar_out_of_range_year_falls_back_to_today(authenticated_client):
+    """Год, не помещающийся в datetime, даёт календарь текущего дня, а не ошибку сервера"""
+    response = authenticated_client.get(reverse('api_calendar'), {'year': '99999999999999999999'})
+    assert response.status_code == 200
+    assert response.json()['selected_date'] == timezone.localdate().isoformat()
+
+
+def test_calendar_not_modified(authenticated_client, calendar_task, django_assert_max_num_queries):
+    """Совпадающий If-None-Match даёт 304 без построения тела ответа"""
+    url = reverse('api_calendar')
+    params = {'year': 2025, 'month': 6, 'day': 10}
+    etag = authenticated_client.get(url, params)['ETag']
+
+    with django_assert_max_num_queries(4):
+        response = authenticated_client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response['ETag'] == etag
+    assert not response.content
+
+
+def test_calendar_etag_changes_after_edit(authenticated_client, calendar_task):
+    """Изменение задачи в окне сетки меняет ETag"""
+    url = reverse('api_calendar')
+    params = {'year': 2025, 'month': 6, 'day': 10}
+    etag = authenticated_client.get(url, params)['ETag']
+
+    calendar_task.status = 'done'
+    calendar_task.save()
+
+    response = authenticated_client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+    assert response.json()['tasks'][0]['status'] == 'done'
+
+
+@pytest.fixture
+def api_tasks(user, team):
+    """Задачи с разными статусами и дедлайнами в июне 2025 года"""
+    tz = timezone.get_current_timezone()
+    return [
+        Task.objects.create(
+            title=f'Task {day}', description='', team=team, assignee=user,
+            status='done' if day % 2 else 'open',
+            deadline=timezone.make_aware(datetime(2025, 6, day, 12), tz),
+        )
+        for day in range(1, 8)
+    ]
+
+
+def test_task_list_cursor_pagination(authenticated_client, api_tasks):
+    """Список задач отдаётся страницами по курсору без дублей и пропусков"""
+    url = reverse('task-list')
+    response = authenticated_client.get(url, {'page_size': 3, 'ordering': 'deadline'})
+    assert response.status_code == 200
+    data = response.json()
+    assert 'count' not in data
+    titles = [task['title'] for task in data['results']]
+    while data['next']:
+        data = authenticated_client.get(data['next']).json()
+        titles += [task['title'] for task in data['results']]
+    assert titles == [f'Task {day}' for day in range(1, 8)]
+    assert data['results'][0]['assignee']['username'] == 'testuser'
+
+
+def test_task_list_filters(authenticated_client, user_factory, team, api_tasks):
+    """Фильтры по статусу, команде, исполнителю и диапазону дедлайна"""
+    url = reverse('task-list')
+    response = authenticated_client.get(url, {
+        'status': 'open', 'team': team.id,
+        'deadline_after': '2025-06-03T00:00:00Z', 'deadline_before': '2025-06-07T00:00:00Z',
+    })
+    assert [task['title'] for task in response.json()['results']] == ['Task 6', 'Task 4']
+
+    other = user_factory()
+    response = authenticated_client.get(url, {'assignee': other.id})
+    assert response.json()['results'] == []
+
+    assert authenticated_client.get(url, {'status': 'unknown'}).status_code == 400
+
+
+def test_task_list_ignores_unindexed_ordering(authenticated_client, api_tasks):
+    """Сортировка по неиндексированному полю игнорируется"""
+    response = authenticated_client.get(reverse('task-list'), {'ordering': 'title'})
+    assert response.status_code == 200
+    assert response.json()['results'][0]['title'] == 'Task 7'
+
+
+def test_task_list_query_count_is_fixed(authenticated_client, user_factory, team, django_assert_num_queries):
+    """Число запросов не зависит от числа задач и исполнителей"""
+    for _ in range(2):
+        Task.objects.bulk_create([
+            Task(title='Bulk', description='', team=team, assignee=user_factory(), deadline=timezone.now())
+            for _ in range(10)
+        ])
+        authenticated_client.get(reverse('task-list'))
+        with django_assert_num_queries(3):
+            response = authenticated_client.get(reverse('task-list'))
+        assert response.status_code == 200
+
+
+def test_task_bulk_requires_staff(authenticated_client, api_tasks):
+    """Массовое изменение доступно только администратору"""
+    response = authenticated_client.post(
+        reverse('task-bulk'), {'ids': [api_tasks[0].id], 'status': 'done'}, content_type='application/json'
+    )
+    assert response.status_code == 403
+
+
+def test_task_bulk_updates_in_one_statement(admin_client, admin_user, user, team, team_member, api_tasks,
+                                            django_assert_max_num_queries):
+    """Статус и исполнитель меняются у всех задач, проверка членства — одним запросом"""
+    assert get_month_data(user, 2025, 6)['tasks_count']
+    ids = [task.id for task in api_tasks]
+    with django_assert_max_num_queries(12):
+        response = admin_client.post(
+            reverse('task-bulk'), {'ids': ids, 'status': 'in_progress', 'assignee': user.id},
+            content_type='application/json',
+        )
+    assert response.status_code == 200
+    assert response.json() == {'updated': len(ids)}
+    assert set(Task.objects.filter(id__in=ids).values_list('status', flat=True)) == {'in_progress'}
+    assert get_month_data(user, 2025, 6)['tasks_count'][date(2025, 6, 3)] == 1
+
+
+def test_task_bulk_checks_membership_for_team_move(admin_client, user, team, team_member, api_tasks):
+    """Перенос в команду, где исполнитель не состоит, отклоняется целиком"""
+    other_team = TeamFactory()
+    ids = [task.id for task in api_tasks[:3]]
+    response = admin_client.post(
+        reverse('task-bulk'), {'ids': ids, 'team': other_team.id}, content_type='application/json'
+    )
+    assert response.status_code == 400
+    assert 'assignee' in response.json()
+    assert not Task.objects.filter(team=other_team).exists()
+
+    response = admin_client.post(
+        reverse('task-bulk'), {'ids': ids, 'team': other_team.id, 'assignee': None},
+        content_type='application/json',
+    )
+    assert response.status_code == 200
+    assert Task.objects.filter(team=other_team, assignee=None).count() == 3
+
+
+def test_task_bulk_unknown_ids(admin_client, api_tasks):
+    """Неизвестные id дают 400 без изменений"""
+    response = admin_client.post(
+        reverse('task-bulk'), {'ids': [api_tasks[1].id, 999999], 'status': 'done'},
+        content_type='application/json',
+    )
+    assert response.status_code == 400
+    assert Task.objects.get(id=api_tasks[1].id).status == 'open'
+
+
+def read_stream(response):
+    return b''.join(response.streaming_content).decode()
+
+
+def test_task_export_csv_with_comments_and_ratings(admin_client, user, api_tasks):
+    """Выгрузка CSV содержит оценки и комментарии задач, фильтры как у списка"""
+    Comment.objects.create(task=api_tasks[1], author=user, text='First')
+    Comment.objects.create(task=api_tasks[1], author=user, text='Second')
+    Comment.objects.create(task=api_tasks[0], author=user, text='Other task')
+    TaskRating.objects.create(task=api_tasks[1], score=5, rated_by=user)
+
+    response = admin_client.get(reverse('task-export'), {'status': 'open', 'include': 'comments,ratings'})
+    assert response.status_code == 200
+    assert response.streaming
+    assert 'attachment' in response['Content-Disposition']
+    rows = list(csv.DictReader(read_stream(response).splitlines()))
+
+    assert [row['title'] for row in rows] == ['Task 2', 'Task 4', 'Task 6']
+    assert rows[0]['rating_score'] == '5'
+    assert [comment['text'] for comment in json.loads(rows[0]['comments'])] == ['First', 'Second']
+    assert json.loads(rows[1]['comments']) == []
+
+
+def test_task_export_ndjson_constant_queries(admin_client, api_tasks, django_assert_max_num_queries):
+    """NDJSON-выгрузка читает задачи одним потоком без запросов на строку"""
+    with django_assert_max_num_queries(4):
+        response = admin_client.get(reverse('task-export'), {'export_format': 'ndjson'})
+        lines = read_stream(response).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [record['title'] for record in records] == [f'Task {day}' for day in range(1, 8)]
+    assert records[0]['assignee'] == 'testuser'
+    assert 'comments' not in records[0]
+
+
+def test_task_export_invalid_params(admin_client):
+    """Неизвестный формат или include дают 400"""
+    url = reverse('task-export')
+    assert admin_client.get(url, {'export_format': 'xml'}).status_code == 400
+    assert admin_client.get(url, {'include': 'history'}).status_code == 400
+
+
+def test_task_export_requires_staff(authenticated_client, user, api_tasks):
+    """Обычный пользователь не выгружает задачи и комментарии чужих команд"""
+    other = Task.objects.create(
+        title='Private', description='', team=TeamFactory(), deadline=timezone.now(),
+    )
+    Comment.objects.create(task=other, author=user, text='Secret')
+    response = authenticated_client.get(reverse('task-export'), {'include': 'comments,ratings'})
+    assert response.status_code == 403
+
+
+def test_task_if_match(authenticated_client, api_tasks):
+    """
+    Изменение с устаревшим If-Match отклоняется с 412, с актуальным — проходит и возвращает новый ETag.
+    """
+    task = api_tasks[0]
+    url = reverse('task-detail', args=[task.id])
+    etag = authenticated_client.get(url)['ETag']
+
+    Task.objects.get(id=task.id).save()
+    response = authenticated_client.patch(
+        url, {'title': 'Mine'}, content_type='application/json', HTTP_IF_MATCH=etag
+    )
+    assert response.status_code == 412
+    assert Task.objects.get(id=task.id).title == 'Task 1'
+
+    etag = authenticated_client.get(url)['ETag']
+    response = authenticated_client.patch(
+        url, {'title': 'Mine'}, content_type='application/json', HTTP_IF_MATCH=etag
+    )
+    assert response.status_code == 200
+    assert response.json()['version'] == 3
+    assert response['ETag'] != etag
+    assert authenticated_client.delete(url, HTTP_IF_MATCH=etag).status_code == 412
+    assert authenticated_client.delete(url, HTTP_IF_MATCH=response['ETag']).status_code == 204
+
+
+def test_task_concurrent_update_conflict(authenticated_client, api_tasks, monkeypatch):
+    """Изменение, проигравшее гонку без If-Match, даёт 409"""
+    task = api_tasks[0]
+    original_save = Task.save_versioned
+
+    def concurrent_save(self, *args, **kwargs):
+        Task.objects.filter(id=self.id).update(version=self.version + 1)
+        return original_save(self, *args, **kwargs)
+
+    monkeypatch.setattr(Task, 'save_versioned', concurrent_save)
+    response = authenticated_client.patch(
+        reverse('task-detail', args=[task.id]), {'status': 'in_progress'}, content_type='application/json'
+    )
+    assert response.status_code == 409
+    assert Task.objects.get(id=task.id).status == 'done'
+
+
+def test_team_leaderboard(authenticated_client, user, user_factory, team, team_member, admin_user):
+    """
+    Рейтинг команды строится по счётчикам, упорядочен по средней оценке и постраничен.
+    """
+    other = user_factory()
+    team.members.create(user=other)
+    outsider = user_factory()
+    for assignee, score in ((user, 3), (user, 5), (other, 5), (outsider, 5)):
+        task = Task.objects.create(
+            title='Done', description='', status='done', team=team, assignee=assignee, deadline=timezone.now()
+        )
+        TaskRating.objects.create(task=task, score=score, rated_by=admin_user)
+
+    url = reverse('team_leaderboard', args=[team.id])
+    data = authenticated_client.get(url, {'page_size': 1}).json()
+    assert data['count'] == 2
+    assert data['results'] == [
+        {'user': {'id': other.id, 'username': other.username, 'first_name': '', 'last_name': ''},
+         'average': 5.0, 'count': 1},
+    ]
+    data = authenticated_client.get(data['next']).json()
+    assert [(entry['user']['id'], entry['average']) for entry in data['results']] == [(user.id, 4.0)]
+
+    response = authenticated_client.get(url, {'period': 'month'})
+    assert response.json()['count'] == 2
+    assert authenticated_client.get(url, {'period': 'year'}).status_code == 400
+
+
+def test_team_leaderboard_members_only(authenticated_client, user_factory):
+    """Рейтинг чужой команды недоступен"""
+    team = TeamFactory()
+    response = authenticated_client.get(reverse('team_leaderboard', args=[team.id]))
+    assert response.status_code == 403
+
+
+def test_team_board(authenticated_client, user, team, team_member):
+    """
+    Доска команды: колонки по статусам с числами задач; колонка дочитывается по курсору.
+    """
+    for i in range(3):
+        Task.objects.create(
+            title=f'Open {i}', description='', team=team, assignee=user,
+            deadline=timezone.now() + timedelta(days=i),
+        )
+    url = reverse('team_board', args=[team.id])
+    data = authenticated_client.get(url).json()
+    assert [(column['status'], column['count']) for column in data['columns']] == [
+        ('open', 3), ('in_progress', 0), ('done', 0),
+    ]
+    assert data['columns'][0]['cards'][0]['title'] == 'Open 0'
+
+    _, cursor = get_column_page(team, 'open', limit=1)
+    data = authenticated_client.get(url, {'status': 'open', 'cursor': cursor}).json()
+    assert [card['title'] for card in data['cards']] == ['Open 1', 'Open 2']
+    assert data['next_cursor'] is None
+
+    assert authenticated_client.get(url, {'status': 'archived'}).status_code == 400
+    assert authenticated_client.get(url, {'status': 'open', 'cursor': 'broken'}).status_code == 400
+
+
+def test_team_board_members_only(authenticated_client):
+    """Доска чужой команды недоступна"""
+    response = authenticated_client.get(reverse('team_board', args=[TeamFactory().id]))
+    assert response.status_code == 403
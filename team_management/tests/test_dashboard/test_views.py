@@ -0,0 +1,381 @@
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from conftest import TeamFactory
+from dashboard.cache import _get_generations, _month_key, _stamp_key, get_cached_daily_items, get_month_data
+from dashboard.services import (
+    FEED_PAGE_SIZE,
+    build_month_grid,
+    get_daily_items,
+    get_grid_bounds,
+    get_meetings_page,
+    get_tasks_page,
+)
+from meetings.models import Meeting
+from tasks.models import Task
+from teams.models import TeamMember
+
+
+@pytest.fixture
+def calendar_data(user, team):
+    """
+    Создаёт задачи и встречи на несколько дней июня 2025 года,
+    а также одну задачу далеко за пределами сетки календаря.
+    """
+    tz = timezone.get_current_timezone()
+    deadlines = (
+        datetime(2025, 6, 2, 10),
+        datetime(2025, 6, 2, 15),
+        datetime(2025, 6, 30, 9),
+        datetime(2025, 7, 7, 12),
+        datetime(2020, 1, 1, 10),
+    )
+    for deadline in deadlines:
+        Task.objects.create(
+            title=f'Task {deadline:%Y-%m-%d %H}',
+            description='',
+            deadline=timezone.make_aware(deadline, tz),
+            assignee=user,
+            team=team,
+        )
+    for day in (2, 2, 15):
+        Meeting.objects.create(
+            title=f'Meeting {day}',
+            date=date(2025, 6, day),
+            time=time(11, 0),
+            duration=timedelta(hours=1),
+            created_by=user,
+        )
+
+
+def test_grid_bounds_cover_whole_weeks():
+    """
+    Сетка начинается с понедельника и заканчивается воскресеньем.
+    """
+    grid_start, grid_end = get_grid_bounds(2025, 6)
+    assert grid_start == date(2025, 5, 26)
+    assert grid_end == date(2025, 7, 6)
+    assert grid_start.weekday() == 0
+    assert grid_end.weekday() == 6
+
+
+def test_build_month_grid_counts(calendar_data):
+    """
+    Количество задач и встреч по дням считается только для дат сетки.
+    """
+    weeks = build_month_grid(2025, 6, date(2025, 6, 2), date(2025, 6, 1))
+    days = {day['date']: day for week in weeks for day in week}
+
+    assert len(weeks) == 6
+    assert all(len(week) == 7 for week in weeks)
+    assert days[date(2025, 6, 2)]['tasks_count'] == 2
+    assert days[date(2025, 6, 2)]['meetings_count'] == 2
+    assert days[date(2025, 6, 2)]['is_selected']
+    assert days[date(2025, 6, 1)]['is_today']
+    assert days[date(2025, 6, 30)]['tasks_count'] == 1
+    assert days[date(2025, 7, 6)]['in_month'] is False
+    assert days[date(2025, 6, 15)]['meetings_count'] == 1
+    assert sum(day['tasks_count'] for day in days.values()) == 3
+
+
+def test_build_month_grid_query_count(calendar_data, django_assert_num_queries):
+    """
+    Сетка строится двумя агрегирующими запросами и запросом серий независимо от числа строк.
+    """
+    with django_assert_num_queries(3):
+        build_month_grid(2025, 6, date(2025, 6, 2), date(2025, 6, 1))
+
+
+def test_dashboard_view_calendar(authenticated_client, calendar_data):
+    """
+    Главная страница отдаёт сетку календаря для выбранного месяца.
+    """
+    response = authenticated_client.get(reverse('dashboard'), {'year': 2025, 'month': 6, 'day': 2})
+    assert response.status_code == 200
+    calendar = response.context['calendar']
+    assert calendar['selected_date'] == date(2025, 6, 2)
+    assert calendar['day'] == 2
+    assert calendar['weeks'][1][0]['tasks_count'] == 2
+
+
+def test_dashboard_view_invalid_date_falls_back_to_today(authenticated_client):
+    """
+    При некорректной дате выбирается сегодняшний день.
+    """
+    response = authenticated_client.get(reverse('dashboard'), {'year': 2025, 'month': 2, 'day': 31})
+    assert response.status_code == 200
+    assert response.context['calendar']['selected_date'] == timezone.now().date()
+
+
+def _create_tasks(team, count, **kwargs):
+    return [
+        Task.objects.create(
+            title=f'Feed task {i}',
+            description='',
+            deadline=timezone.now() + timedelta(days=1),
+            team=team,
+            **kwargs,
+        )
+        for i in range(count)
+    ]
+
+
+def test_tasks_feed_is_scoped_to_user_teams(authenticated_client, team_member):
+    """
+    В ленте только задачи команд пользователя.
+    """
+    own_task, = _create_tasks(team_member.team, 1)
+    other_team = TeamFactory()
+    foreign_task, = _create_tasks(other_team, 1)
+
+    response = authenticated_client.get(reverse('dashboard'))
+    assert own_task in response.context['tasks']
+    assert foreign_task not in response.context['tasks']
+
+
+def test_tasks_feed_keyset_pagination(authenticated_client, team_member):
+    """
+    Лента задач листается курсором без пропусков и повторов, от новых к старым.
+    """
+    created = _create_tasks(team_member.team, FEED_PAGE_SIZE + 5)
+
+    response = authenticated_client.get(reverse('dashboard'))
+    first_page = response.context['tasks']
+    cursor = response.context['tasks_next_cursor']
+    assert len(first_page) == FEED_PAGE_SIZE
+    assert cursor
+
+    response = authenticated_client.get(reverse('dashboard_tasks_feed'), {'cursor': cursor})
+    assert response.status_code == 200
+    second_page = response.context['tasks']
+    assert response.context['next_cursor'] is None
+    assert [task.id for task in first_page + second_page] == [task.id for task in reversed(created)]
+
+
+def test_tasks_feed_query_count_is_bounded(authenticated_client, team_member, django_assert_max_num_queries):
+    """
+    Страница ленты стоит фиксированное число запросов независимо от числа задач.
+    """
+    _create_tasks(team_member.team, FEED_PAGE_SIZE * 3)
+    _, cursor = get_tasks_page(team_member.user)
+    with django_assert_max_num_queries(3):
+        authenticated_client.get(reverse('dashboard_tasks_feed'), {'cursor': cursor})
+
+
+def test_meetings_feed_pagination(authenticated_client, user):
+    """
+    Лента ближайших встреч упорядочена по (date, time, id) и не содержит прошедших встреч.
+    """
+    today = timezone.now().date()
+    Meeting.objects.create(
+        title='Past', date=today - timedelta(days=1), time=time(10, 0),
+        duration=timedelta(hours=1), created_by=user,
+    )
+    upcoming = [
+        Meeting.objects.create(
+            title=f'Upcoming {i}', date=today + timedelta(days=1 + i // 3), time=time(9 + i % 3, 0),
+            duration=timedelta(hours=1), created_by=user,
+        )
+        for i in range(FEED_PAGE_SIZE + 2)
+    ]
+
+    meetings, cursor = get_meetings_page(user)
+    rest, next_cursor = get_meetings_page(user, cursor)
+    assert next_cursor is None
+    assert [m.id for m in meetings + rest] == [m.id for m in upcoming]
+
+    response = authenticated_client.get(reverse('dashboard_meetings_feed'), {'cursor': cursor})
+    assert response.status_code == 200
+    assert b'Upcoming' in response.content
+
+
+def test_feed_invalid_cursor(authenticated_client):
+    """
+    Повреждённый курсор возвращает 400.
+    """
+    response = authenticated_client.get(reverse('dashboard_tasks_feed'), {'cursor': 'garbage'})
+    assert response.status_code == 400
+
+
+def test_meetings_feed_includes_running_series(user):
+    """
+    Серия, начавшаяся до сегодняшнего дня, попадает в ленту ближайшими повторениями
+    вперемешку с одиночными встречами; курсор продолжает с места, где остановилась страница.
+    """
+    today = timezone.localdate()
+    series = Meeting.objects.create(
+        title='Standup', date=today - timedelta(days=14), time=time(9, 0),
+        duration=timedelta(minutes=15), created_by=user, recurrence='weekly', recurrence_count=5,
+    )
+    single = Meeting.objects.create(
+        title='Review', date=today + timedelta(days=8), time=time(12, 0),
+        duration=timedelta(hours=1), created_by=user,
+    )
+
+    first, cursor = get_meetings_page(user, page_size=2)
+    rest, next_cursor = get_meetings_page(user, cursor, page_size=2)
+    assert next_cursor is None
+    assert [(m.id, m.date) for m in first + rest] == [
+        (series.id, today),
+        (series.id, today + timedelta(days=7)),
+        (single.id, today + timedelta(days=8)),
+        (series.id, today + timedelta(days=14)),
+    ]
+
+
+def cache_has_month(user, year, month):
+    generation = _get_generations([user.id])[user.id]
+    stamp = cache.get(_stamp_key(user.id, generation, year, month))
+    return stamp is not None and cache.get(_month_key(user.id, generation, stamp, year, month)) is not None
+
+
+def test_month_grid_is_cached(user, team_member, django_assert_num_queries):
+    """
+    Повторное обращение к тому же месяцу не выполняет запросов к БД.
+    """
+    get_month_data(user, 2025, 6)
+    with django_assert_num_queries(0):
+        get_month_data(user, 2025, 6)
+
+
+def test_task_save_invalidates_affected_month(user, team_member):
+    """
+    Сохранение задачи сбрасывает корзины месяцев, в сетке которых виден её дедлайн,
+    и не трогает остальные.
+    """
+    tz = timezone.get_current_timezone()
+    assert get_month_data(user, 2025, 6)['tasks_count'] == {}
+    get_month_data(user, 2025, 9)
+
+    task = Task.objects.create(
+        title='New', description='', team=team_member.team,
+        deadline=timezone.make_aware(datetime(2025, 6, 30, 10), tz),
+    )
+    assert get_month_data(user, 2025, 6)['tasks_count'] == {date(2025, 6, 30): 1}
+    assert get_month_data(user, 2025, 7)['tasks_count'] == {date(2025, 6, 30): 1}
+    assert cache_has_month(user, 2025, 9)
+
+    task.deadline = timezone.make_aware(datetime(2025, 9, 10, 10), tz)
+    task.save()
+    assert get_month_data(user, 2025, 6)['tasks_count'] == {}
+    assert get_month_data(user, 2025, 9)['tasks_count'] == {date(2025, 9, 10): 1}
+
+    task.delete()
+    assert get_month_data(user, 2025, 9)['tasks_count'] == {}
+
+
+def test_meeting_participants_invalidate_calendar(user, user_factory):
+    """
+    Добавление пользователя в участники встречи сбрасывает его корзину месяца.
+    """
+    organizer = user_factory()
+    meeting = Meeting.objects.create(
+        title='Sync', date=date(2025, 6, 10), time=time(10, 0),
+        duration=timedelta(hours=1), created_by=organizer,
+    )
+    assert get_month_data(user, 2025, 6)['meetings_count'] == {}
+
+    meeting.participants.add(user)
+    assert get_month_data(user, 2025, 6)['meetings_count'] == {date(2025, 6, 10): 1}
+
+    meeting.participants.clear()
+    assert get_month_data(user, 2025, 6)['meetings_count'] == {}
+
+
+def test_meeting_edit_invalidates_changed_participants(authenticated_client, user, user_factory,
+                                                      django_capture_on_commit_callbacks):
+    """
+    Редактирование состава участников сбрасывает корзину месяца добавленного пользователя после коммита.
+    """
+    guest = user_factory()
+    day = timezone.localdate() + timedelta(days=2)
+    meeting = Meeting.objects.create(
+        title='Sync', date=day, time=time(10, 0), duration=timedelta(hours=1), created_by=user,
+    )
+    assert get_month_data(guest, day.year, day.month)['meetings_count'] == {}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_client.post(reverse('meeting_detail', args=[meeting.id]), {
+            'title': 'Sync', 'description': '', 'date': day.isoformat(), 'time': '10:00',
+            'duration': '01:00:00', 'participants': [guest.id],
+        })
+    assert get_month_data(guest, day.year, day.month)['meetings_count'] == {day: 1}
+
+
+def test_team_membership_resets_user_cache(user, team):
+    """
+    Вступление в команду сбрасывает весь кэш календаря пользователя.
+    """
+    Task.objects.create(
+        title='Team task', description='', team=team,
+        deadline=timezone.make_aware(datetime(2025, 6, 5, 10), timezone.get_current_timezone()),
+    )
+    assert get_month_data(user, 2025, 6)['tasks_count'] == {}
+
+    TeamMember.objects.create(user=user, team=team)
+    assert get_month_data(user, 2025, 6)['tasks_count'] == {date(2025, 6, 5): 1}
+
+
+def test_month_grid_counts_recurring_meetings(user):
+    """
+    Повторения серий попадают в количества по дням и в список встреч дня.
+    """
+    meeting = Meeting.objects.create(
+        title='Weekly', date=date(2025, 1, 2), time=time(10, 0),
+        duration=timedelta(hours=1), created_by=user, recurrence='weekly',
+    )
+    weeks = build_month_grid(
+        2025, 6, date(2025, 6, 5), date(2025, 6, 1), meetings=Meeting.objects.visible_to(user),
+    )
+    days = {day['date']: day for week in weeks for day in week}
+    assert [day for day, data in days.items() if data['meetings_count']] == [
+        date(2025, 5, 29), date(2025, 6, 5), date(2025, 6, 12),
+        date(2025, 6, 19), date(2025, 6, 26), date(2025, 7, 3),
+    ]
+
+    _, daily_meetings = get_daily_items(user, date(2025, 6, 12))
+    assert [(item.id, item.date) for item in daily_meetings] == [(meeting.id, date(2025, 6, 12))]
+
+
+def test_recurring_meeting_change_resets_all_months(user):
+    """
+    Изменение серии сбрасывает кэш всех месяцев пользователя.
+    """
+    meeting = Meeting.objects.create(
+        title='Weekly', date=date(2025, 1, 2), time=time(10, 0),
+        duration=timedelta(hours=1), created_by=user, recurrence='weekly',
+    )
+    assert get_month_data(user, 2025, 9)['meetings_count'][date(2025, 9, 4)] == 1
+    meeting.recurrence_exceptions = ['2025-09-04']
+    meeting.save()
+    assert date(2025, 9, 4) not in get_month_data(user, 2025, 9)['meetings_count']
+
+
+def test_daily_items_invalidated_during_computation_are_not_cached(user, team_member, monkeypatch):
+    """
+    Если инвалидация пришла, пока считались задачи дня, результат не возвращается в кэш:
+    следующий запрос видит свежие данные.
+    """
+    tz = timezone.get_current_timezone()
+    day = date(2025, 6, 12)
+
+    def racing_daily_items(user, day):
+        items = get_daily_items(user, day)
+        Task.objects.create(
+            title='Late', description='', team=team_member.team,
+            deadline=timezone.make_aware(datetime(2025, 6, 12, 15), tz),
+        )
+        return items
+
+    monkeypatch.setattr('dashboard.cache.get_daily_items', racing_daily_items)
+    tasks, _ = get_cached_daily_items(user, day)
+    assert tasks == []
+
+    monkeypatch.setattr('dashboard.cache.get_daily_items', get_daily_items)
+    tasks, _ = get_cached_daily_items(user, day)
+    assert [task.title for task in tasks] == ['Late']
+    assert get_month_data(user, 2025, 6)['tasks_count'] == {day: 1}
@@ -4,6 +4,8 @@ import pytest
 from django.utils import timezone
 
 from meetings.forms import MeetingForm
+from meetings.models import Meeting
+from meetings.views import _find_conflicting_user_ids
 
 
 @pytest.fixture
@@ -72,3 +74,56 @@ def test_meeting_cannot_start_in_past_today(user):
     assert not form.is_valid()
     assert '__all__' in form.errors
     assert any("Нельзя создать встречу в прошедшем времени" in str(e) for e in form.errors['__all__'])
+
+
+def test_form_reports_all_conflicting_participants(valid_form_data, user, user_factory):
+    """
+    Форма сообщает обо всех участниках с конфликтами сразу, а не только о первом.
+    """
+    busy_participant, busy_organizer, free_user = user_factory(), user_factory(), user_factory()
+    existing = Meeting.objects.create(
+        title='Existing',
+        date=valid_form_data['date'],
+        time=time(9, 30),
+        duration=timedelta(hours=1),
+        created_by=busy_organizer,
+    )
+    existing.participants.add(busy_participant)
+
+    valid_form_data['participants'] = [busy_participant.id, busy_organizer.id, free_user.id]
+    form = MeetingForm(data=valid_form_data, user=user)
+    assert not form.is_valid()
+    errors = form.errors['__all__']
+    assert len(errors) == 2
+    assert any(busy_participant.username in str(e) for e in errors)
+    assert any(busy_organizer.username in str(e) for e in errors)
+    assert not any(free_user.username in str(e) for e in errors)
+
+
+def test_conflict_check_is_batched(valid_form_data, user, user_factory, django_assert_max_num_queries):
+    """
+    Проверка конфликтов не зависит от числа участников: один запрос на весь набор.
+    """
+    participant_ids = [user_factory().id for _ in range(20)]
+    with django_assert_max_num_queries(1):
+        _find_conflicting_user_ids(participant_ids, valid_form_data['date'], time(10, 0), timedelta(hours=1))
+
+
+def test_meeting_form_rejects_series_clashing_on_later_occurrence(valid_form_data, user, user_factory):
+    """
+    Еженедельная серия, свободная в первую неделю, но пересекающаяся со встречей участника
+    на второй неделе, не проходит проверку.
+    """
+    busy = user_factory()
+    clash = Meeting.objects.create(
+        title='Clash', date=valid_form_data['date'] + timedelta(weeks=1), time=time(10, 0),
+        duration=timedelta(hours=1), created_by=user_factory(),
+    )
+    clash.participants.add(busy)
+    data = {**valid_form_data, 'participants': [busy.id], 'recurrence': 'weekly', 'recurrence_interval': 1}
+    form = MeetingForm(data=data, user=user)
+    assert not form.is_valid()
+    assert busy.username in str(form.errors['__all__'])
+
+    form = MeetingForm(data={**data, 'recurrence': ''}, user=user)
+    assert form.is_valid(), form.errors
@@ -0,0 +1,128 @@
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from meetings.ics import _fold, _format_duration
+from meetings.models import Meeting
+from tasks.models import Task
+
+
+@pytest.fixture
+def feed_url(user):
+    return reverse('meetings_ics_feed', args=[user.get_calendar_token()])
+
+
+@pytest.fixture
+def feed_data(user, user_factory, team):
+    """Встреча с участником, еженедельная серия и задача пользователя"""
+    meeting = Meeting.objects.create(
+        title='Планирование, этап 1', date=date(2025, 6, 10), time=time(9, 0),
+        duration=timedelta(hours=1, minutes=30), created_by=user,
+    )
+    meeting.participants.add(user_factory(email='guest@example.com'))
+    Meeting.objects.create(
+        title='Weekly', date=date(2025, 6, 2), time=time(10, 0),
+        duration=timedelta(minutes=30), created_by=user_factory(),
+        recurrence='weekly', recurrence_count=5, recurrence_exceptions=['2025-06-09'],
+    ).participants.add(user)
+    Task.objects.create(
+        title='Report', description='', team=team, assignee=user,
+        deadline=timezone.make_aware(datetime(2025, 6, 20, 18), timezone.get_current_timezone()),
+    )
+
+
+def read_feed(response):
+    return b''.join(response.streaming_content).decode()
+
+
+def test_fold_respects_octet_limit():
+    """
+    Длинные строки переносятся по 75 октетов без разрыва многобайтных символов.
+    """
+    folded = _fold('SUMMARY:' + 'я' * 100)
+    lines = folded.split('\r\n')[:-1]
+    assert all(len(line.encode()) <= 75 for line in lines)
+    assert ''.join(line[1:] if index else line for index, line in enumerate(lines)) == 'SUMMARY:' + 'я' * 100
+
+
+def test_format_duration():
+    """Длительность записывается в формате ISO 8601"""
+    assert _format_duration(timedelta(hours=1, minutes=30)) == 'PT1H30M'
+    assert _format_duration(timedelta(days=1)) == 'P1D'
+    assert _format_duration(timedelta(0)) == 'PT0S'
+
+
+def test_feed_unknown_token(client, db):
+    """Неизвестный токен даёт 404"""
+    assert client.get(reverse('meetings_ics_feed', args=['missing'])).status_code == 404
+
+
+def test_feed_streams_events(client, feed_url, feed_data):
+    """
+    Лента отдаётся потоком и содержит встречи, серии с RRULE и дедлайны задач.
+    """
+    response = client.get(feed_url)
+    assert response.status_code == 200
+    assert response.streaming
+    assert response['Content-Type'].startswith('text/calendar')
+    body = read_feed(response)
+
+    assert body.startswith('BEGIN:VCALENDAR\r\n')
+    assert body.endswith('END:VCALENDAR\r\n')
+    assert body.count('BEGIN:VEVENT') == 3
+    assert 'SUMMARY:Планирование\\, этап 1' in body
+    assert 'DTSTART:20250610T090000Z' in body
+    assert 'DURATION:PT1H30M' in body
+    assert 'ATTENDEE;CN=' in body and 'mailto:guest@example.com' in body
+    assert 'RRULE:FREQ=WEEKLY;INTERVAL=1;COUNT=5' in body
+    assert 'EXDATE:20250609T100000Z' in body
+    assert 'DTSTART:20250620T180000Z' in body
+
+
+def test_feed_conditional_requests(client, user, feed_url, feed_data, django_assert_max_num_queries):
+    """
+    Совпадающий ETag даёт 304 без выборки событий, изменение — новый ETag.
+    """
+    response = client.get(feed_url)
+    read_feed(response)
+    etag = response['ETag']
+    assert not response.has_header('Last-Modified')
+
+    with django_assert_max_num_queries(4):
+        response = client.get(feed_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    Meeting.objects.filter(created_by=user).first().participants.add(user)
+    response = client.get(feed_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+
+
+def test_feed_deletion_is_not_hidden_by_if_modified_since(client, user, feed_url, feed_data):
+    """
+    Удаление встречи меняет ETag; If-Modified-Since без ETag не даёт ложного 304.
+    """
+    response = client.get(feed_url)
+    read_feed(response)
+    etag = response['ETag']
+
+    Meeting.objects.filter(created_by=user).first().delete()
+    response = client.get(feed_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    read_feed(response)
+    response = client.get(feed_url, HTTP_IF_MODIFIED_SINCE='Sat, 01 Jan 2999 00:00:00 GMT')
+    assert response.status_code == 200
+    read_feed(response)
+
+
+def test_reset_calendar_token(authenticated_client, user, feed_url):
+    """
+    Перевыпуск ссылки отключает старую.
+    """
+    response = authenticated_client.post(reverse('profile'), {'reset_calendar_token': '1'})
+    assert response.status_code == 302
+    user.refresh_from_db()
+    assert authenticated_client.get(feed_url).status_code == 404
+    assert reverse('meetings_ics_feed', args=[user.calendar_token]) != feed_url
@@ -0,0 +1,90 @@
+from datetime import date, time, timedelta
+
+from conftest import aware
+from meetings.models import Meeting, expand_occurrences
+
+
+def create_series(user, **kwargs):
+    defaults = {
+        'title': 'Standup',
+        'date': date(2025, 1, 6),
+        'time': time(10, 0),
+        'duration': timedelta(minutes=30),
+        'created_by': user,
+    }
+    defaults.update(kwargs)
+    return Meeting.objects.create(**defaults)
+
+
+def occurrence_dates(meeting, start, end):
+    return [occurrence.date for occurrence in meeting.iter_occurrences(aware(start), aware(end))]
+
+
+def test_daily_series_expands_only_inside_window(user):
+    """
+    Бесконечная серия разворачивается только в пределах окна, с учётом интервала.
+    """
+    meeting = create_series(user, recurrence='daily', recurrence_interval=2)
+    assert meeting.series_ends_at is None
+    assert occurrence_dates(meeting, date(2025, 3, 1), date(2025, 3, 6)) == [
+        date(2025, 3, 1), date(2025, 3, 3), date(2025, 3, 5),
+    ]
+    occurrence = next(meeting.iter_occurrences(aware(date(2025, 3, 1)), aware(date(2025, 3, 2))))
+    assert occurrence.id == meeting.id
+    assert occurrence.starts_at == aware(date(2025, 3, 1), 10)
+    assert meeting.date == date(2025, 1, 6)
+
+
+def test_weekly_series_respects_count_and_exceptions(user):
+    """
+    recurrence_count ограничивает серию, исключённые даты пропускаются.
+    """
+    meeting = create_series(
+        user, recurrence='weekly', recurrence_count=4,
+        recurrence_exceptions=[date(2025, 1, 13)],
+    )
+    assert meeting.recurrence_exceptions == ['2025-01-13']
+    assert meeting.series_ends_at == aware(date(2025, 1, 27), 10, 30)
+    assert occurrence_dates(meeting, date(2025, 1, 1), date(2025, 3, 1)) == [
+        date(2025, 1, 6), date(2025, 1, 20), date(2025, 1, 27),
+    ]
+
+
+def test_monthly_series_skips_short_months(user):
+    """
+    Ежемесячная серия 31-го числа пропускает месяцы без этого дня и останавливается на until.
+    """
+    meeting = create_series(
+        user, date=date(2025, 1, 31), recurrence='monthly', recurrence_until=date(2025, 6, 15),
+    )
+    assert occurrence_dates(meeting, date(2025, 1, 1), date(2026, 1, 1)) == [
+        date(2025, 1, 31), date(2025, 3, 31), date(2025, 5, 31),
+    ]
+    assert meeting.series_ends_at == aware(date(2025, 5, 31), 10, 30)
+
+
+def test_overlapping_uses_series_bounds(user):
+    """
+    overlapping() отбирает серии по series_ends_at, а не по первой встрече.
+    """
+    finished = create_series(user, recurrence='daily', recurrence_count=3)
+    endless = create_series(user, recurrence='weekly')
+    single = create_series(user, recurrence='')
+    window = (aware(date(2025, 2, 1)), aware(date(2025, 2, 8)))
+
+    assert set(Meeting.objects.overlapping(*window)) == {endless}
+    occurrences = expand_occurrences(Meeting.objects.all(), *window)
+    assert [occurrence.date for occurrence in occurrences] == [date(2025, 2, 3)]
+    assert finished.series_ends_at < window[0]
+    assert single not in Meeting.objects.overlapping(*window)
+
+
+def test_save_with_update_fields_refreshes_series_end(user):
+    """
+    Изменение правил повторения через update_fields пересчитывает series_ends_at.
+    """
+    meeting = create_series(user, recurrence='daily')
+    meeting.recurrence_count = 2
+    meeting.save(update_fields=['recurrence_count'])
+    meeting.refresh_from_db()
+    assert meeting.series_ends_at == aware(date(2025, 1, 7), 10, 30)
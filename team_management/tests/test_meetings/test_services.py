@@ -0,0 +1,99 @@
+from datetime import time, timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from conftest import aware
+from meetings.models import Meeting
+from meetings.services import find_free_slots, merge_intervals
+
+
+@pytest.fixture
+def future_day():
+    """День через неделю, чтобы текущее время не отсекало слоты"""
+    return timezone.now().date() + timedelta(days=7)
+
+
+def test_merge_intervals():
+    """
+    Пересекающиеся и смежные интервалы сливаются, вложенные поглощаются.
+    """
+    intervals = [(1, 3), (2, 5), (5, 6), (7, 9), (7, 8)]
+    assert merge_intervals(intervals) == [(1, 6), (7, 9)]
+
+
+def test_find_free_slots_skips_busy_time(user, user_factory, future_day):
+    """
+    Слоты не пересекаются со встречами ни одного из участников.
+    """
+    other = user_factory()
+    Meeting.objects.create(
+        title='Morning', date=future_day, time=time(9, 0),
+        duration=timedelta(hours=1, minutes=10), created_by=user,
+    )
+    meeting = Meeting.objects.create(
+        title='Late morning', date=future_day, time=time(10, 30),
+        duration=timedelta(hours=1), created_by=user_factory(),
+    )
+    meeting.participants.add(other)
+
+    slots = find_free_slots([user.id, other.id], future_day, future_day, timedelta(minutes=30), limit=3)
+    assert slots == [
+        (aware(future_day, 11, 30), aware(future_day, 12, 0)),
+        (aware(future_day, 12, 0), aware(future_day, 12, 30)),
+        (aware(future_day, 12, 30), aware(future_day, 13, 0)),
+    ]
+
+
+def test_find_free_slots_moves_to_next_day(user, future_day):
+    """
+    Если день занят целиком, слоты ищутся в следующих днях диапазона.
+    """
+    Meeting.objects.create(
+        title='All day', date=future_day, time=time(8, 0),
+        duration=timedelta(hours=11), created_by=user,
+    )
+    next_day = future_day + timedelta(days=1)
+    slots = find_free_slots([user.id], future_day, next_day, timedelta(hours=1), limit=1)
+    assert slots == [(aware(next_day, 9), aware(next_day, 10))]
+
+
+def test_find_free_slots_single_query(user, user_factory, future_day, django_assert_num_queries):
+    """
+    Занятость всех участников загружается одним запросом.
+    """
+    user_ids = [user.id] + [user_factory().id for _ in range(10)]
+    with django_assert_num_queries(1):
+        find_free_slots(user_ids, future_day, future_day + timedelta(days=5), timedelta(minutes=45))
+
+
+def test_free_slots_view(authenticated_client, user_factory, future_day):
+    """
+    Представление отдаёт слоты в JSON и валидирует параметры.
+    """
+    other = user_factory()
+    url = reverse('free_slots')
+    response = authenticated_client.get(url, {
+        'users': [other.id], 'start': future_day, 'end': future_day, 'duration': 60, 'limit': 2,
+    })
+    assert response.status_code == 200
+    assert response.json()['slots'][0]['start'] == aware(future_day, 9).isoformat()
+    assert len(response.json()['slots']) == 2
+
+    response = authenticated_client.get(url, {
+        'users': [other.id], 'start': future_day, 'end': future_day - timedelta(days=1), 'duration': 60,
+    })
+    assert response.status_code == 400
+
+
+def test_find_free_slots_respects_recurring_meetings(user, future_day):
+    """
+    Повторения серии, начатой раньше окна поиска, считаются занятостью.
+    """
+    Meeting.objects.create(
+        title='Daily', date=future_day - timedelta(days=5), time=time(9, 0),
+        duration=timedelta(hours=2), created_by=user, recurrence='daily',
+    )
+    slots = find_free_slots([user.id], future_day, future_day, timedelta(hours=1), limit=1)
+    assert slots == [(aware(future_day, 11), aware(future_day, 12))]
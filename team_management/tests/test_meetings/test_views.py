@@ -1,9 +1,12 @@
 import pytest
+from django.db.models.signals import m2m_changed
 from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta, time
 
 from meetings.models import Meeting
+from meetings.signals import participants_changed
+from meetings.views import _check_time_conflict
 
 
 @pytest.fixture
@@ -193,4 +196,314 @@ def test_meeting_cancel_participation(authenticated_client, meeting_with_partici
     data = {'cancel_participation': 'on'}
     response = authenticated_client.post(url, data)
     assert response.status_code == 302
-    assert user not in meeting.participants.all()
\ No newline at end of file
+    assert user not in meeting.participants.all()
+
+# ----------------------------
+# Тесты для _check_time_conflict
+# ----------------------------
+
+def test_meeting_save_computes_interval(meeting):
+    """
+    При сохранении встречи вычисляются starts_at/ends_at.
+    """
+    assert meeting.starts_at.date() == meeting.date
+    assert meeting.starts_at.time() == meeting.time
+    assert meeting.ends_at - meeting.starts_at == meeting.duration
+
+
+def test_check_time_conflict_overlap(user, meeting):
+    """
+    Пересекающаяся встреча даёт конфликт, соседняя встык — нет.
+    """
+    assert _check_time_conflict(user, meeting.date, time(14, 30), timedelta(hours=1))
+    assert _check_time_conflict(user, meeting.date, time(13, 30), timedelta(hours=1))
+    assert not _check_time_conflict(user, meeting.date, time(15, 0), timedelta(hours=1))
+    assert not _check_time_conflict(user, meeting.date, time(13, 0), timedelta(hours=1))
+
+
+def test_check_time_conflict_excludes_edited_meeting(user, meeting):
+    """
+    Редактируемая встреча не конфликтует сама с собой.
+    """
+    assert not _check_time_conflict(user, meeting.date, meeting.time, meeting.duration, meeting.id)
+
+
+def test_check_time_conflict_across_midnight(user, user_factory):
+    """
+    Встреча, переходящая через полночь, конфликтует со встречей следующего дня.
+    """
+    participant = user_factory()
+    late = Meeting.objects.create(
+        title="Late",
+        date=timezone.now().date() + timedelta(days=3),
+        time=time(23, 30),
+        duration=timedelta(hours=1),
+        created_by=user,
+    )
+    late.participants.add(participant)
+    next_day = late.date + timedelta(days=1)
+    assert _check_time_conflict(participant, next_day, time(0, 15), timedelta(minutes=30))
+    assert not _check_time_conflict(participant, next_day, time(0, 30), timedelta(minutes=30))
+
+
+def test_check_time_conflict_single_query(user, meeting, django_assert_num_queries):
+    """
+    Проверка конфликта выполняется одним запросом.
+    """
+    with django_assert_num_queries(1):
+        _check_time_conflict(user, meeting.date, meeting.time, meeting.duration)
+
+
+def test_check_time_conflict_with_recurring_series(user):
+    """
+    Повторение серии, начатой раньше, конфликтует с новой встречей.
+    """
+    start = timezone.now().date() + timedelta(days=1)
+    Meeting.objects.create(
+        title="Weekly sync",
+        date=start,
+        time=time(9, 0),
+        duration=timedelta(hours=1),
+        created_by=user,
+        recurrence='weekly',
+    )
+    assert _check_time_conflict(user, start + timedelta(weeks=5), time(9, 30), timedelta(minutes=30))
+    assert not _check_time_conflict(user, start + timedelta(weeks=5, days=1), time(9, 30), timedelta(minutes=30))
+
+
+def test_my_meetings_view_expands_recurring_meetings(authenticated_client, user):
+    """
+    Список встреч показывает повторения серии в окне дат.
+    """
+    start = timezone.localdate()
+    Meeting.objects.create(
+        title="Daily",
+        date=start - timedelta(days=10),
+        time=time(9, 0),
+        duration=timedelta(minutes=15),
+        created_by=user,
+        recurrence='daily',
+        recurrence_count=15,
+    )
+    response = authenticated_client.get(reverse('my_meetings'), {'start': start.isoformat()})
+    dates = [meeting.date for meeting in response.context['my_meetings']]
+    assert dates == [start + timedelta(days=offset) for offset in range(5)]
+
+
+def test_meeting_skip_occurrence(authenticated_client, user):
+    """
+    Организатор может отменить одно повторение серии.
+    """
+    meeting = Meeting.objects.create(
+        title="Daily",
+        date=timezone.now().date() + timedelta(days=1),
+        time=time(9, 0),
+        duration=timedelta(minutes=15),
+        created_by=user,
+        recurrence='daily',
+    )
+    skipped = meeting.date + timedelta(days=2)
+    url = reverse('meeting_detail', args=[meeting.id])
+    response = authenticated_client.post(url, {'skip_occurrence': '1', 'occurrence_date': skipped.isoformat()})
+    assert response.status_code == 302
+    meeting.refresh_from_db()
+    assert meeting.recurrence_exceptions == [skipped.isoformat()]
+
+
+# ----------------------------
+# Тесты редактирования участников
+# ----------------------------
+
+def edit_meeting_data(meeting, participant_ids):
+    return {
+        'title': meeting.title,
+        'description': meeting.description,
+        'date': meeting.date.isoformat(),
+        'time': meeting.time.strftime('%H:%M'),
+        'duration': '01:00:00',
+        'participants': participant_ids,
+    }
+
+
+def test_meeting_edit_updates_participants_by_diff(authenticated_client, meeting, user_factory,
+                                                 django_capture_on_commit_callbacks):
+    """
+    Редактирование удаляет только выбывших участников и добавляет только новых;
+    m2m_changed не срабатывает, participants_changed отправляется один раз с разностью после коммита.
+    """
+    kept, removed, added = user_factory(), user_factory(), user_factory()
+    meeting.participants.add(kept, removed)
+    through = Meeting.participants.through
+    kept_row = through.objects.get(meeting=meeting, user=kept).id
+
+    events, changes = [], []
+
+    def record(sender, action, pk_set, **kwargs):
+        events.append(action)
+
+    def record_change(sender, meeting, added, removed, **kwargs):
+        changes.append((meeting.id, added, removed))
+
+    m2m_changed.connect(record, sender=through)
+    participants_changed.connect(record_change, sender=Meeting)
+    try:
+        with django_capture_on_commit_callbacks(execute=True):
+            response = authenticated_client.post(
+                reverse('meeting_detail', args=[meeting.id]), edit_meeting_data(meeting, [kept.id, added.id])
+            )
+    finally:
+        m2m_changed.disconnect(record, sender=through)
+        participants_changed.disconnect(record_change, sender=Meeting)
+
+    assert response.status_code == 302
+    assert set(meeting.participants.values_list('id', flat=True)) == {kept.id, added.id}
+    assert through.objects.get(meeting=meeting, user=kept).id == kept_row
+    assert events == []
+    assert changes == [(meeting.id, {added.id}, {removed.id})]
+
+
+def test_meeting_edit_participants_query_count(authenticated_client, meeting, user_factory,
+                                               django_assert_max_num_queries):
+    """
+    Число запросов при редактировании не зависит от числа участников.
+    """
+    meeting.participants.add(*[user_factory() for _ in range(5)])
+    new_ids = [user_factory().id for _ in range(20)]
+    with django_assert_max_num_queries(25):
+        authenticated_client.post(
+            reverse('meeting_detail', args=[meeting.id]), edit_meeting_data(meeting, new_ids)
+        )
+    assert set(meeting.participants.values_list('id', flat=True)) == set(new_ids)
+
+
+def test_meeting_edit_unknown_participant_rolls_back(authenticated_client, meeting, user_factory):
+    """
+    Неизвестный id участника даёт 404, изменения встречи откатываются.
+    """
+    participant = user_factory()
+    meeting.participants.add(participant)
+    data = edit_meeting_data(meeting, [participant.id, 999999])
+    data['title'] = 'Changed'
+    response = authenticated_client.post(reverse('meeting_detail', args=[meeting.id]), data)
+    assert response.status_code == 404
+    meeting.refresh_from_db()
+    assert meeting.title == 'Test Meeting'
+    assert list(meeting.participants.all()) == [participant]
+
+
+# ----------------------------
+# Тесты для participant_search_view
+# ----------------------------
+
+@pytest.fixture
+def teammates(user, team, team_member, user_factory):
+    """
+    Два участника команды пользователя и один посторонний пользователь.
+    """
+    mates = [user_factory(username=name) for name in ('alice', 'bob')]
+    for mate in mates:
+        team.members.create(user=mate)
+    user_factory(username='alex_outsider')
+    return mates
+
+
+def test_participant_search_team_scope(authenticated_client, teammates):
+    """
+    По умолчанию ищутся только участники команд организатора, сам организатор исключён.
+    """
+    url = reverse('meeting_participants')
+    data = authenticated_client.get(url).json()
+    assert [item['text'] for item in data['results']] == ['alice', 'bob']
+    assert data['pagination'] == {'more': False}
+
+    assert [item['text'] for item in authenticated_client.get(url, {'q': 'al'}).json()['results']] == ['alice']
+    data = authenticated_client.get(url, {'q': 'al', 'scope': 'all'}).json()
+    assert [item['text'] for item in data['results']] == ['alex_outsider', 'alice']
+    assert authenticated_client.get(url, {'scope': 'all'}).json()['results'] == []
+    assert authenticated_client.get(url, {'page': 0}).status_code == 400
+
+
+def test_participant_search_pages(authenticated_client, team, team_member, user_factory, monkeypatch):
+    monkeypatch.setattr('meetings.views.PARTICIPANT_PAGE_SIZE', 2)
+    for name in ('u1', 'u2', 'u3'):
+        team.members.create(user=user_factory(username=name))
+    url = reverse('meeting_participants')
+    first = authenticated_client.get(url, {'q': 'u'}).json()
+    second = authenticated_client.get(url, {'q': 'u', 'page': 2}).json()
+    assert [item['text'] for item in first['results']] == ['u1', 'u2']
+    assert first['pagination'] == {'more': True}
+    assert [item['text'] for item in second['results']] == ['u3']
+    assert second['pagination'] == {'more': False}
+
+
+def test_participant_search_marks_busy(authenticated_client, teammates, django_assert_max_num_queries):
+    """
+    Кандидаты, занятые в предлагаемом слоте, помечены busy; занятость считается
+    одним запросом на всю страницу. Слот редактируемой встречи занятостью не считается.
+    """
+    alice, bob = teammates
+    day = timezone.now().date() + timedelta(days=3)
+    busy = Meeting.objects.create(
+        title="Busy", date=day, time=time(10, 0), duration=timedelta(hours=1), created_by=bob
+    )
+    busy.participants.add(alice)
+    params = {'date': day.isoformat(), 'time': '10:30', 'duration': '01:00:00'}
+    url = reverse('meeting_participants')
+
+    # Сессия, пользователь, команды + кандидаты, один запрос занятости.
+    with django_assert_max_num_queries(4):
+        data = authenticated_client.get(url, params).json()
+    assert {item['text']: item['busy'] for item in data['results']} == {'alice': True, 'bob': True}
+
+    data = authenticated_client.get(url, {**params, 'meeting': busy.id}).json()
+    assert {item['text']: item['busy'] for item in data['results']} == {'alice': False, 'bob': False}
+    data = authenticated_client.get(url, {**params, 'time': '12:00'}).json()
+    assert not any(item['busy'] for item in data['results'])
+
+
+def test_create_meeting_page_does_not_list_all_users(authenticated_client, user_factory):
+    other = user_factory()
+    response = authenticated_client.get(reverse('create_meeting'))
+    assert f'value="{other.id}"' not in response.content.decode()
+    assert reverse('meeting_participants') in response.content.decode()
+
+
+def test_meeting_detail_preselects_participants(authenticated_client, meeting_with_participant, user_factory):
+    outsider = user_factory()
+    response = authenticated_client.get(reverse('meeting_detail', args=[meeting_with_participant.id]))
+    content = response.content.decode()
+    for participant in meeting_with_participant.participants.all():
+        assert f'<option value="{participant.id}" selected>' in content
+    assert f'value="{outsider.id}"' not in content
+
+
+def test_check_time_conflict_on_later_occurrence_of_new_series(user):
+    """
+    Новая еженедельная серия конфликтует со встречей на её третьей неделе,
+    хотя первое повторение свободно; после окончания серии конфликта нет.
+    """
+    start = timezone.now().date() + timedelta(days=1)
+    Meeting.objects.create(
+        title="Offsite", date=start + timedelta(weeks=2), time=time(10, 30),
+        duration=timedelta(hours=1), created_by=user,
+    )
+    weekly = Meeting(recurrence='weekly', recurrence_interval=1)
+    assert not _check_time_conflict(user, start, time(10, 0), timedelta(hours=1))
+    assert _check_time_conflict(user, start, time(10, 0), timedelta(hours=1), schedule=weekly)
+    short = Meeting(recurrence='weekly', recurrence_interval=1, recurrence_count=2)
+    assert not _check_time_conflict(user, start, time(10, 0), timedelta(hours=1), schedule=short)
+
+
+def test_check_time_conflict_between_series(user):
+    """
+    Новая серия конфликтует с существующей серией, если их повторения совпадают не в первую неделю.
+    """
+    start = timezone.now().date() + timedelta(days=1)
+    Meeting.objects.create(
+        title="Biweekly", date=start + timedelta(weeks=1), time=time(9, 0),
+        duration=timedelta(hours=1), created_by=user, recurrence='weekly', recurrence_interval=2,
+    )
+    weekly = Meeting(recurrence='weekly', recurrence_interval=1)
+    assert _check_time_conflict(user, start, time(9, 30), timedelta(hours=1), schedule=weekly)
+    every_other = Meeting(recurrence='weekly', recurrence_interval=2)
+    assert not _check_time_conflict(user, start, time(9, 30), timedelta(hours=1), schedule=every_other)
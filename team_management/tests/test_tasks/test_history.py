@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.history import TaskHistory
+from tasks.models import Task, TaskChange
+
+
+@pytest.fixture
+def task(user, team):
+    return Task.objects.create(
+        title='Task', description='', status='open', team=team, assignee=user,
+        deadline=timezone.make_aware(datetime(2025, 6, 10, 12)),
+    )
+
+
+def changes(task):
+    return list(TaskChange.objects.filter(task=task).order_by('id').values_list('field', 'old_value', 'new_value'))
+
+
+def test_status_update_recorded_after_commit(authenticated_client, user, task, django_capture_on_commit_callbacks):
+    """
+    Смена статуса исполнителем пишется в журнал с автором после коммита.
+    """
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        authenticated_client.post(reverse('task_detail', args=[task.id]), {'status': 'in_progress'})
+    assert len(callbacks) == 1
+    assert changes(task) == [('status', 'open', 'in_progress')]
+    assert TaskChange.objects.get().actor == user
+
+
+def test_task_edit_records_only_diffs(admin_client, admin_user, user_factory, team, task,
+                                      django_capture_on_commit_callbacks):
+    """
+    Редактирование записывает только изменившиеся отслеживаемые поля.
+    """
+    other = user_factory()
+    team.members.create(user=other)
+    with django_capture_on_commit_callbacks(execute=True):
+        admin_client.post(reverse('task_detail', args=[task.id]), {
+            'edit_task': '', 'title': 'Renamed', 'deadline': '2025-06-10T12:00', 'assignee': other.id,
+        })
+    assert changes(task) == [('assignee', str(task.assignee_id), str(other.id))]
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        admin_client.post(reverse('task_detail', args=[task.id]), {
+            'edit_task': '', 'title': 'Renamed', 'deadline': '2025-06-11T09:30', 'assignee': other.id,
+        })
+    assert changes(task)[-1] == ('deadline', '2025-06-10T12:00:00+00:00', '2025-06-11T09:30:00+00:00')
+    assert len(callbacks) == 1
+
+
+def test_history_discarded_on_error(user, task, django_capture_on_commit_callbacks):
+    """Исключение внутри блока отменяет запись журнала"""
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with pytest.raises(ValueError):
+            with transaction.atomic(), TaskHistory(user) as history:
+                history.watch(task)
+                task.status = 'done'
+                task.save()
+                raise ValueError
+    assert callbacks == []
+    assert not TaskChange.objects.exists()
+
+
+def test_api_update_and_bulk_recorded(admin_client, admin_user, user, team, task,
+                                      django_capture_on_commit_callbacks, django_assert_num_queries):
+    """
+    Изменения через API и массовое изменение пишутся одним bulk_create на запрос.
+    """
+    with django_capture_on_commit_callbacks(execute=True):
+        admin_client.patch(
+            reverse('task-detail', args=[task.id]), {'status': 'done'}, content_type='application/json'
+        )
+    assert changes(task) == [('status', 'open', 'done')]
+
+    second = Task.objects.create(title='Second', description='', team=team, deadline=timezone.now())
+    with django_capture_on_commit_callbacks() as callbacks:
+        admin_client.post(
+            reverse('task-bulk'), {'ids': [task.id, second.id], 'status': 'in_progress', 'assignee': None},
+            content_type='application/json',
+        )
+    with django_assert_num_queries(1):
+        callbacks[0]()
+    assert changes(task)[1:] == [('status', 'done', 'in_progress'), ('assignee', str(user.id), None)]
+    assert changes(second) == [('status', 'open', 'in_progress')]
+
+
+def test_history_api_cursor(authenticated_client, user, task):
+    """Журнал задачи отдаётся от новых записей к старым по курсору"""
+    TaskChange.objects.bulk_create([
+        TaskChange(task=task, actor=user, field='status', old_value=str(index), new_value=str(index + 1),
+                   changed_at=timezone.now() + timedelta(minutes=index))
+        for index in range(5)
+    ])
+    url = reverse('task-history', args=[task.id])
+    data = authenticated_client.get(url, {'page_size': 2}).json()
+    values = [change['new_value'] for change in data['results']]
+    while data['next']:
+        data = authenticated_client.get(data['next']).json()
+        values += [change['new_value'] for change in data['results']]
+    assert values == ['5', '4', '3', '2', '1']
@@ -0,0 +1,84 @@
+import io
+import json
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+
+from tasks.importer import import_tasks
+from tasks.models import Task
+
+
+@pytest.fixture
+def import_csv(user, team, team_member):
+    return (
+        'title,description,deadline,status,team,assignee\n'
+        f'First,Desc,2025-06-10T12:00,open,{team.id},testuser\n'
+        f'Second,Desc,2025-06-11 09:30,,{team.name},\n'
+        f'Broken,Desc,not-a-date,open,{team.id},\n'
+        'Orphan,Desc,2025-06-12T10:00,open,Missing team,\n'
+        f'Stranger,Desc,2025-06-12T10:00,open,{team.id},nobody\n'
+    )
+
+
+def test_import_tasks_reports_row_errors(user, team, import_csv):
+    """
+    Корректные строки создаются, ошибочные пропускаются с номером строки.
+    """
+    errors = []
+    result = import_tasks(io.StringIO(import_csv), 'csv', batch_size=2,
+                          on_error=lambda line, row_errors: errors.append((line, set(row_errors))))
+
+    assert result == {'created': 2, 'failed': 3}
+    assert errors == [(4, {'deadline'}), (5, {'team'}), (6, {'assignee'})]
+    first = Task.objects.get(title='First')
+    assert first.assignee == user and first.team == team
+    assert Task.objects.get(title='Second').status == 'open'
+
+
+def test_import_tasks_queries_do_not_grow_with_rows(team, django_assert_max_num_queries):
+    """
+    Словари команд и пользователей строятся один раз, запись и индексация — фиксированное число запросов на пачку.
+    """
+    lines = ''.join(
+        json.dumps({'title': f'Task {n}', 'description': 'D', 'deadline': '2025-06-10T12:00', 'team': team.id}) + '\n'
+        for n in range(50)
+    )
+    with django_assert_max_num_queries(3 + 2 * 7):
+        result = import_tasks(io.StringIO(lines + 'not json\n'), 'ndjson', batch_size=25)
+    assert result == {'created': 50, 'failed': 1}
+
+
+def test_import_tasks_command(tmp_path, team, import_csv, capsys):
+    """
+    Команда определяет формат по расширению и печатает ошибки в stderr.
+    """
+    path = tmp_path / 'tasks.csv'
+    path.write_text(import_csv, encoding='utf-8')
+    call_command('import_tasks', str(path), '--batch-size', '10')
+    captured = capsys.readouterr()
+    assert 'Создано задач: 2' in captured.out
+    assert 'Строка 4: deadline' in captured.err
+
+
+def test_import_tasks_api_requires_staff(authenticated_client, import_csv):
+    """Импорт через API доступен только администратору"""
+    upload = SimpleUploadedFile('tasks.csv', import_csv.encode('utf-8'))
+    assert authenticated_client.post(reverse('task-import-file'), {'file': upload}).status_code == 403
+
+
+def test_import_tasks_api(admin_client, import_csv):
+    """
+    Импорт через API возвращает число созданных задач и ошибки по строкам.
+    """
+    url = reverse('task-import-file')
+    upload = SimpleUploadedFile('tasks.csv', import_csv.encode('utf-8'))
+    response = admin_client.post(url, {'file': upload})
+    assert response.status_code == 200
+    data = response.json()
+    assert (data['created'], data['failed']) == (2, 3)
+    assert [error['line'] for error in data['errors']] == [4, 5, 6]
+
+    upload = SimpleUploadedFile('tasks.txt', b'')
+    assert admin_client.post(url, {'file': upload}).status_code == 400
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from tasks.models import Task, TaskRating, UserRatingMonth, UserRatingStats
+from tasks.ratings import rating_month, rebuild_rating_stats
+
+
+@pytest.fixture
+def make_rating(user, team, admin_user):
+    def make(score, assignee=user):
+        task = Task.objects.create(
+            title='Done', description='', status='done', team=team, assignee=assignee, deadline=timezone.now()
+        )
+        return TaskRating.objects.create(task=task, score=score, rated_by=admin_user)
+    return make
+
+
+def counters(user):
+    stats = UserRatingStats.objects.get(user=user)
+    month = UserRatingMonth.objects.get(user=user, month=rating_month(timezone.now()))
+    return (stats.score_sum, stats.count), (month.score_sum, month.count)
+
+
+def test_counters_follow_rating_changes(user, make_rating):
+    """
+    Создание, изменение и удаление оценки (в том числе каскадом с задачей) меняют счётчики.
+    """
+    first = make_rating(5)
+    second = make_rating(3)
+    assert counters(user) == ((8, 2), (8, 2))
+    assert UserRatingStats.objects.get(user=user).average == 4
+
+    second.score = 1
+    second.save()
+    assert counters(user) == ((6, 2), (6, 2))
+
+    first.delete()
+    assert counters(user) == ((1, 1), (1, 1))
+
+    second.task.delete()
+    assert counters(user) == ((0, 0), (0, 0))
+
+
+def test_rating_counted_for_assignee_at_rating_time(user, user_factory, make_rating):
+    """Смена исполнителя после оценки не переносит её в счётчиках"""
+    rating = make_rating(4)
+    other = user_factory()
+    Task.objects.filter(id=rating.task_id).update(assignee=other)
+    rating.refresh_from_db()
+    rating.comment = 'ok'
+    rating.save()
+    assert counters(user) == ((4, 1), (4, 1))
+    assert not UserRatingStats.objects.filter(user=other).exists()
+
+
+def test_rebuild_rating_stats(user, make_rating):
+    """Пересчёт восстанавливает счётчики, включая месячные корзины"""
+    make_rating(5)
+    old = make_rating(2)
+    TaskRating.objects.filter(id=old.id).update(rated_at=timezone.now() - timedelta(days=62))
+    UserRatingStats.objects.all().delete()
+    UserRatingMonth.objects.all().delete()
+
+    assert rebuild_rating_stats() == 2
+    assert counters(user) == ((7, 2), (5, 1))
+    assert UserRatingMonth.objects.filter(user=user).count() == 2
@@ -0,0 +1,89 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from tasks.models import ReminderScanState, Task, TaskReminder
+from tasks.reminders import find_candidate_ids, scan_deadlines
+
+
+@pytest.fixture
+def now():
+    """Время прохода сканера — чуть позже создания задач в тесте"""
+    return timezone.now().replace(microsecond=0) + timedelta(seconds=1)
+
+
+@pytest.fixture
+def make_task(user, team):
+    def make(deadline, status='open', assignee=user):
+        return Task.objects.create(
+            title='Task', description='', deadline=deadline, status=status, assignee=assignee, team=team
+        )
+    return make
+
+
+def reminders():
+    return set(TaskReminder.objects.values_list('task_id', 'kind'))
+
+
+def test_first_scan_creates_reminders(make_task, now):
+    """
+    Первый проход напоминает о просроченных и близких дедлайнах незавершённых задач с исполнителем.
+    """
+    overdue = make_task(now - timedelta(days=3))
+    upcoming = make_task(now + timedelta(hours=5))
+    make_task(now + timedelta(days=5))
+    make_task(now - timedelta(days=1), status='done')
+    make_task(now - timedelta(days=1), assignee=None)
+
+    result = scan_deadlines(now=now)
+    assert result == {'scanned': 2, 'created': 2}
+    assert reminders() == {(overdue.id, 'overdue'), (upcoming.id, 'upcoming')}
+    assert ReminderScanState.objects.get().scanned_at == now
+
+
+def test_next_scan_uses_high_water_mark(make_task, now, django_assert_num_queries):
+    """
+    Следующий проход смотрит только задачи, пересёкшие порог или изменённые после отметки,
+    и не создаёт дублей.
+    """
+    overdue = make_task(now - timedelta(days=3))
+    upcoming = make_task(now + timedelta(hours=5))
+    scan_deadlines(now=now)
+
+    later = now + timedelta(hours=6)
+    with django_assert_num_queries(2):
+        assert find_candidate_ids(now, later + timedelta(hours=24)) == [upcoming.id]
+    assert scan_deadlines(now=later) == {'scanned': 1, 'created': 1}
+    assert (upcoming.id, 'overdue') in reminders()
+
+    assert scan_deadlines(now=later + timedelta(minutes=1)) == {'scanned': 0, 'created': 0}
+
+    Task.objects.filter(id=overdue.id).update(
+        deadline=later + timedelta(hours=2), updated_at=later + timedelta(minutes=1, seconds=30)
+    )
+    assert scan_deadlines(now=later + timedelta(minutes=2)) == {'scanned': 1, 'created': 1}
+    assert TaskReminder.objects.filter(task=overdue).count() == 2
+
+
+def test_scan_batches_queries(make_task, now, django_assert_num_queries):
+    """
+    Число запросов зависит от числа пачек, а не от числа задач.
+    """
+    for index in range(5):
+        make_task(now - timedelta(hours=index + 1))
+    # Отметка, кандидаты, по три запроса на каждую из трёх пачек, сохранение отметки.
+    with django_assert_num_queries(2 + 3 * 3 + 1):
+        result = scan_deadlines(now=now, batch_size=2)
+    assert result == {'scanned': 5, 'created': 5}
+
+
+def test_scan_deadlines_command(make_task, now):
+    """Команда печатает итог прохода"""
+    make_task(now - timedelta(hours=1))
+    out = StringIO()
+    call_command('scan_deadlines', '--lead-hours', '2', stdout=out)
+    assert 'новых напоминаний: 1' in out.getvalue()
+    assert TaskReminder.objects.count() == 1
@@ -0,0 +1,122 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from conftest import TeamFactory
+from tasks.models import Comment, Task
+from tasks.search import build_match_query, rebuild_index, search_tasks
+
+
+def create_task(team, title, description='', **kwargs):
+    return Task.objects.create(
+        title=title, description=description, team=team,
+        deadline=timezone.now() + timedelta(days=1), **kwargs,
+    )
+
+
+@pytest.fixture
+def searchable(user, team, team_member):
+    """Задачи команды пользователя и задача чужой команды"""
+    return {
+        'title': create_task(team, 'Отчёт по продажам', 'Квартальный'),
+        'description': create_task(team, 'Сводка', 'Подготовить отчёт для клиента'),
+        'other': create_task(TeamFactory(), 'Отчёт чужой команды'),
+    }
+
+
+def test_build_match_query_escapes_syntax():
+    """Пользовательский ввод превращается в префиксные токены без операторов FTS5"""
+    assert build_match_query('отчёт "OR" NEAR(') == '"отчёт"* "OR"* "NEAR"*'
+    assert build_match_query('  ***  ') is None
+
+
+def test_search_ranks_title_first_and_scopes_to_teams(user, searchable):
+    """Совпадение в заголовке выше совпадения в описании, чужие команды не видны"""
+    results, has_next = search_tasks(user, 'отчёт')
+    assert results == [searchable['title'], searchable['description']]
+    assert not has_next
+
+
+def test_search_index_follows_edits_and_comments(user, searchable):
+    """Индекс обновляется при правке задачи, добавлении комментария и удалении"""
+    task = searchable['title']
+    Comment.objects.create(task=task, author=user, text='Нужна диаграмма')
+    assert search_tasks(user, 'диаграмм')[0] == [task]
+
+    task.title = 'Бюджет'
+    task.save()
+    assert search_tasks(user, 'бюджет')[0] == [task]
+    assert task not in search_tasks(user, 'продажам')[0]
+
+    task.delete()
+    assert search_tasks(user, 'диаграмм')[0] == []
+
+
+def test_comment_has_own_index_row(user, searchable):
+    """
+    Запись комментария меняет только его строку; задача с несколькими совпадениями выдаётся один раз.
+    """
+    task = searchable['title']
+    first = Comment.objects.create(task=task, author=user, text='Отчёт готов')
+    with CaptureQueriesContext(connection) as queries:
+        Comment.objects.create(task=task, author=user, text='Отчёт отправлен')
+    writes = [query['sql'] for query in queries if 'tasks_search' in query['sql']]
+    assert writes and all('tasks_task' not in sql for sql in writes)
+    assert search_tasks(user, 'отчёт')[0] == [task, searchable['description']]
+
+    first.delete()
+    assert search_tasks(user, 'готов')[0] == []
+    assert search_tasks(user, 'отправлен')[0] == [task]
+
+
+def test_search_pagination(user, team, team_member):
+    """Результаты разбиваются на страницы"""
+    for n in range(5):
+        create_task(team, f'Задача релиза {n}')
+    first, has_next = search_tasks(user, 'релиза', page=1, page_size=3)
+    second, more = search_tasks(user, 'релиза', page=2, page_size=3)
+    assert len(first) == 3 and has_next
+    assert len(second) == 2 and not more
+    assert not set(first) & set(second)
+
+
+def test_rebuild_search_index(user, searchable, capsys):
+    """Команда пересобирает индекс пачками и убирает строки удалённых записей"""
+    comment = Comment.objects.create(task=searchable['title'], author=user, text='Диаграмма')
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM tasks_search')
+        cursor.execute(
+            "INSERT INTO tasks_search (rowid, title, description, comments, task_id) "
+            "VALUES (%s, 'Отчёт', '', '', %s)",
+            [searchable['other'].id + 1, searchable['title'].id],
+        )
+    assert search_tasks(user, 'диаграмм')[0] == []
+
+    call_command('rebuild_search_index', '--batch-size', '2')
+    assert 'задач: 3' in capsys.readouterr().out
+    assert search_tasks(user, 'отчёт')[0] == [searchable['title'], searchable['description']]
+    assert search_tasks(user, 'диаграмм')[0] == [comment.task]
+
+
+def test_rebuild_keeps_index_searchable(user, searchable):
+    """Пересборка не очищает индекс: между пачками поиск находит все задачи"""
+    found = []
+    rebuild_index(batch_size=1, progress=lambda count: found.append(len(search_tasks(user, 'отчёт')[0])))
+    assert found == [2, 2, 2]
+
+
+def test_search_view_and_api(authenticated_client, searchable):
+    """Страница поиска и API возвращают найденные задачи"""
+    response = authenticated_client.get(reverse('task_search'), {'q': 'отчёт'})
+    assert response.status_code == 200
+    assert response.context['results'] == [searchable['title'], searchable['description']]
+
+    response = authenticated_client.get(reverse('task-search'), {'q': 'сводка'})
+    assert response.status_code == 200
+    assert [task['title'] for task in response.json()['results']] == ['Сводка']
+    assert response.json()['next_page'] is None
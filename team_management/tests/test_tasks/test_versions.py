@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.messages import get_messages
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task, TaskConflict
+
+
+@pytest.fixture
+def task(user, team):
+    return Task.objects.create(
+        title='Task', description='Old', status='open', team=team, assignee=user,
+        deadline=timezone.now() + timedelta(days=3),
+    )
+
+
+def test_save_bumps_version_and_detects_stale_copy(task):
+    """
+    Сохранение увеличивает версию; устаревшая копия не перезаписывает чужие изменения.
+    """
+    stale = Task.objects.get(id=task.id)
+    task.status = 'in_progress'
+    task.save_versioned(['status', 'updated_at'])
+    assert task.version == 2
+
+    stale.description = 'New'
+    with pytest.raises(TaskConflict), transaction.atomic():
+        stale.save_versioned(['description', 'updated_at'])
+    task.refresh_from_db()
+    assert (task.version, task.status, task.description) == (2, 'in_progress', 'Old')
+
+
+def test_plain_save_bumps_version_without_check(task):
+    """
+    Обычный save() (админка, shell) не проверяет версию и не бросает TaskConflict,
+    но увеличивает её, так что открытые раньше формы заметят изменение.
+    """
+    stale = Task.objects.get(id=task.id)
+    task.save()
+    stale.description = 'New'
+    stale.save(update_fields=['description'])
+    assert stale.version == 3
+    stale.refresh_from_db()
+    assert (stale.description, stale.version) == ('New', 3)
+
+    with pytest.raises(TaskConflict), transaction.atomic():
+        Task.objects.get(id=task.id).save_versioned(['description'], expected_version=2)
+
+
+def test_stale_plain_save_does_not_move_version_back(task):
+    """
+    save() устаревшего экземпляра увеличивает версию строки, а не пишет свою: форма,
+    открытая на промежуточной версии, после этого получает конфликт.
+    """
+    stale = Task.objects.get(id=task.id)
+    for status in ('in_progress', 'done', 'open'):
+        task.status = status
+        task.save_versioned(['status', 'updated_at'])
+    assert task.version == 4
+
+    stale.save()
+    stale.refresh_from_db()
+    assert stale.version == 5
+    for version in (2, 3, 4):
+        with pytest.raises(TaskConflict), transaction.atomic():
+            Task.objects.get(id=task.id).save_versioned(['description'], expected_version=version)
+
+
+def test_update_touches_only_changed_columns(task):
+    """
+    Версия захватывается условным UPDATE по версии, затем пишутся только переданные поля.
+    """
+    task.status = 'done'
+    with CaptureQueriesContext(connection) as queries:
+        task.save_versioned(['status', 'updated_at'])
+    claim, save = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+    assert '"version" = 1' in claim and '"status"' not in claim
+    assert '"description"' not in save and '"title"' not in save
+    task.refresh_from_db()
+    assert (task.status, task.version) == ('done', 2)
+
+
+def test_status_form_with_outdated_version(authenticated_client, task):
+    """
+    Форма, открытая до чужого изменения, не перезаписывает его, пользователь видит ошибку.
+    """
+    Task.objects.get(id=task.id).save()
+    response = authenticated_client.post(
+        reverse('task_detail', args=[task.id]), {'status': 'done', 'version': 1}
+    )
+    assert response.status_code == 302
+    assert 'изменил другой пользователь' in str(list(get_messages(response.wsgi_request))[0])
+    task.refresh_from_db()
+    assert (task.status, task.version) == ('open', 2)
+
+    authenticated_client.post(reverse('task_detail', args=[task.id]), {'status': 'done', 'version': 2})
+    task.refresh_from_db()
+    assert (task.status, task.version) == ('done', 3)
+
+
+def test_edit_form_saves_only_changed_fields(admin_client, task):
+    """Форма редактирования без изменений не трогает строку"""
+    deadline = timezone.localtime(task.deadline).strftime('%Y-%m-%dT%H:%M')
+    task.deadline = timezone.make_aware(timezone.datetime.strptime(deadline, '%Y-%m-%dT%H:%M'))
+    task.save()
+    data = {'edit_task': '', 'title': 'Task', 'description': 'Old', 'deadline': deadline, 'version': 2}
+
+    admin_client.post(reverse('task_detail', args=[task.id]), data)
+    task.refresh_from_db()
+    assert task.version == 2
+
+    admin_client.post(reverse('task_detail', args=[task.id]), {**data, 'title': 'Renamed'})
+    task.refresh_from_db()
+    assert (task.title, task.version) == ('Renamed', 3)
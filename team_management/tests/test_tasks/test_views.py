@@ -177,3 +177,117 @@ def test_rate_unfinished_task(admin_client, team):
     assert not TaskRating.objects.filter(task=task).exists()
     messages = list(get_messages(response.wsgi_request))
     assert str(messages[0]) == "Можно оценивать только завершенные задачи"
+
+
+def test_task_detail_constant_queries(admin_client, admin_user, user_factory, team, django_assert_num_queries):
+    """
+    Число запросов страницы задачи не зависит от числа комментариев, авторов и участников команды.
+    """
+    task = Task.objects.create(
+        title='Busy Task', description='', deadline=timezone.now() + timedelta(days=7),
+        status='done', team=team,
+    )
+    TaskRating.objects.create(task=task, score=4, comment='ok', rated_by=admin_user)
+    url = reverse('task_detail', args=[task.id])
+
+    def add_comments(count):
+        for _ in range(count):
+            author = user_factory()
+            team.members.create(user=author)
+            Comment.objects.create(task=task, author=author, text='Комментарий')
+
+    add_comments(2)
+    # Сессия, пользователь, задача с оценкой, комментарии с авторами, участники команды.
+    with django_assert_num_queries(5):
+        response = admin_client.get(url)
+    assert response.status_code == 200
+    assert len(response.context['comments']) == 2
+
+    add_comments(10)
+    with django_assert_num_queries(5):
+        response = admin_client.get(url)
+    assert len(response.context['comments']) == 12
+    assert response.context['existing_rating'].score == 4
+    assert len(response.context['team_members']) == 12
+
+
+def test_task_comments_keyset_pages(authenticated_client, user, task):
+    """
+    Страница задачи показывает последние комментарии, ранние подгружаются по курсору
+    без пропусков и повторов, в том числе при одинаковом created_at.
+    """
+    moment = timezone.now() - timedelta(days=1)
+    comments = [
+        Comment.objects.create(task=task, author=user, text=f'Комментарий {index}', created_at=moment)
+        for index in range(25)
+    ]
+
+    response = authenticated_client.get(reverse('task_detail', args=[task.id]))
+    assert [comment.id for comment in response.context['comments']] == [comment.id for comment in comments[5:]]
+    assert response.context['task'].comments_count == 25
+    cursor = response.context['next_cursor']
+    assert cursor
+
+    response = authenticated_client.get(reverse('task_comments', args=[task.id]), {'cursor': cursor})
+    assert response.status_code == 200
+    data = response.json()
+    assert data['next_cursor'] is None
+    for comment in comments[:5]:
+        assert f'id="comment-{comment.id}"' in data['html']
+    assert f'id="comment-{comments[5].id}"' not in data['html']
+    assert 'comments-more' not in data['html']
+
+
+def test_task_comments_invalid_cursor(authenticated_client, task):
+    """Повреждённый курсор даёт 400"""
+    response = authenticated_client.get(reverse('task_comments', args=[task.id]), {'cursor': 'broken'})
+    assert response.status_code == 400
+
+
+def test_task_comments_no_access(authenticated_client, team):
+    """Комментарии чужой задачи недоступны"""
+    other = User.objects.create_user(username='other', password='pass123')
+    task = Task.objects.create(
+        title='Other', description='', deadline=timezone.now(), assignee=other, team=team
+    )
+    assert authenticated_client.get(reverse('task_comments', args=[task.id])).status_code == 403
+    response = authenticated_client.post(reverse('task_comments', args=[task.id]), {'comment_text': 'Привет'})
+    assert response.status_code == 403
+    assert not Comment.objects.exists()
+
+
+def test_task_comment_add_edit_delete_json(authenticated_client, user, task):
+    """
+    Добавление, изменение и удаление комментария возвращают JSON с HTML-фрагментом вместо редиректа.
+    """
+    url = reverse('task_comments', args=[task.id])
+    assert authenticated_client.post(url, {'comment_text': '  '}).status_code == 400
+
+    response = authenticated_client.post(url, {'comment_text': 'Новый'})
+    assert response.status_code == 201
+    data = response.json()
+    assert data['count'] == 1
+    assert 'Новый' in data['html']
+    comment_url = reverse('task_comment', args=[task.id, data['id']])
+
+    response = authenticated_client.post(comment_url, {'comment_text': 'Исправленный'})
+    assert response.status_code == 200
+    assert 'Исправленный' in response.json()['html']
+    assert Comment.objects.get(id=data['id']).text == 'Исправленный'
+
+    response = authenticated_client.delete(comment_url)
+    assert response.status_code == 200
+    assert response.json() == {'id': data['id'], 'count': 0}
+    assert not Comment.objects.exists()
+
+
+def test_task_comment_foreign_author(authenticated_client, task):
+    """Чужой комментарий нельзя изменить или удалить"""
+    author = User.objects.create_user(username='author', password='pass123')
+    comment = Comment.objects.create(task=task, author=author, text='Чужой')
+    url = reverse('task_comment', args=[task.id, comment.id])
+
+    assert authenticated_client.post(url, {'comment_text': 'Мой'}).status_code == 403
+    assert authenticated_client.delete(url).status_code == 403
+    comment.refresh_from_db()
+    assert comment.text == 'Чужой'
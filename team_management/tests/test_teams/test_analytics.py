@@ -0,0 +1,69 @@
+from datetime import date, timedelta
+
+import pytest
+from django.urls import reverse
+
+from conftest import TeamFactory, aware
+from tasks.models import Task, TaskChange, TaskRating
+from teams.analytics import get_team_analytics, percentiles
+
+START, END = date(2025, 6, 2), date(2025, 6, 15)
+
+
+@pytest.fixture
+def analytics_data(user, team, admin_user):
+    """
+    Три задачи, закрытые за две недели (одна — после дедлайна), одна открытая просроченная
+    и одна оценка; задача другой команды в выборку не попадает.
+    """
+    def make(created, deadline, done_at=None, team=team):
+        task = Task.objects.create(title='T', description='', team=team, assignee=user, deadline=deadline)
+        Task.objects.filter(id=task.id).update(created_at=created, status='done' if done_at else 'open')
+        if done_at:
+            TaskChange.objects.create(task=task, field='status', old_value='open', new_value='done', changed_at=done_at)
+        return task
+
+    first = make(aware(date(2025, 6, 1), 10), aware(date(2025, 6, 3)), done_at=aware(date(2025, 6, 2), 10))
+    make(aware(date(2025, 6, 2), 10), aware(date(2025, 6, 4)), done_at=aware(date(2025, 6, 5), 10))
+    make(aware(date(2025, 6, 5), 10), aware(date(2025, 6, 20)), done_at=aware(date(2025, 6, 10), 10))
+    make(aware(date(2025, 6, 1)), aware(date(2025, 6, 7)))
+    make(aware(date(2025, 6, 1)), aware(date(2025, 6, 8)), done_at=aware(date(2025, 6, 3)), team=TeamFactory())
+    TaskRating.objects.create(task=first, score=4, rated_by=admin_user)
+    TaskRating.objects.filter(task=first).update(rated_at=aware(date(2025, 6, 6)))
+
+
+def test_percentiles_interpolate_linearly():
+    """Процентили совпадают с линейной интерполяцией numpy.percentile"""
+    assert percentiles([4, 1, 3, 2], (0, 50, 90, 100)) == {0: 1, 50: 2.5, 90: pytest.approx(3.7), 100: 4}
+    assert percentiles([], (50,)) == {50: None}
+
+
+def test_team_analytics(team, analytics_data, django_assert_num_queries):
+    """
+    По одному запросу на группу метрик; повторный запрос за тот же диапазон берётся из кэша.
+    """
+    with django_assert_num_queries(3):
+        data = get_team_analytics(team, START, END)
+
+    assert data['throughput'] == [
+        {'week_start': date(2025, 6, 2), 'completed': 2},
+        {'week_start': date(2025, 6, 9), 'completed': 1},
+    ]
+    assert data['cycle_time_hours'] == {'count': 3, 'p50': 72.0, 'p75': 96.0, 'p90': 110.4, 'p95': 115.2}
+    assert data['ratings'] == {'distribution': {1: 0, 2: 0, 3: 0, 4: 1, 5: 0}, 'count': 1, 'average': 4.0}
+    assert data['overdue'] == {'due': 3, 'overdue': 2, 'ratio': pytest.approx(0.6667)}
+
+    with django_assert_num_queries(0):
+        assert get_team_analytics(team, START, END) == data
+
+
+def test_team_analytics_api(authenticated_client, team, team_member, analytics_data):
+    """API проверяет диапазон и доступ к команде"""
+    url = reverse('team_analytics', args=[team.id])
+    response = authenticated_client.get(url, {'start': START, 'end': END})
+    assert response.status_code == 200
+    assert response.json()['cycle_time_hours']['count'] == 3
+
+    assert authenticated_client.get(url, {'start': END, 'end': START}).status_code == 400
+    assert authenticated_client.get(url, {'start': START, 'end': START + timedelta(days=400)}).status_code == 400
+    assert authenticated_client.get(reverse('team_analytics', args=[TeamFactory().id])).status_code == 403
@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task, TaskChange
+from teams.board import get_board, get_column_page
+
+
+@pytest.fixture
+def board_tasks(user, team):
+    """
+    Пять открытых задач с разными дедлайнами, две в работе и одна выполненная.
+    """
+    now = timezone.now()
+    statuses = ['open'] * 5 + ['in_progress'] * 2 + ['done']
+    return Task.objects.bulk_create([
+        Task(title=f'Task {i}', description='', status=status, team=team, assignee=user,
+             deadline=now + timedelta(days=10 - i))
+        for i, status in enumerate(statuses)
+    ])
+
+
+def test_board_columns(team, board_tasks, django_assert_num_queries):
+    """
+    Колонки идут в порядке STATUS_CHOICES, содержат полное число задач и первые карточки
+    по возрастанию дедлайна; запросов — один COUNT и по одному на колонку.
+    """
+    with django_assert_num_queries(1 + len(Task.STATUS_CHOICES)):
+        columns = get_board(team, limit=3)
+        [card.assignee.username for column in columns for card in column['cards']]
+
+    assert [column['status'] for column in columns] == ['open', 'in_progress', 'done']
+    assert [column['count'] for column in columns] == [5, 2, 1]
+    open_column = columns[0]
+    assert [card.id for card in open_column['cards']] == [board_tasks[i].id for i in (4, 3, 2)]
+    assert open_column['next_cursor'] is not None
+    assert columns[1]['next_cursor'] is None
+
+
+def test_column_pages_follow_cursor(team, board_tasks):
+    """Курсор колонки продолжает список без пропусков и повторов"""
+    first, cursor = get_column_page(team, 'open', limit=3)
+    rest, cursor = get_column_page(team, 'open', cursor, limit=3)
+    assert cursor is None
+    assert [card.id for card in first + rest] == [board_tasks[i].id for i in (4, 3, 2, 1, 0)]
+
+
+def test_team_board_view(authenticated_client, team_member, board_tasks):
+    response = authenticated_client.get(reverse('teams:team_board', args=[team_member.team_id]))
+    assert response.status_code == 200
+    assert [column['count'] for column in response.context['columns']] == [5, 2, 1]
+    assert 'Показать ещё' not in response.content.decode()
+
+
+def test_team_board_view_non_member(authenticated_client, team):
+    response = authenticated_client.get(reverse('teams:team_board', args=[team.id]))
+    assert response.status_code == 403
+
+
+def test_team_board_column_json(authenticated_client, team_member, board_tasks):
+    _, cursor = get_column_page(team_member.team, 'open', limit=2)
+    url = reverse('teams:team_board_column', args=[team_member.team_id, 'open'])
+    response = authenticated_client.get(url, {'cursor': cursor})
+    assert response.status_code == 200
+    assert response.json()['next_cursor'] is None
+    assert response.json()['html'].count('board-card') == 3
+
+    assert authenticated_client.get(url, {'cursor': 'broken'}).status_code == 400
+    bad_status = reverse('teams:team_board_column', args=[team_member.team_id, 'unknown'])
+    assert authenticated_client.get(bad_status).status_code == 400
+
+
+def test_task_status_json(authenticated_client, user, board_tasks, django_capture_on_commit_callbacks):
+    """
+    Перетаскивание карточки: статус меняется без редиректа, версия растёт, изменение попадает в журнал.
+    """
+    task = board_tasks[0]
+    with django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_client.post(
+            reverse('task_status', args=[task.id]), {'status': 'done', 'version': task.version}
+        )
+    assert response.status_code == 200
+    assert response.json() == {'id': task.id, 'status': 'done', 'version': task.version + 1}
+    assert TaskChange.objects.filter(task=task, field='status', new_value='done', actor=user).exists()
+
+
+def test_task_status_json_conflict_and_errors(authenticated_client, board_tasks, user_factory):
+    task = board_tasks[0]
+    url = reverse('task_status', args=[task.id])
+    response = authenticated_client.post(url, {'status': 'done', 'version': task.version + 1})
+    assert response.status_code == 409
+    assert authenticated_client.post(url, {'status': 'unknown'}).status_code == 400
+    assert authenticated_client.get(url).status_code == 405
+
+    Task.objects.filter(id=task.id).update(assignee=user_factory())
+    assert authenticated_client.post(url, {'status': 'done'}).status_code == 403
+    assert Task.objects.get(id=task.id).status == 'open'
@@ -175,3 +175,56 @@ def test_team_delete_view(authenticated_client, db):
 
     assert response.status_code == 302
     assert not Team.objects.filter(id=team.id).exists()
+
+
+def test_team_detail_member_form_has_no_user_options(authenticated_client, user, team, user_factory):
+    """
+    Форма добавления участника не перечисляет всех пользователей: варианты подгружает Select2.
+    """
+    TeamMember.objects.create(team=team, user=user, role='admin')
+    other = user_factory()
+    response = authenticated_client.get(reverse('teams:team_detail', kwargs={'team_id': team.id}))
+    content = response.content.decode()
+    assert f'value="{other.id}"' not in content
+    assert reverse('teams:member_search', kwargs={'team_id': team.id}) in content
+
+
+def test_add_member_validates_submitted_user(authenticated_client, user, team, user_factory):
+    TeamMember.objects.create(team=team, user=user, role='admin')
+    new_user = user_factory()
+    url = reverse('teams:team_detail', kwargs={'team_id': team.id})
+
+    response = authenticated_client.post(url, {'user': user.id, 'role': 'member'})
+    assert response.status_code == 200
+    assert 'user' in response.context['member_form'].errors
+
+    response = authenticated_client.post(url, {'user': new_user.id, 'role': 'member'})
+    assert response.status_code == 302
+    assert TeamMember.objects.filter(team=team, user=new_user, role='member').exists()
+
+
+def test_member_search(authenticated_client, user, team, user_factory):
+    """
+    Поиск по началу логина, имени и фамилии без учёта регистра; участники команды исключены.
+    """
+    TeamMember.objects.create(team=team, user=user, role='admin')
+    petrov = User.objects.create_user(username='petrov', first_name='Ivan', last_name='Petrov')
+    ivanov = User.objects.create_user(username='ivanov')
+    member = User.objects.create_user(username='ivan_member')
+    TeamMember.objects.create(team=team, user=member, role='member')
+    user_factory()
+
+    url = reverse('teams:member_search', kwargs={'team_id': team.id})
+    response = authenticated_client.get(url, {'q': 'IVAN'})
+    assert response.json() == {'results': [
+        {'id': ivanov.id, 'text': 'ivanov'},
+        {'id': petrov.id, 'text': 'petrov (Ivan Petrov)'},
+    ]}
+    assert authenticated_client.get(url, {'q': 'pet'}).json()['results'][0]['id'] == petrov.id
+    assert authenticated_client.get(url, {'q': ' '}).json() == {'results': []}
+
+
+def test_member_search_admins_only(authenticated_client, user, team):
+    TeamMember.objects.create(team=team, user=user, role='member')
+    response = authenticated_client.get(reverse('teams:member_search', kwargs={'team_id': team.id}), {'q': 'a'})
+    assert response.status_code == 403
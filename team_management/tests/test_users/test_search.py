@@ -0,0 +1,17 @@
+from users.models import User
+from users.search import search_users
+
+
+def test_search_users_limit_and_order(db, django_assert_num_queries):
+    """
+    Не больше limit результатов: сначала совпадения по логину, затем по имени;
+    после набранного лимита остальные поля не запрашиваются.
+    """
+    for name in ('anna', 'andrey', 'anton'):
+        User.objects.create_user(username=name)
+    by_name = User.objects.create_user(username='zeta', first_name='Anastasia')
+
+    assert [user.username for user in search_users('an', limit=10)] == ['andrey', 'anna', 'anton', 'zeta']
+    assert search_users('ANAS') == [by_name]
+    with django_assert_num_queries(1):
+        assert [user.username for user in search_users('an', limit=2)] == ['andrey', 'anna']
@@ -1,7 +1,11 @@
+from datetime import timedelta
+
 import pytest
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.utils import timezone
 
+from tasks.models import Task, TaskRating
 from users.forms import RegisterForm
 
 User = get_user_model()
@@ -60,3 +64,40 @@ def test_dashboard_authenticated(authenticated_client):
     response = authenticated_client.get(reverse('dashboard'))
     assert response.status_code == 200
     assert 'dashboard.html' in [t.name for t in response.templates]
+
+
+@pytest.mark.django_db
+def test_profile_reads_rating_counters(authenticated_client, user, team, admin_user, django_assert_max_num_queries):
+    """
+    Статистика профиля берётся из счётчиков: число запросов не зависит от числа оценок.
+    """
+    user.get_calendar_token()
+    for score in (5, 4, 3):
+        task = Task.objects.create(
+            title='Done', description='', status='done', team=team, assignee=user, deadline=timezone.now()
+        )
+        TaskRating.objects.create(task=task, score=score, rated_by=admin_user)
+
+    with django_assert_max_num_queries(5):
+        response = authenticated_client.get(reverse('profile'))
+    assert response.context['total_ratings'] == 3
+    assert response.context['average_rating'] == 4
+    assert response.context['last_month_avg'] == 4
+    assert len(response.context['ratings']) == 3
+
+
+@pytest.mark.django_db
+def test_profile_recent_average_is_rolling_30_days(authenticated_client, user, team, admin_user):
+    """
+    Средняя за последний месяц — по оценкам последних 30 дней, а не по календарному месяцу.
+    """
+    for score, age in ((5, 2), (3, 25), (1, 40)):
+        task = Task.objects.create(
+            title='Done', description='', status='done', team=team, assignee=user, deadline=timezone.now()
+        )
+        rating = TaskRating.objects.create(task=task, score=score, rated_by=admin_user)
+        TaskRating.objects.filter(id=rating.id).update(rated_at=timezone.now() - timedelta(days=age))
+
+    response = authenticated_client.get(reverse('profile'))
+    assert response.context['last_month_avg'] == 4
+    assert response.context['total_ratings'] == 3
@@ -1,5 +1,8 @@
+import secrets
+
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 
 class User(AbstractUser):
     ROLE_CHOICES = (
@@ -9,6 +12,24 @@ class User(AbstractUser):
     )
     role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='user')
     team = models.ForeignKey('teams.Team', on_delete=models.SET_NULL, null=True, blank=True)
+    calendar_token = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+            models.Index(Lower('first_name'), name='user_first_name_lower_idx'),
+            models.Index(Lower('last_name'), name='user_last_name_lower_idx'),
+        ]
 
     def __str__(self):
-        return self.username
\ No newline at end of file
+        return self.username
+
+    def get_calendar_token(self, reset=False):
+        """
+        Возвращает секретный токен ссылки на .ics-календарь, создавая его при первом обращении.
+        reset=True выпускает новый токен, после чего старая ссылка перестаёт работать.
+        """
+        if reset or not self.calendar_token:
+            self.calendar_token = secrets.token_urlsafe(32)
+            self.save(update_fields=['calendar_token'])
+        return self.calendar_token
@@ -0,0 +1,40 @@
+from django.db.models import Value
+from django.db.models.functions import Lower
+
+from .models import User
+
+USER_SEARCH_LIMIT = 20
+USER_SEARCH_FIELDS = ('username', 'first_name', 'last_name')
+# Символ больше любого другого: верхняя граница диапазона строк с заданным префиксом.
+_MAX_CHAR = '\U0010ffff'
+
+
+def search_users(query, users=None, limit=USER_SEARCH_LIMIT, offset=0):
+    """
+    Пользователи, у которых логин, имя или фамилия начинаются с query без учёта регистра;
+    не больше limit начиная с позиции offset. users — исходная выборка (например, без участников команды).
+
+    Каждое поле ищется отдельным запросом по диапазону своего индекса LOWER(поле) с LIMIT,
+    так что читается не больше offset + limit записей индекса на поле, сколько бы пользователей ни было.
+    Префикс приводится к нижнему регистру той же функцией СУБД, что и индекс
+    (в SQLite LOWER меняет только латиницу). Сначала идут совпадения по логину,
+    затем по имени и фамилии.
+    """
+    prefix = query.strip()
+    if not prefix:
+        return []
+    if users is None:
+        users = User.objects.all()
+
+    found = {}
+    for field in USER_SEARCH_FIELDS:
+        matches = (
+            users.alias(search_key=Lower(field))
+            .filter(search_key__gte=Lower(Value(prefix)), search_key__lt=Lower(Value(prefix + _MAX_CHAR)))
+            .order_by('search_key', 'id')[:offset + limit]
+        )
+        for user in matches:
+            found.setdefault(user.id, user)
+        if len(found) >= offset + limit:
+            break
+    return list(found.values())[offset:offset + limit]
@@ -6,11 +6,14 @@ from django.db.models import Avg
 from django.shortcuts import render, redirect
 from django.contrib.auth import login, logout
 from django.contrib.auth.views import LoginView, LogoutView
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.utils import timezone
 
 from .forms import RegisterForm, UserEditForm, UserDeleteForm
-from tasks.models import Task, TaskRating
+from tasks.models import TaskRating, UserRatingStats
+
+PROFILE_RATINGS_LIMIT = 20
+PROFILE_RECENT_PERIOD = timedelta(days=30)
 
 
 def register_view(request):
@@ -68,13 +71,16 @@ def profile_view(request):
     """
     Представление профиля пользователя.
     Отображает форму редактирования профиля, возможность удаления аккаунта,
-    статистику оценок задач за месяц и общую информацию по выполненным задачам.
+    статистику оценок задач за последние 30 дней и за всё время, последние оценки
+    и ссылку на .ics-календарь с возможностью её перевыпуска.
+
+    Статистика за всё время читается из счётчика UserRatingStats; средняя за 30 дней —
+    агрегат по диапазону индекса (assignee, rated_at), то есть только по оценкам этого окна.
     """
-    completed_tasks = Task.objects.filter(assignee=request.user, status='done')
-    ratings = TaskRating.objects.filter(task__in=completed_tasks)
-    last_month_avg = ratings.filter(
-        rated_at__gte=timezone.now() - timedelta(days=30)
-    ).aggregate(Avg('score'))['score__avg'] or 0
+    stats = UserRatingStats.objects.filter(user=request.user).first() or UserRatingStats(user=request.user)
+    last_month_avg = TaskRating.objects.filter(
+        assignee=request.user, rated_at__gte=timezone.now() - PROFILE_RECENT_PERIOD
+    ).aggregate(average=Avg('score'))['average']
     if request.method == 'POST':
         if 'edit_profile' in request.POST:
             form = UserEditForm(request.POST, instance=request.user)
@@ -82,6 +88,10 @@ def profile_view(request):
                 form.save()
                 messages.success(request, 'Профиль успешно обновлен')
                 return redirect('profile')
+        elif 'reset_calendar_token' in request.POST:
+            request.user.get_calendar_token(reset=True)
+            messages.success(request, 'Ссылка на календарь перевыпущена')
+            return redirect('profile')
         elif 'delete_profile' in request.POST:
             delete_form = UserDeleteForm(request.POST)
             if delete_form.is_valid():
@@ -97,8 +107,13 @@ def profile_view(request):
         'form': form,
         'delete_form': delete_form,
         'user': request.user,
-        'total_ratings': ratings.count(),
-        'average_rating': ratings.aggregate(Avg('score'))['score__avg'] or 0,
-        'last_month_avg': round(last_month_avg, 2),
-        'ratings': ratings.order_by('-rated_at')
+        'total_ratings': stats.count,
+        'average_rating': stats.average,
+        'last_month_avg': last_month_avg and round(last_month_avg, 2),
+        'ratings': TaskRating.objects.filter(assignee=request.user)
+        .select_related('task')
+        .order_by('-rated_at')[:PROFILE_RATINGS_LIMIT],
+        'calendar_feed_url': request.build_absolute_uri(
+            reverse('meetings_ics_feed', args=[request.user.get_calendar_token()])
+        ),
     })
\ No newline at end of file